@@ -1,18 +1,76 @@
-from amyachev_degree.core import (  # noqa
-    compute_end_time, create_schedule, flow_job_generator,
-    johnson_three_machines_generator, Schedule, JobSchedulingFrame)
+import importlib
 
-from amyachev_degree.composite_heuristics import (  # noqa
-    local_search, local_search_partitial_sequence)
 
-from amyachev_degree.exact_algorithm import johnson_algorithm  # noqa
+__version__ = '0.1.0'
 
-from amyachev_degree.io import (  # noqa
-    create_gantt_chart, read_flow_shop_instances)
+# public name -> module, that defines it; modules are imported on the first
+# access to one of their names, so `import amyachev_degree` is cheap
+_LAZY_ATTRIBUTES = {
+    'compute_end_time': 'core',
+    'compute_end_times': 'core',
+    'compute_insertion_end_times': 'core',
+    'create_schedule': 'core',
+    'EvaluationCounter': 'core',
+    'flow_job_generator': 'core',
+    'johnson_three_machines_generator': 'core',
+    'PartialScheduleEvaluator': 'core',
+    'PrefixTreeEvaluator': 'core',
+    'Schedule': 'core',
+    'JobSchedulingFrame': 'core',
 
-from amyachev_degree.simple_heuristics import (  # noqa
-    cds_heuristics, fgh_heuristic, liu_reeves_heuristics,
-    neh_heuristics, palmer_heuristics)
+    'insertion_local_search': 'composite_heuristics',
+    'iterated_greedy': 'composite_heuristics',
+    'local_search': 'composite_heuristics',
+    'local_search_partitial_sequence': 'composite_heuristics',
 
-from amyachev_degree.util.testing import (  # noqa
-    assert_js_frame, percentage_deviation)
+    'get_result_cache': 'cache',
+    'ResultCache': 'cache',
+    'set_result_cache': 'cache',
+
+    'batch_johnson_algorithm': 'exact_algorithm',
+    'branch_and_bound': 'exact_algorithm',
+    'johnson_algorithm': 'exact_algorithm',
+
+    'genetic_algorithm': 'genetic',
+
+    'create_gantt_chart': 'io',
+    'iter_flow_shop_instances': 'io',
+    'parse_flow_shop_instances': 'io',
+    'read_flow_shop_instances': 'io',
+    'write_gantt_chart': 'io',
+
+    'job_based_lower_bound': 'lower_bounds',
+    'lower_bound': 'lower_bounds',
+    'machine_based_lower_bound': 'lower_bounds',
+
+    'solve_many': 'parallel',
+
+    'cds_heuristics': 'simple_heuristics',
+    'fgh_heuristic': 'simple_heuristics',
+    'liu_reeves_heuristics': 'simple_heuristics',
+    'neh_heuristics': 'simple_heuristics',
+    'palmer_heuristics': 'simple_heuristics',
+
+    'solve': 'solver',
+
+    'assert_js_frame': 'util.testing',
+    'percentage_deviation': 'util.testing',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name))
+
+    value = getattr(importlib.import_module(__name__ + '.' + module_name),
+                    name)
+    globals()[name] = value  # next accesses don't call `__getattr__`
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
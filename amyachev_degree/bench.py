@@ -0,0 +1,225 @@
+"""
+Benchmark of heuristics on Taillard's instances.
+
+Starts as follows (from root folder):
+    `python -m amyachev_degree.bench --heuristics neh cds \
+        --instances 20jobs_5machines 50jobs_10machines --output bench.json`
+
+    `python -m amyachev_degree.bench --baseline bench.json`
+        compares results with the saved ones and returns non-zero exit code
+        if some of them became slower
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from amyachev_degree.cache import set_result_cache
+from amyachev_degree.core import EvaluationCounter, compute_end_time
+from amyachev_degree.composite_heuristics import local_search
+from amyachev_degree.io import read_flow_shop_instances
+from amyachev_degree.simple_heuristics import (
+    cds_heuristics, fgh_heuristic, liu_reeves_heuristics, neh_heuristics,
+    palmer_heuristics)
+
+
+FLOW_SHOP_INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), 'Taillard_instances', 'flow_shop_sequences')
+
+
+def _fgh_args(frame):
+    return {'count_alpha': frame.count_jobs // frame.count_machines + 11}
+
+
+# heuristic name -> (function, function to create named arguments for frame,
+#                    True if the function accepts `counter`)
+HEURISTICS = {
+    'palmer': (palmer_heuristics, lambda frame: {}, False),
+    'cds': (cds_heuristics, lambda frame: {}, True),
+    'neh': (neh_heuristics, lambda frame: {}, True),
+    'fgh': (fgh_heuristic, _fgh_args, True),
+    'liu_reeves': (liu_reeves_heuristics,
+                   lambda frame: {'count_sequences': 5}, True),
+}
+
+
+def instance_classes(instance_dir: str = FLOW_SHOP_INSTANCE_DIR) -> list:
+    """
+    Returns names of files with Taillard's instances, e.g. 20jobs_5machines,
+    sorted by count of jobs and count of machines.
+    """
+    def size(name):
+        count_jobs, count_machines = name.split('jobs_')
+        return int(count_jobs), int(count_machines.split('machines')[0])
+
+    names = [os.path.basename(path)[:-len('.txt')]
+             for path in glob.glob(os.path.join(instance_dir, '*jobs_*.txt'))]
+    return sorted(names, key=size)
+
+
+def run_benchmark(heuristic: str, frames: list,
+                  with_local_search: bool = False) -> dict:
+    """
+    Solve `frames` by `heuristic` and measure time and quality of solutions.
+
+    Parameters
+    ----------
+    heuristic: str
+        one of `HEURISTICS` keys
+    frames: list
+        list of `JobSchedulingFrame` objects with upper bounds
+    with_local_search: bool, default False
+        if True, solutions are improved by `local_search`
+
+    Returns
+    -------
+    : dict
+        wall_time - time of solving all frames in seconds;
+        evaluations - count of makespan evaluations (full and saved);
+        evaluations_per_second;
+        arpd - average relative percentage deviation from upper bounds
+    """
+    function, create_args, with_counter = HEURISTICS[heuristic]
+    counter = EvaluationCounter()
+
+    wall_time = 0.
+    solutions_ratio = 0.
+    # stored solutions would be measured instead of heuristics
+    result_cache = set_result_cache(None)
+    try:
+        for frame in frames:
+            kwargs = create_args(frame)
+            if with_counter:
+                kwargs['counter'] = counter
+
+            begin = time.perf_counter()
+            solution = function(frame, **kwargs)
+            if with_local_search:
+                solution, _ = local_search(frame, solution, counter=counter)
+            wall_time += time.perf_counter() - begin
+
+            end_time = compute_end_time(frame, solution)
+            solutions_ratio += \
+                (end_time - frame.upper_bound) / frame.upper_bound
+    finally:
+        set_result_cache(result_cache)
+
+    evaluations = counter.evaluations
+    return {
+        'wall_time': wall_time,
+        'evaluations': evaluations,
+        'evaluations_per_second': evaluations / wall_time if wall_time else 0.,
+        'arpd': solutions_ratio / len(frames) * 100,
+    }
+
+
+def compare_with_baseline(results: list, baseline: list,
+                          tolerance: float) -> list:
+    """
+    Returns results, that are slower than the same results from `baseline`
+    more than by `tolerance` share, as list of tuples
+    (result, baseline result).
+    """
+    def key(result):
+        return (result['heuristic'], result['local_search'],
+                result['instances'], result['frames'])
+
+    baseline_results = {key(result): result for result in baseline}
+
+    slowdowns = []
+    for result in results:
+        baseline_result = baseline_results.get(key(result))
+        if baseline_result is None:
+            continue
+        if result['wall_time'] > baseline_result['wall_time'] * \
+                (1 + tolerance):
+            slowdowns.append((result, baseline_result))
+    return slowdowns
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m amyachev_degree.bench',
+        description="Benchmark heuristics on Taillard's instances.")
+    parser.add_argument('--heuristics', nargs='+', default=list(HEURISTICS),
+                        choices=list(HEURISTICS))
+    parser.add_argument('--instances', nargs='+', default=None,
+                        help='instance classes, e.g. 20jobs_5machines; '
+                             'all classes by default')
+    parser.add_argument('--local-search', choices=['without', 'with', 'both'],
+                        default='without',
+                        help='improve solutions by local search')
+    parser.add_argument('--max-frames', type=int, default=None,
+                        help='count of first instances used from each class')
+    parser.add_argument('--instance-dir', default=FLOW_SHOP_INSTANCE_DIR)
+    parser.add_argument('--cache', action='store_true',
+                        help='load instances from binary cache files')
+    parser.add_argument('--output', default=None,
+                        help='file to write results in JSON format')
+    parser.add_argument('--baseline', default=None,
+                        help='file with saved results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed slowdown relative to baseline')
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None) -> int:
+    args = _parse_args(argv)
+
+    classes = args.instances
+    if classes is None:
+        classes = instance_classes(args.instance_dir)
+
+    local_search_modes = {'without': [False], 'with': [True],
+                          'both': [False, True]}[args.local_search]
+
+    results = []
+    row_format = '%-12s %-6s %-20s %10.3f %14.1f %8.2f'
+    print('%-12s %-6s %-20s %10s %14s %8s' % ('heuristic', 'ls', 'instances',
+                                              'time, s', 'evals/s', 'ARPD'))
+    for instances in classes:
+        file_name = os.path.join(args.instance_dir, instances + '.txt')
+        frames = read_flow_shop_instances(
+            file_name, cache=args.cache)[:args.max_frames]
+
+        for heuristic in args.heuristics:
+            for with_local_search in local_search_modes:
+                result = {'heuristic': heuristic,
+                          'local_search': with_local_search,
+                          'instances': instances,
+                          'frames': len(frames)}
+                result.update(run_benchmark(heuristic, frames,
+                                            with_local_search))
+                results.append(result)
+
+                print(row_format % (heuristic, with_local_search, instances,
+                                    result['wall_time'],
+                                    result['evaluations_per_second'],
+                                    result['arpd']))
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({'results': results}, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+        slowdowns = compare_with_baseline(results, baseline, args.tolerance)
+        for result, baseline_result in slowdowns:
+            print('SLOWDOWN: %s (local search: %s) on %s: %.3f s, '
+                  'baseline %.3f s' % (result['heuristic'],
+                                       result['local_search'],
+                                       result['instances'],
+                                       result['wall_time'],
+                                       baseline_result['wall_time']))
+        if slowdowns:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
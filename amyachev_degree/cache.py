@@ -0,0 +1,261 @@
+"""
+Disk cache of solutions computed by heuristics.
+
+A solution is stored under a key, that is a hash of processing times, name
+of the heuristic, its arguments and version of the package; so changed
+heuristics don't return stale solutions after upgrade. The cache is a
+directory with a file per solution; its total size is bounded, the least
+recently used files are removed first.
+
+Caching is turned off by default. It's turned on by `set_result_cache`
+or by environment variables: `AMYACHEV_DEGREE_CACHE=1` keeps the cache in
+`~/.cache/amyachev_degree`, `AMYACHEV_DEGREE_CACHE_DIR` - in the given
+directory; `AMYACHEV_DEGREE_CACHE=0` turns it off in any case.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+
+import amyachev_degree
+from amyachev_degree.core import EvaluationCounter, JobSchedulingFrame
+
+
+CACHE_ENV = 'AMYACHEV_DEGREE_CACHE'
+CACHE_DIR_ENV = 'AMYACHEV_DEGREE_CACHE_DIR'
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'amyachev_degree')
+DEFAULT_MAX_SIZE = 64 << 20  # in bytes
+_ENTRY_SUFFIX = '.json'
+
+
+class ResultCache:
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Creates cache of solutions in `directory`.
+
+        Parameters
+        ----------
+        directory: str
+            created on the first write if it doesn't exist
+        max_size: int, default DEFAULT_MAX_SIZE
+            total size of stored solutions in bytes
+        """
+        if max_size < 0:
+            raise ValueError('max_size must be an integer >= 0')
+
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None  # computed on the first write
+
+    @property
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+
+    @staticmethod
+    def key(frame: JobSchedulingFrame, name: str, arguments: dict) -> str:
+        """
+        Returns key of the solution of `frame` computed by heuristic `name`
+        with `arguments`.
+
+        Raises
+        ------
+        TypeError
+            if `arguments` can't be represented in JSON
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([amyachev_degree.__version__, name,
+                                  arguments, frame.count_jobs,
+                                  frame.count_machines],
+                                 sort_keys=True, default=_to_json).encode())
+        if frame.count_jobs > 0:
+            digest.update(np.ascontiguousarray(frame.array,
+                                               dtype='<i8').tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> tuple:
+        """
+        Returns (True, solution) if solution with `key` is stored,
+        otherwise (False, None).
+        """
+        path = self._path(key)
+        try:
+            with open(path) as file:
+                value = json.load(file)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, value
+
+    def put(self, key: str, value: object):
+        """
+        Store `value` under `key`; the least recently used solutions are
+        removed if the cache becomes greater than `max_size`.
+        """
+        data = json.dumps(value, default=_to_json).encode()
+        if len(data) > self.max_size:
+            return
+
+        path = self._path(key)
+        temp_path = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            # solving mustn't fail because of the cache
+            return
+
+        self._size += len(data)
+        if self._size > self.max_size:
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:  # removed by another process
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        # other processes can write the same directory, so the size is
+        # computed again
+        entries = sorted(self._entries())
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all stored solutions and reset statistics.
+        """
+        if os.path.isdir(self.directory):
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        self._size = 0
+        self.hits = self.misses = self.evictions = 0
+
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('%r is not JSON serializable' % (value,))
+
+
+_result_cache = None
+_result_cache_created = False
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Returns cache used by heuristics or None if caching is turned off.
+    """
+    global _result_cache, _result_cache_created
+    if not _result_cache_created:
+        _result_cache_created = True
+        enabled = os.environ.get(CACHE_ENV)
+        directory = os.environ.get(CACHE_DIR_ENV)
+        if enabled == '1' or (directory and enabled != '0'):
+            _result_cache = ResultCache(directory or DEFAULT_CACHE_DIR)
+    return _result_cache
+
+
+def set_result_cache(cache: ResultCache) -> ResultCache:
+    """
+    Set cache used by heuristics; None turns caching off.
+
+    Returns
+    -------
+    previous: ResultCache or None
+        cache used before the call
+    """
+    global _result_cache, _result_cache_created
+    previous = get_result_cache()
+    _result_cache = cache
+    _result_cache_created = True
+    return previous
+
+
+def cached(heuristic: object) -> object:
+    """
+    Decorator, that returns the stored solution of the same instance
+    computed by `heuristic` with the same arguments instead of computing it
+    again.
+
+    `heuristic` must take `JobSchedulingFrame` as the first argument and
+    return a value representable in JSON. `counter` argument isn't a part
+    of the key; evaluations counted, when the solution was computed, are
+    stored with it and added to `counter` if the stored solution is
+    returned.
+    """
+    signature = inspect.signature(heuristic)
+    name = heuristic.__module__ + '.' + heuristic.__qualname__
+    with_counter = 'counter' in signature.parameters
+
+    @functools.wraps(heuristic)
+    def wrapper(*args, **kwargs):
+        cache = get_result_cache()
+        if cache is None:
+            return heuristic(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        frame = arguments.pop(next(iter(signature.parameters)))
+        counter = arguments.pop('counter', None)
+        try:
+            key = cache.key(frame, name, arguments)
+        except TypeError:
+            return heuristic(*args, **kwargs)
+
+        found, entry = cache.get(key)
+        if not found or not isinstance(entry, dict) or \
+                'solution' not in entry:
+            solution_counter = EvaluationCounter()
+            if with_counter:
+                bound.arguments['counter'] = solution_counter
+            entry = {'solution': heuristic(*bound.args, **bound.kwargs),
+                     'full_evaluations': solution_counter.full_evaluations,
+                     'saved_evaluations': solution_counter.saved_evaluations}
+            cache.put(key, entry)
+
+        if counter is not None:
+            counter.full_evaluations += entry.get('full_evaluations', 0)
+            counter.saved_evaluations += entry.get('saved_evaluations', 0)
+        return entry['solution']
+
+    return wrapper
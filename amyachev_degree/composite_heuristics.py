@@ -1,12 +1,26 @@
 import copy
-from amyachev_degree.core import JobSchedulingFrame, compute_end_time
+import math
+import random
+import time
+from operator import add
+
+from amyachev_degree.core import (
+    EvaluationCounter, JobSchedulingFrame, _release_times, compute_end_time,
+    compute_insertion_end_times, compute_tails)
 
 
 def swap(sequence, fst, scnd):
     sequence[fst], sequence[scnd] = sequence[scnd], sequence[fst]
 
 
-def local_search(frame: JobSchedulingFrame, init_jobs: list) -> list:
+# count of inner loop iterations between checks of the deadline
+DEADLINE_CHECK_INTERVAL = 64
+
+
+def local_search(frame: JobSchedulingFrame, init_jobs: list,
+                 accelerated: bool = True,
+                 counter: EvaluationCounter = None,
+                 time_limit: float = None) -> list:
     """
     Local search occurs by pairwise exchange of jobs and evaluation
     of the total flow time.
@@ -15,6 +29,15 @@ def local_search(frame: JobSchedulingFrame, init_jobs: list) -> list:
     ----------
     frame: JobSchedulingFrame
     init_jobs: list
+    accelerated: bool, default True
+        if True, each exchange is evaluated in O(m) using the completion
+        times of the unchanged prefix and the tails of the unchanged suffix,
+        otherwise the makespan is computed from scratch twice per exchange.
+    counter: EvaluationCounter, default None
+        if specified, counts performed and saved full evaluations
+    time_limit: float, default None
+        if specified, wall-clock budget in seconds; when it's exhausted,
+        the current solution is returned
 
     Returns
     -------
@@ -29,20 +52,64 @@ def local_search(frame: JobSchedulingFrame, init_jobs: list) -> list:
     solution = copy.copy(init_jobs)
     different_from_init_jobs = False
 
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+
+    if accelerated:
+        proc_times = frame.array.tolist()
+        zero_times = [0] * frame.count_machines
+
     while True:
         improvement = False
+        if accelerated:
+            # swaps at `idx` don't change jobs after `idx + 1`,
+            # so tails computed once are valid for the whole pass
+            tails = compute_tails(frame, solution).tolist()
+            machines_time = zero_times
+            if counter is not None:
+                counter.full_evaluations += 1
+                counter.saved_evaluations += 2 * (len(solution) - 1)
+
         for idx in range(len(solution) - 1):
-            best_flowshop_time = compute_end_time(frame, solution)
-            swap(solution, idx, idx + 1)
-            new_flowshop_time = compute_end_time(frame, solution)
+            if deadline is not None and idx % DEADLINE_CHECK_INTERVAL == 0 \
+                    and time.perf_counter() >= deadline:
+                return solution, different_from_init_jobs
 
-            if best_flowshop_time > new_flowshop_time:
-                best_flowshop_time = new_flowshop_time
-                improvement = True
-                different_from_init_jobs = True
+            if accelerated:
+                fst_times = proc_times[solution[idx]]
+                scnd_times = proc_times[solution[idx + 1]]
+                tail = tails[idx + 2]
+
+                fst_release = _release_times(machines_time, fst_times)
+                best_flowshop_time = max(map(
+                    add, _release_times(fst_release, scnd_times), tail))
+
+                scnd_release = _release_times(machines_time, scnd_times)
+                new_flowshop_time = max(map(
+                    add, _release_times(scnd_release, fst_times), tail))
+
+                if best_flowshop_time > new_flowshop_time:
+                    swap(solution, idx, idx + 1)
+                    improvement = True
+                    different_from_init_jobs = True
+                    machines_time = scnd_release
+                else:
+                    machines_time = fst_release
             else:
-                # reverse swap
+                best_flowshop_time = compute_end_time(frame, solution)
                 swap(solution, idx, idx + 1)
+                new_flowshop_time = compute_end_time(frame, solution)
+                if counter is not None:
+                    counter.full_evaluations += 2
+
+                if best_flowshop_time > new_flowshop_time:
+                    best_flowshop_time = new_flowshop_time
+                    improvement = True
+                    different_from_init_jobs = True
+                else:
+                    # reverse swap
+                    swap(solution, idx, idx + 1)
 
         if not improvement:
             break
@@ -51,7 +118,10 @@ def local_search(frame: JobSchedulingFrame, init_jobs: list) -> list:
 
 
 def local_search_partitial_sequence(frame: JobSchedulingFrame,
-                                    init_jobs: list) -> list:
+                                    init_jobs: list,
+                                    accelerated: bool = True,
+                                    counter: EvaluationCounter = None,
+                                    time_limit: float = None) -> list:
     """
     This perform for all jobs in `init_jobs`:
         Select the next job from `init_jobs` and insert it in all possible
@@ -62,6 +132,16 @@ def local_search_partitial_sequence(frame: JobSchedulingFrame,
     ----------
     frame: JobSchedulingFrame
     init_jobs: list
+    accelerated: bool, default True
+        if True, all insertion positions of a job are evaluated in one pass
+        by `compute_insertion_end_times`, otherwise the makespan is computed
+        from scratch for every position.
+    counter: EvaluationCounter, default None
+        if specified, counts performed and saved full evaluations
+    time_limit: float, default None
+        if specified, wall-clock budget in seconds; when it's exhausted,
+        the rest jobs are appended to the partial sequence in the order
+        of `init_jobs`
 
     Returns
     -------
@@ -76,24 +156,324 @@ def local_search_partitial_sequence(frame: JobSchedulingFrame,
     solution = [init_jobs[0]]  # using job, which have max processing time
     better_than_init_jobs = False
 
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+
     # init end time
     time_compare = compute_end_time(frame, init_jobs)
+    # kept, if no position gives makespan less than `time_compare`
+    best_insert_place = 0
 
     # local search
     for position_job, idx_job in enumerate(init_jobs[1:], 1):
-        min_end_time = time_compare
-        for insert_place in range(position_job + 1):
-            solution.insert(insert_place, idx_job)
+        if deadline is not None and time.perf_counter() >= deadline:
+            solution.extend(init_jobs[position_job:])
+            break
 
-            end_time = compute_end_time(frame, solution)
-            if min_end_time > end_time:
-                min_end_time = end_time
+        min_end_time = time_compare
+        if accelerated:
+            end_times = compute_insertion_end_times(frame, solution, idx_job)
+            insert_place = int(end_times.argmin())
+            if min_end_time > end_times[insert_place]:
                 best_insert_place = insert_place
+            if counter is not None:
+                counter.full_evaluations += 1
+                counter.saved_evaluations += position_job
+        else:
+            for insert_place in range(position_job + 1):
+                solution.insert(insert_place, idx_job)
 
-            solution.pop(insert_place)
+                end_time = compute_end_time(frame, solution)
+                if min_end_time > end_time:
+                    min_end_time = end_time
+                    best_insert_place = insert_place
+
+                solution.pop(insert_place)
+            if counter is not None:
+                counter.full_evaluations += position_job + 1
         solution.insert(best_insert_place, idx_job)
 
     solution_time = compute_end_time(frame, solution)
     better_than_init_jobs = solution_time < time_compare
+    if counter is not None:
+        counter.full_evaluations += 2
 
     return solution, better_than_init_jobs
+
+
+def _best_insertion(frame: JobSchedulingFrame, jobs_sequence: list,
+                    idx_job: int, counter: EvaluationCounter = None) -> tuple:
+    # the first position with the minimal makespan, as in
+    # `local_search_partitial_sequence`
+    end_times = compute_insertion_end_times(frame, jobs_sequence, idx_job)
+    insert_place = int(end_times.argmin())
+    if counter is not None:
+        counter.full_evaluations += 1
+        counter.saved_evaluations += len(jobs_sequence)
+    return insert_place, int(end_times[insert_place])
+
+
+def _remove_and_insert(frame, solution, idx_job, counter):
+    # move `idx_job` to the best position of the rest sequence
+    position = solution.index(idx_job)
+    partial = solution[:position] + solution[position + 1:]
+    insert_place, end_time = _best_insertion(frame, partial, idx_job, counter)
+    partial.insert(insert_place, idx_job)
+    return partial, end_time
+
+
+def _insertion_local_search(frame: JobSchedulingFrame, solution: list,
+                            end_time: int, jobs_order: object,
+                            deadline: float,
+                            counter: EvaluationCounter = None,
+                            best_improvement: bool = False,
+                            max_passes: int = None) -> tuple:
+    # remove each job in the order `jobs_order(solution)` and re-insert it
+    # at the best position until a pass without improvement;
+    # with `best_improvement` only the best move of a pass is applied
+    count_passes = 0
+    improvement = True
+    while improvement and (max_passes is None or count_passes < max_passes):
+        count_passes += 1
+        improvement = False
+        best_move = None
+        for idx_job in jobs_order(solution):
+            if deadline is not None and time.perf_counter() >= deadline:
+                max_passes = count_passes
+                break
+
+            new_solution, new_end_time = _remove_and_insert(
+                frame, solution, idx_job, counter)
+            if new_end_time >= end_time:
+                continue
+
+            if best_improvement:
+                if best_move is None or new_end_time < best_move[1]:
+                    best_move = new_solution, new_end_time
+            else:
+                solution, end_time = new_solution, new_end_time
+                improvement = True
+
+        if best_move is not None:
+            solution, end_time = best_move
+            improvement = True
+
+    return solution, end_time
+
+
+IMPROVEMENTS = {'first', 'best'}
+JOBS_ORDERS = {'referenced', 'random'}
+
+
+def insertion_local_search(frame: JobSchedulingFrame, init_jobs: list,
+                           improvement: str = 'first',
+                           order: str = 'referenced',
+                           reference: list = None, max_passes: int = None,
+                           seed: int = None,
+                           counter: EvaluationCounter = None,
+                           time_limit: float = None) -> tuple:
+    """
+    Local search by removing each job and inserting it at the best of
+    all positions.
+
+    All positions of a job are evaluated at once in O(nm) by
+    `compute_insertion_end_times`, so a pass costs O(n^2 m).
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+    init_jobs: list
+    improvement: {'first', 'best'}, default 'first'
+        'first' - every improving move is applied at once;
+        'best' - only the best move of a pass is applied
+    order: {'referenced', 'random'}, default 'referenced'
+        order, in which jobs are moved: the order of `reference`
+        or a new random order each pass
+    reference: list, default None
+        reference sequence of jobs; `init_jobs` by default
+    max_passes: int, default None
+        if specified, limits count of passes over jobs;
+        1 gives RZ procedure, None - iRZ procedure
+    seed: int, default None
+        seed of the random generator used for 'random' order
+    counter: EvaluationCounter, default None
+        if specified, counts performed and saved full evaluations
+    time_limit: float, default None
+        if specified, wall-clock budget in seconds; when it's exhausted,
+        the current solution is returned
+
+    Returns
+    -------
+    result of local search: list, bool
+        if would be found a solution better than `init_jobs`, returns True.
+
+    Notes
+    -----
+    don't modificate `init_jobs`
+
+    Journal Paper:
+        Rajendran, C., Ziegler, H., 1997. An efficient heuristic for
+        scheduling in a flowshop to minimize total weighted flowtime of
+        jobs. European Journal of Operational Research 103(1), 129-138
+
+        Pan, Q.-K., Tasgetiren, M.F., Liang, Y.-C., 2008. A discrete
+        differential evolution algorithm for the permutation flowshop
+        scheduling problem. Computers & Industrial Engineering 55(4),
+        795-816
+
+    """
+    if improvement not in IMPROVEMENTS:
+        raise ValueError('improvement must be one of %s'
+                         % sorted(IMPROVEMENTS))
+    if order not in JOBS_ORDERS:
+        raise ValueError('order must be one of %s' % sorted(JOBS_ORDERS))
+
+    solution = copy.copy(init_jobs)
+    if len(solution) < 2:
+        return solution, False
+
+    if order == 'referenced':
+        reference = copy.copy(init_jobs if reference is None else reference)
+        if sorted(reference) != sorted(solution):
+            raise ValueError('reference must contain the jobs of init_jobs')
+
+        def jobs_order(solution):
+            return reference
+    else:
+        rng = random.Random(seed)
+
+        def jobs_order(solution):
+            return rng.sample(solution, len(solution))
+
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+
+    init_end_time = compute_end_time(frame, solution)
+    if counter is not None:
+        counter.full_evaluations += 1
+    solution, end_time = _insertion_local_search(
+        frame, solution, init_end_time, jobs_order, deadline, counter,
+        best_improvement=improvement == 'best', max_passes=max_passes)
+
+    return solution, end_time < init_end_time
+
+
+def iterated_greedy(frame: JobSchedulingFrame, init_jobs: list = None,
+                    time_limit: float = 1., d: int = 4,
+                    temperature: float = 0.4, max_iterations: int = None,
+                    seed: int = None,
+                    counter: EvaluationCounter = None,
+                    on_improvement: object = None) -> list:
+    """
+    Compute approximate solution for instance of Flow Job problem by
+    Iterated Greedy algorithm.
+
+    Each iteration removes `d` random jobs from the current solution,
+    re-inserts them one by one at the best position (as NEH does) and
+    improves the result by insertion local search. The new solution
+    replaces the current one if it is better or with the probability of
+    the simulated annealing like acceptance criterion.
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+    init_jobs: list, default None
+        initial solution; if None, the solution of `neh_heuristics` is used
+    time_limit: float, default 1.
+        wall-clock budget in seconds
+    d: int, default 4
+        count of jobs removed at the destruction phase
+    temperature: float, default 0.4
+        parameter of the acceptance criterion; the constant temperature is
+        `temperature * sum of processing times / (n * m * 10)`
+    max_iterations: int, default None
+        if specified, the search stops after this count of iterations
+    seed: int, default None
+        seed of the random generator used for destruction, local search
+        and acceptance
+    counter: EvaluationCounter, default None
+        if specified, counts performed and saved full evaluations
+    on_improvement: object, default None
+        function callback, that is called with the copy of each new best
+        found solution and its makespan
+
+    Returns
+    -------
+    solution: list
+        the best found sequence of job index
+
+    Notes
+    -----
+    don't modificate `init_jobs`
+
+    Journal Paper:
+        Ruiz, R., Stutzle, T., 2007. A simple and effective iterated greedy
+        algorithm for the permutation flowshop scheduling problem.
+        European Journal of Operational Research 177(3), 2033-2049
+
+    """
+    if d < 1:
+        raise ValueError('d must be an integer > 0')
+
+    deadline = time.perf_counter() + time_limit
+
+    if init_jobs is None:
+        # imported here, because `simple_heuristics` depends on this module
+        from amyachev_degree.simple_heuristics import neh_heuristics
+        init_jobs = neh_heuristics(frame, counter=counter)
+
+    solution = copy.copy(init_jobs)
+    if len(solution) < 2:
+        return solution
+
+    rng = random.Random(seed)
+    d = min(d, len(solution) - 1)
+    temperature *= sum(frame.get_sum_processing_times()) / \
+        (frame.count_jobs * frame.count_machines * 10)
+
+    def jobs_order(solution):
+        return rng.sample(solution, len(solution))
+
+    end_time = compute_end_time(frame, solution)
+    if counter is not None:
+        counter.full_evaluations += 1
+    solution, end_time = _insertion_local_search(frame, solution, end_time,
+                                                 jobs_order, deadline,
+                                                 counter)
+    best_solution, best_end_time = solution, end_time
+    if on_improvement is not None:
+        on_improvement(copy.copy(best_solution), best_end_time)
+
+    iteration = 0
+    while time.perf_counter() < deadline and \
+            (max_iterations is None or iteration < max_iterations):
+        iteration += 1
+
+        # destruction
+        new_solution = copy.copy(solution)
+        removed_jobs = [new_solution.pop(rng.randrange(len(new_solution)))
+                        for _ in range(d)]
+
+        # construction
+        for idx_job in removed_jobs:
+            insert_place, new_end_time = _best_insertion(
+                frame, new_solution, idx_job, counter)
+            new_solution.insert(insert_place, idx_job)
+
+        new_solution, new_end_time = _insertion_local_search(
+            frame, new_solution, new_end_time, jobs_order, deadline, counter)
+
+        # acceptance
+        if new_end_time < end_time:
+            solution, end_time = new_solution, new_end_time
+            if end_time < best_end_time:
+                best_solution, best_end_time = solution, end_time
+                if on_improvement is not None:
+                    on_improvement(copy.copy(best_solution), best_end_time)
+        elif temperature > 0 and rng.random() <= \
+                math.exp((end_time - new_end_time) / temperature):
+            solution, end_time = new_solution, new_end_time
+
+    return best_solution
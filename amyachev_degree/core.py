@@ -1,8 +1,10 @@
 import time
 import random as rd
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from typing import Union
 
+import numpy as np
+
 
 Duration = namedtuple('Duration', ['machine_index', 'begin_time', 'end_time'])
 
@@ -55,9 +57,34 @@ class Schedule(object):
         ----------
         jobs_duration_times: dict
             keys - jobs indexes; value - list of Duration objects
+            for machines 0, 1, ...
         end_time: int
         """
-        self._jobs_duration_times = jobs_duration_times
+        jobs_sequence = list(jobs_duration_times.keys())
+        begin_times = [[duration.begin_time for duration in durations]
+                       for durations in jobs_duration_times.values()]
+        end_times = [[duration.end_time for duration in durations]
+                     for durations in jobs_duration_times.values()]
+        self._set_arrays(jobs_sequence, begin_times, end_times, end_time)
+
+    @classmethod
+    def _from_arrays(cls, jobs_sequence, begin_times: np.ndarray,
+                     end_times: np.ndarray, end_time: int) -> 'Schedule':
+        schedule = cls.__new__(cls)
+        schedule._set_arrays(jobs_sequence, begin_times, end_times, end_time)
+        return schedule
+
+    def _set_arrays(self, jobs_sequence, begin_times, end_times, end_time):
+        # begin and end times of the job at position `i` on machine `j`
+        # are stored in row `i`, column `j` of the arrays
+        self._jobs_sequence = np.asarray(jobs_sequence, dtype=np.int64)
+        shape = (len(self._jobs_sequence), -1) if len(jobs_sequence) \
+            else (0, 0)
+        self._begin_times = np.asarray(begin_times,
+                                       dtype=np.int64).reshape(shape)
+        self._end_times = np.asarray(end_times, dtype=np.int64).reshape(shape)
+        self._positions = {idx_job: position for position, idx_job in
+                           enumerate(self._jobs_sequence.tolist())}
 
         if not isinstance(end_time, int):
             raise ValueError('end_time must be a integer')
@@ -72,7 +99,42 @@ class Schedule(object):
         -------
         : list[int]
         """
-        return self._jobs_duration_times.keys()
+        return dict.fromkeys(self._jobs_sequence.tolist()).keys()
+
+    @property
+    def jobs_sequence(self) -> np.ndarray:
+        """
+        Returns job indexes in Schedule as array.
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        return self._jobs_sequence
+
+    @property
+    def begin_times(self) -> np.ndarray:
+        """
+        Returns begin times as array N x M; row `i` corresponds to
+        the job `jobs_sequence[i]`.
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        return self._begin_times
+
+    @property
+    def end_times(self) -> np.ndarray:
+        """
+        Returns end times as array N x M; row `i` corresponds to
+        the job `jobs_sequence[i]`.
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        return self._end_times
 
     def __str__(self) -> str:
         """
@@ -88,10 +150,12 @@ class Schedule(object):
         : str
         """
         string = ""
-        for idx_job, list_durat in self._jobs_duration_times.items():
+        for idx_job, begin_times, end_times in zip(
+                self._jobs_sequence.tolist(), self._begin_times.tolist(),
+                self._end_times.tolist()):
             string += "%s:" % idx_job
-            for durat in list_durat:
-                string += " (%s, %s)," % (durat.begin_time, durat.end_time)
+            for times in zip(begin_times, end_times):
+                string += " (%s, %s)," % times
             string += "\n"
         return string
 
@@ -116,13 +180,11 @@ class Schedule(object):
         if idx_machine is None and idx_job is None:
             return self._end_time
         elif idx_machine is not None and idx_job is None:
-            last_idx_job = list(self._jobs_duration_times.keys())[-1]
-            last_job_duration_time = self._jobs_duration_times[last_idx_job]
-            return last_job_duration_time[idx_machine].end_time
+            return int(self._end_times[-1, idx_machine])
         elif idx_machine is None and idx_job is not None:
-            return self._jobs_duration_times[idx_job][-1].end_time
+            return int(self._end_times[self._positions[idx_job], -1])
 
-        return self._jobs_duration_times[idx_job][idx_machine].end_time
+        return int(self._end_times[self._positions[idx_job], idx_machine])
 
     def process_times(self, idx_job: int) -> list:
         """
@@ -135,13 +197,40 @@ class Schedule(object):
         Returns
         -------
         : list
+            Duration objects, that are created on each call
+        """
+        position = self._positions[idx_job]
+        return [Duration(machine_index, begin_time, end_time)
+                for machine_index, (begin_time, end_time) in enumerate(zip(
+                    self._begin_times[position].tolist(),
+                    self._end_times[position].tolist()))]
+
+
+class EvaluationCounter:
+
+    def __init__(self):
+        """
+        Counter of makespan evaluations performed by heuristics.
+
+        `full_evaluations` - evaluations computed from scratch;
+        `saved_evaluations` - evaluations replaced by incremental updates.
         """
-        return self._jobs_duration_times[idx_job]
+        self.full_evaluations = 0
+        self.saved_evaluations = 0
+
+    @property
+    def evaluations(self):
+        return self.full_evaluations + self.saved_evaluations
+
+    def __str__(self):
+        return "full evaluations: %s, saved evaluations: %s" % (
+            self.full_evaluations, self.saved_evaluations)
 
 
 class JobSchedulingFrame:
 
-    def __init__(self, processing_times, upper_bound=NaN, initial_seed=NaN):
+    def __init__(self, processing_times, upper_bound=NaN, initial_seed=NaN,
+                 as_array=False):
         """
         Creates frame from matrix of processing times.
 
@@ -150,11 +239,18 @@ class JobSchedulingFrame:
 
         Parameters
         ----------
-        processing_times: list of lists of integers
+        processing_times: list of lists of integers or numpy.ndarray
             can be empty
         upper_bound: int or NaN
         initial_seed: int or NaN
+        as_array: bool, default False
+            if True, processing times are stored in a C-contiguous 2-D
+            integer array; the smallest of int16/int32/int64 types, that
+            holds all values, is used. A C-contiguous `numpy.ndarray` of
+            one of these types is always stored as is, without copying;
+            other arrays are converted (floats must have integral values).
         """
+        self._as_array = as_array
         self.set_processing_times(processing_times)
 
         if not upper_bound == NaN and not isinstance(upper_bound, int):
@@ -167,6 +263,8 @@ class JobSchedulingFrame:
 
     def _check_processing_times(self, proc_times):
         try:
+            if isinstance(proc_times, np.ndarray) and proc_times.ndim != 2:
+                raise
             length = len(proc_times[0])  # must be the same for all jobs
             for job_proc_times in proc_times:
                 if length != len(job_proc_times):
@@ -185,9 +283,45 @@ class JobSchedulingFrame:
 
     @property
     def copy_proc_time(self):
+        if self.is_array:
+            return self.processing_times.tolist()
         import copy
         return copy.copy(self.processing_times)
 
+    @property
+    def is_array(self):
+        """
+        True if processing times are stored in `numpy.ndarray`.
+        """
+        return self._is_array
+
+    @property
+    def array(self):
+        """
+        Processing times as 2-D integer array N x M.
+
+        If processing times are stored in a list, the array is created on
+        the first access and cached until `set_processing_times` is called.
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        if self._array is None:
+            self._array = _as_processing_times_array(self.processing_times)
+        return self._array
+
+    @property
+    def machine_major(self):
+        """
+        Transposed view M x N of `array`, without copying.
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        return self.array.T
+
     @property
     def count_jobs(self):
         return self.jobs.count_jobs
@@ -210,20 +344,73 @@ class JobSchedulingFrame:
         processing_time: int
 
         """
+        if self._is_array:
+            return int(self.processing_times[idx_job, idx_machine])
         return self.processing_times[idx_job][idx_machine]
 
+    def get_job_processing_times(self, idx_job):
+        """
+        Returns processing times of `idx_job` on all machines
+        as a row view of `array`.
+
+        Parameters
+        ----------
+        idx_job: int
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        return self.array[idx_job]
+
+    def get_machine_processing_times(self, idx_machine):
+        """
+        Returns processing times of all jobs on `idx_machine`
+        as a column view of `array`.
+
+        Parameters
+        ----------
+        idx_machine: int
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        return self.array[:, idx_machine]
+
     # TODO make test for this functionality
     def get_sum_processing_time(self, idx_job):
+        if self.is_array:
+            return int(self.processing_times[idx_job].sum())
+
         proc_time = 0
         for m in range(self.count_machines):
             proc_time += self.get_processing_time(idx_job, m)
 
         return proc_time
 
+    def get_sum_processing_times(self):
+        """
+        Returns total processing time of each job.
+
+        Returns
+        -------
+        : list
+        """
+        return self.array.sum(axis=1, dtype=np.int64).tolist()
+
     def set_processing_times(self, processing_times):
         # raise ValueError if wrong type
         self._check_processing_times(processing_times)
 
+        self._is_array = self._as_array or \
+            isinstance(processing_times, np.ndarray)
+        if self._is_array:
+            processing_times = _as_processing_times_array(processing_times)
+            self._array = processing_times
+        else:
+            self._array = None
+
         self.processing_times = processing_times
         self.jobs = Jobs(len(processing_times))
         self.machines = Machines(len(processing_times[0]))
@@ -251,6 +438,329 @@ class JobSchedulingFrame:
 JSFrame = JobSchedulingFrame
 
 
+_ARRAY_DTYPES = (np.int16, np.int32, np.int64)
+
+
+def _as_processing_times_array(processing_times) -> np.ndarray:
+    """
+    Convert matrix of processing times to a C-contiguous 2-D array of
+    the smallest of int16/int32/int64 types, that holds all values.
+
+    C-contiguous `numpy.ndarray` of one of these types (in native byte
+    order) is returned as is.
+
+    Raises
+    ------
+    ValueError
+        if some of processing times isn't integer or doesn't fit int64
+    """
+    if isinstance(processing_times, np.ndarray) and \
+            processing_times.dtype in _ARRAY_DTYPES and \
+            processing_times.flags.c_contiguous:
+        return processing_times
+
+    array = np.asarray(processing_times)
+
+    if array.dtype.kind == 'f':
+        if not (np.isfinite(array) & (array == np.trunc(array))).all():
+            raise ValueError('processing_times must be integers')
+        # 2**63 isn't representable in int64, but it's in float64
+        out_of_range = array.size > 0 and \
+            not (-2.**63 <= array.min() and array.max() < 2.**63)
+    else:
+        out_of_range = array.dtype.kind == 'u' and array.size > 0 and \
+            array.max() > np.iinfo(np.int64).max
+    if out_of_range:
+        raise ValueError('processing_times must fit int64')
+
+    try:
+        array = np.array(array, dtype=np.int64, ndmin=2, order='C')
+    except OverflowError:
+        # Python integers, that don't fit any numpy type
+        raise ValueError('processing_times must fit int64')
+    if array.size == 0:
+        return array.astype(np.int16)
+
+    min_value, max_value = array.min(), array.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return array.astype(dtype)
+    return array
+
+
+class PartialScheduleEvaluator:
+
+    def __init__(self, flow_job_frame: JobSchedulingFrame,
+                 jobs_sequence: list = ()):
+        """
+        Keeps release times of machines for a partial sequence of jobs,
+        that can be extended or shortened from the end in O(m).
+
+        Parameters
+        ----------
+        flow_job_frame: JobSchedulingFrame
+        jobs_sequence: list, default ()
+            initial partial sequence
+        """
+        self._frame = flow_job_frame
+        self._jobs = []
+        # release times of machines after each prefix of `_jobs`
+        self._machines_times = [[0] * flow_job_frame.count_machines]
+
+        for idx_job in jobs_sequence:
+            self.push(idx_job)
+
+    def __len__(self):
+        return len(self._jobs)
+
+    @property
+    def jobs(self) -> list:
+        """
+        Returns copy of the partial sequence.
+
+        Returns
+        -------
+        : list
+        """
+        return list(self._jobs)
+
+    @property
+    def release_times(self) -> list:
+        """
+        Returns copy of release times of all machines for the partial
+        sequence, i.e. completion times of the last job.
+
+        Returns
+        -------
+        : list
+        """
+        return list(self._machines_times[-1])
+
+    @property
+    def end_time(self) -> int:
+        """
+        Returns end time of the partial sequence; 0 if it is empty.
+
+        Returns
+        -------
+        : int
+        """
+        return self._machines_times[-1][-1]
+
+    def completion_times(self, position: int = -1) -> list:
+        """
+        Returns copy of completion times on all machines of the job
+        at `position` of the partial sequence.
+
+        Parameters
+        ----------
+        position: int, default -1
+            can be negative, e.g. -2 for the second last job
+
+        Returns
+        -------
+        : list
+        """
+        if position < 0:
+            position += len(self._jobs)
+        if not 0 <= position < len(self._jobs):
+            raise IndexError('position out of range')
+        return list(self._machines_times[position + 1])
+
+    def peek(self, idx_job: int) -> list:
+        """
+        Returns release times of all machines if `idx_job` was appended
+        to the partial sequence; the sequence isn't changed.
+
+        Parameters
+        ----------
+        idx_job: int
+
+        Returns
+        -------
+        : list
+        """
+        job_times = self._frame.get_job_processing_times(idx_job).tolist()
+        return _release_times(self._machines_times[-1], job_times)
+
+    def push(self, idx_job: int):
+        """
+        Appends `idx_job` to the partial sequence.
+
+        Parameters
+        ----------
+        idx_job: int
+        """
+        self._machines_times.append(self.peek(idx_job))
+        self._jobs.append(idx_job)
+
+    def pop(self) -> int:
+        """
+        Removes the last job from the partial sequence.
+
+        Returns
+        -------
+        idx_job: int
+        """
+        if not self._jobs:
+            raise IndexError('pop from empty sequence')
+        self._machines_times.pop()
+        return self._jobs.pop()
+
+
+class _PrefixNode:
+    __slots__ = ('parent', 'job', 'children', 'release_times')
+
+    def __init__(self, parent, job, release_times):
+        self.parent = parent
+        self.job = job
+        self.children = {}
+        self.release_times = release_times
+
+
+class PrefixTreeEvaluator:
+
+    def __init__(self, flow_job_frame: JobSchedulingFrame,
+                 max_nodes: int = 100000):
+        """
+        Computes end times of many sequences of jobs, that share prefixes.
+
+        Release times of machines after each evaluated prefix are kept in
+        a tree, so evaluation of a sequence only computes completion times
+        of jobs after its longest known prefix.
+
+        Parameters
+        ----------
+        flow_job_frame: JobSchedulingFrame
+        max_nodes: int, default 100000
+            count of kept prefixes; each one takes about
+            8 * count of machines + 250 bytes. The least recently used
+            prefixes are removed with their extensions.
+        """
+        if not isinstance(max_nodes, int) or max_nodes < 0:
+            raise ValueError('max_nodes must be an integer >= 0')
+
+        self._frame = flow_job_frame
+        self.max_nodes = max_nodes
+        self._root = _PrefixNode(
+            None, None, np.zeros(flow_job_frame.count_machines,
+                                 dtype=np.int64))
+        # all nodes except root, from the least recently used one
+        self._nodes = OrderedDict()
+        # count of jobs, whose completion times were computed and reused
+        self.computed_jobs = 0
+        self.reused_jobs = 0
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def release_times(self, jobs_sequence: list) -> np.ndarray:
+        """
+        Returns release times of all machines for `jobs_sequence`,
+        i.e. completion times of its last job.
+
+        Parameters
+        ----------
+        jobs_sequence: list
+
+        Returns
+        -------
+        : numpy.ndarray
+        """
+        return self._find(jobs_sequence).release_times.copy()
+
+    def end_time(self, jobs_sequence: list) -> int:
+        """
+        Returns end time of `jobs_sequence`; 0 if it is empty.
+
+        Parameters
+        ----------
+        jobs_sequence: list
+
+        Returns
+        -------
+        : int
+        """
+        return int(self._find(jobs_sequence).release_times[-1])
+
+    def end_times(self, jobs_sequences) -> np.ndarray:
+        """
+        Returns end times of `jobs_sequences`, that can have different
+        length.
+
+        Parameters
+        ----------
+        jobs_sequences: list of lists or numpy.ndarray
+
+        Returns
+        -------
+        end_times: numpy.ndarray
+            end_times[k] - end time of `jobs_sequences[k]`
+        """
+        return np.array([self.end_time(jobs_sequence)
+                         for jobs_sequence in jobs_sequences],
+                        dtype=np.int64)
+
+    def clear(self):
+        """
+        Removes all kept prefixes.
+        """
+        self._root.children.clear()
+        self._nodes.clear()
+
+    def _find(self, jobs_sequence):
+        jobs_sequence = [int(idx_job) for idx_job in jobs_sequence]
+
+        # the longest known prefix
+        path = []
+        node = self._root
+        for idx_job in jobs_sequence:
+            child = node.children.get(idx_job)
+            if child is None:
+                break
+            path.append(child)
+            node = child
+        depth = len(path)
+        self.reused_jobs += depth
+
+        suffix = jobs_sequence[depth:]
+        if suffix:
+            # a job with these processing times gives the release times of
+            # the prefix, so the suffix is computed by one vectorized call
+            prefix_times = np.diff(node.release_times, prepend=0)
+            proc_times = np.vstack([prefix_times,
+                                    self._frame.array[suffix]])
+            completion_times = _completion_times(proc_times)[1:]
+            self.computed_jobs += len(suffix)
+
+            for idx_job, release_times in zip(suffix, completion_times):
+                child = _PrefixNode(node, idx_job, release_times.copy())
+                node.children[idx_job] = child
+                path.append(child)
+                node = child
+
+        # nodes are marked as used from the leaf to the root, so ancestors
+        # are used later than descendants and the least recently used node
+        # is always a leaf
+        for child in reversed(path):
+            self._nodes[child] = None
+            self._nodes.move_to_end(child)
+
+        while len(self._nodes) > self.max_nodes:
+            self._remove(next(iter(self._nodes)))
+        return node
+
+    def _remove(self, node):
+        # removes `node` with its subtree
+        del node.parent.children[node.job]
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            del self._nodes[node]
+            stack.extend(node.children.values())
+
+
 def create_schedule(flow_job_frame: JobSchedulingFrame,
                     jobs_sequence: list,
                     count_job: int = None,
@@ -281,29 +791,13 @@ def create_schedule(flow_job_frame: JobSchedulingFrame,
             count_job < 1 or count_machine < 1:
         raise ValueError('count_job and count_machine must be integers > 0')
 
-    schedule = {job: [] for job in jobs_sequence[:count_job]}
-    machines_time = [0 for _ in range(count_machine)]
+    jobs_sequence = np.asarray(jobs_sequence[:count_job], dtype=np.intp)
+    proc_times = flow_job_frame.array[jobs_sequence, :count_machine]
 
-    for job in jobs_sequence[:count_job]:
-        begin_time = machines_time[0]
-        end_time = begin_time + flow_job_frame.get_processing_time(job, 0)
-        schedule[job].append(Duration(0, begin_time, end_time))
-        machines_time[0] = end_time
-        for machine_index in range(1, count_machine):
-            job_time = flow_job_frame.get_processing_time(job, machine_index)
-            machine_release_time = machines_time[machine_index]
-            prev_machine_release_time = machines_time[machine_index - 1]
-
-            if machine_release_time >= prev_machine_release_time:
-                begin_time = machine_release_time
-            else:
-                begin_time = prev_machine_release_time
-
-            end_time = begin_time + job_time
-            machines_time[machine_index] = end_time
-            schedule[job].append(Duration(machine_index, begin_time, end_time))
-
-    return Schedule(schedule, machines_time[len(machines_time) - 1])
+    end_times = _completion_times(proc_times)
+    begin_times = end_times - proc_times
+    return Schedule._from_arrays(jobs_sequence, begin_times, end_times,
+                                 int(end_times[-1, -1]))
 
 
 # Almost all code is duplicated from `create_schedule` func; need to fix this
@@ -344,6 +838,215 @@ def compute_end_time(flow_job_frame: JobSchedulingFrame,
     return machines_time[len(machines_time) - 1]
 
 
+def compute_end_times(flow_job_frame: JobSchedulingFrame,
+                      jobs_sequences,
+                      count_job: int = None,
+                      count_machine: int = None) -> np.ndarray:
+    """
+    Compute end times for a batch of job sequences at once.
+
+    The recurrence is vectorized over the batch and over jobs, so its
+    Python loop runs only over machines.
+
+    Parameters
+    ----------
+    flow_job_frame: JobSchedulingFrame
+    jobs_sequences: list of lists or numpy.ndarray
+        K sequences of the same length
+    count_job: int, default None
+        count job from each sequence, for that will be compute end time
+    count_machine: int, default None
+        count machines, for that will be compute end time
+
+    Returns
+    -------
+    end_times: numpy.ndarray
+        end_times[k] - end time of `jobs_sequences[k]`
+    """
+    if len(jobs_sequences) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    try:
+        jobs_sequences = np.asarray(jobs_sequences, dtype=np.intp)
+        if jobs_sequences.ndim != 2:
+            raise ValueError
+    except ValueError:
+        raise ValueError('jobs_sequences must be sequences of the same length')
+
+    if count_job is None:
+        count_job = jobs_sequences.shape[1]
+    if count_machine is None:
+        count_machine = flow_job_frame.count_machines
+
+    if not isinstance(count_job, int) or not isinstance(count_machine, int) or\
+            count_job < 1 or count_machine < 1:
+        raise ValueError('count_job and count_machine must be integers > 0')
+
+    jobs_sequences = jobs_sequences[:, :count_job]
+    machines_time = np.zeros(jobs_sequences.shape, dtype=np.int64)
+
+    for times in flow_job_frame.machine_major[:count_machine]:
+        job_times = times[jobs_sequences]
+        cum_times = np.cumsum(job_times, axis=1, dtype=np.int64)
+        machines_time = cum_times + np.maximum.accumulate(
+            machines_time - (cum_times - job_times), axis=1)
+
+    return machines_time[:, -1]
+
+
+def _release_times(machines_time: list, job_times: list) -> list:
+    """
+    Compute release times of machines after appending a job with
+    `job_times` to a sequence with release times `machines_time`.
+    """
+    end_time = 0
+    release_times = []
+    for release_time, job_time in zip(machines_time, job_times):
+        if release_time > end_time:
+            end_time = release_time
+        end_time += job_time
+        release_times.append(end_time)
+    return release_times
+
+
+def _completion_times(proc_times: np.ndarray) -> np.ndarray:
+    """
+    Compute completion times of jobs, processed in the given order.
+
+    Parameters
+    ----------
+    proc_times: numpy.ndarray
+        array (..., K, M) of processing times of K jobs on M machines;
+        leading dimensions are processed as independent sequences
+
+    Returns
+    -------
+    : numpy.ndarray
+        int64 array of the same shape as `proc_times`
+
+    Notes
+    -----
+    The recurrence C[i][j] = max(C[i - 1][j], C[i][j - 1]) + p[i][j] is
+    vectorized over jobs: if S is the cumulative sum of processing times on
+    machine `j`, then C[i][j] = S[i] + max(C[l][j - 1] - S[l - 1], l <= i).
+    """
+    completion_times = np.empty(proc_times.shape, dtype=np.int64)
+    prev_machine_times = np.zeros(proc_times.shape[:-1], dtype=np.int64)
+
+    for machine_index in range(proc_times.shape[-1]):
+        job_times = proc_times[..., machine_index]
+        cum_times = np.cumsum(job_times, axis=-1, dtype=np.int64)
+        prev_machine_times = cum_times + np.maximum.accumulate(
+            prev_machine_times - (cum_times - job_times), axis=-1)
+        completion_times[..., machine_index] = prev_machine_times
+
+    return completion_times
+
+
+def compute_heads(flow_job_frame: JobSchedulingFrame,
+                  jobs_sequence: list) -> np.ndarray:
+    """
+    Compute earliest completion times (heads) of each job from
+    `jobs_sequence` on each machine.
+
+    Parameters
+    ----------
+    flow_job_frame: JobSchedulingFrame
+    jobs_sequence: list
+
+    Returns
+    -------
+    heads: numpy.ndarray
+        heads[i][j] - completion time of `jobs_sequence[i]` on machine `j`
+    """
+    jobs_sequence = np.asarray(jobs_sequence, dtype=np.intp)
+    return _completion_times(flow_job_frame.array[jobs_sequence])
+
+
+def compute_tails(flow_job_frame: JobSchedulingFrame,
+                  jobs_sequence: list) -> np.ndarray:
+    """
+    Compute tails of each job from `jobs_sequence` on each machine,
+    i.e. the minimal time from the start of a job on a machine
+    until the completion of all jobs.
+
+    Parameters
+    ----------
+    flow_job_frame: JobSchedulingFrame
+    jobs_sequence: list
+
+    Returns
+    -------
+    tails: numpy.ndarray
+        tails[i][j] - tail of `jobs_sequence[i]` on machine `j`;
+        contains an additional row of zeros for the position after the
+        last job
+    """
+    jobs_sequence = np.asarray(jobs_sequence, dtype=np.intp)
+    proc_times = flow_job_frame.array[jobs_sequence[::-1]][:, ::-1]
+
+    tails = np.zeros((len(jobs_sequence) + 1, flow_job_frame.count_machines),
+                     dtype=np.int64)
+    tails[:-1] = _completion_times(proc_times)[::-1, ::-1]
+    return tails
+
+
+def compute_insertion_end_times(flow_job_frame: JobSchedulingFrame,
+                                jobs_sequence: list, idx_job: int,
+                                heads: np.ndarray = None,
+                                tails: np.ndarray = None) -> np.ndarray:
+    """
+    Compute the makespan of each sequence obtained by inserting `idx_job`
+    in `jobs_sequence` at all `len(jobs_sequence) + 1` possible positions.
+
+    Uses the acceleration proposed by Taillard: all positions are
+    evaluated in one O(km) pass using heads and tails of `jobs_sequence`.
+
+    Parameters
+    ----------
+    flow_job_frame: JobSchedulingFrame
+    jobs_sequence: list
+    idx_job: int
+        job, that isn't contained in `jobs_sequence`
+    heads: numpy.ndarray, default None
+        result of `compute_heads` for `jobs_sequence`; computed if None
+    tails: numpy.ndarray, default None
+        result of `compute_tails` for `jobs_sequence`; computed if None
+
+    Returns
+    -------
+    end_times: numpy.ndarray
+        end_times[i] - makespan of the sequence with `idx_job`
+        inserted at position `i`
+
+    Notes
+    -----
+    Journal Paper:
+        Taillard, E., 1990. Some efficient heuristic methods for the flow
+        shop sequencing problem. European Journal of Operational Research
+        47(1), 65-74
+    """
+    if heads is None:
+        heads = compute_heads(flow_job_frame, jobs_sequence)
+    if tails is None:
+        tails = compute_tails(flow_job_frame, jobs_sequence)
+
+    job_times = flow_job_frame.get_job_processing_times(idx_job).tolist()
+    count_positions = len(heads) + 1
+
+    end_times = np.zeros(count_positions, dtype=np.int64)
+    makespans = np.zeros(count_positions, dtype=np.int64)
+    for machine_index, job_time in enumerate(job_times):
+        # heads of the job that precedes each insertion position
+        np.maximum(end_times[1:], heads[:, machine_index],
+                   out=end_times[1:])
+        end_times += job_time
+        np.maximum(makespans, end_times + tails[:, machine_index],
+                   out=makespans)
+
+    return makespans
+
+
 def _set_seed(initial_seed: Union[int, _NaN]):
     if initial_seed is not NaN:
         if not isinstance(initial_seed, int):
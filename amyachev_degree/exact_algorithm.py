@@ -1,4 +1,18 @@
-from amyachev_degree.core import JobSchedulingFrame
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from amyachev_degree.core import JobSchedulingFrame, compute_end_time
+from amyachev_degree.lower_bounds import lower_bound as root_lower_bound
+
+
+BranchAndBoundResult = namedtuple('BranchAndBoundResult', [
+    'solution', 'end_time', 'lower_bound', 'gap', 'optimal', 'nodes',
+    'elapsed_time', 'nodes_per_second'])
 
 
 def johnson_algorithm(frame: JobSchedulingFrame) -> list:
@@ -19,34 +33,267 @@ def johnson_algorithm(frame: JobSchedulingFrame) -> list:
     if frame.count_machines != 2:
         raise ValueError('count machines must be 2')
 
-    # init job indexes
-    exact_solution = [i for i in range(frame.count_jobs)]
+    first_machine_times, second_machine_times = frame.machine_major
+    return batch_johnson_algorithm(first_machine_times,
+                                   second_machine_times)[0].tolist()
+
+
+def batch_johnson_algorithm(first_machine_times,
+                            second_machine_times) -> np.ndarray:
+    """
+    Compute solutions for K independent problems of 2 machines at once by
+    Johnson's algorithm; gives the same sequences as `johnson_algorithm`.
+
+    Parameters
+    ----------
+    first_machine_times: numpy.ndarray
+        array K x N of processing times of N jobs on the first machine
+    second_machine_times: numpy.ndarray
+        array K x N of processing times of N jobs on the second machine
+
+    Returns
+    -------
+    exact_solutions: numpy.ndarray
+        array K x N of job indexes
+    """
+    first_machine_times = np.atleast_2d(first_machine_times)
+    second_machine_times = np.atleast_2d(second_machine_times)
+    count_jobs = first_machine_times.shape[1]
 
     # sorting by increasing the minimum processing time
-    exact_solution.sort(
-        key=lambda idx_job: min(
-            frame.get_processing_time(idx_job, idx_machine=0),
-            frame.get_processing_time(idx_job, idx_machine=1)
-        )
-    )
-
-    jobs_on_first_machine = []
-    jobs_on_second_machine = []
-
-    # distribution of jobs on machines
-    for idx_job in exact_solution:
-        frst = frame.get_processing_time(idx_job, idx_machine=0)
-        scnd = frame.get_processing_time(idx_job, idx_machine=1)
-        if frst < scnd:
-            jobs_on_first_machine.append(idx_job)
-        else:
-            jobs_on_second_machine.append(idx_job)
-
-    exact_solution = jobs_on_first_machine
-
-    # simulating the installation of jobs that are processed faster on the
-    # second machine to the end of the processing queue on the first machine
-    jobs_on_second_machine.reverse()
-    exact_solution.extend(jobs_on_second_machine)
-
-    return exact_solution
+    order = np.argsort(np.minimum(first_machine_times, second_machine_times),
+                       axis=1, kind='stable')
+    on_first_machine = np.take_along_axis(first_machine_times, order, 1) < \
+        np.take_along_axis(second_machine_times, order, 1)
+
+    # jobs, that are processed faster on the first machine, keep the order;
+    # the rest go to the end of the queue in the reversed order
+    positions = np.arange(count_jobs)
+    ranks = np.where(on_first_machine, positions, 2 * count_jobs - positions)
+    return np.take_along_axis(order, np.argsort(ranks, axis=1), 1)
+
+
+def _min_excluding(values: np.ndarray) -> np.ndarray:
+    # result[i][k] - minimum of values[:, k] without the i-th row
+    columns = np.arange(values.shape[1])
+    idx_min = values.argmin(axis=0)
+    result = np.broadcast_to(values[idx_min, columns], values.shape).copy()
+
+    masked = values.copy()
+    masked[idx_min, columns] = np.iinfo(np.int64).max
+    result[idx_min, columns] = masked.min(axis=0)
+    return result
+
+
+def _heads_and_tails(proc_times: np.ndarray) -> tuple:
+    # heads[j][k] - time of job `j` before machine `k`,
+    # tails[j][k] - time of job `j` after machine `k`
+    cumulative_times = np.cumsum(proc_times, axis=1)
+    return (cumulative_times - proc_times,
+            cumulative_times[:, -1:] - cumulative_times)
+
+
+def _children_bounds(proc_times: np.ndarray, heads: np.ndarray,
+                     tails: np.ndarray, release: np.ndarray,
+                     jobs: np.ndarray, sums: np.ndarray) -> tuple:
+    # machine-based lower bounds of all children of the node, that has
+    # release times `release`, unscheduled `jobs` and sums of their
+    # processing times on machines `sums`; each child appends one job
+    job_times = proc_times[jobs]
+    releases = np.empty_like(job_times)
+    machine_time = np.zeros(len(jobs), dtype=np.int64)
+    for idx_machine in range(proc_times.shape[1]):
+        machine_time = np.maximum(machine_time, release[idx_machine]) + \
+            job_times[:, idx_machine]
+        releases[:, idx_machine] = machine_time
+
+    if len(jobs) == 1:
+        # the child is a complete sequence
+        return releases[:, -1].copy(), releases
+
+    # for each machine: the earliest start of the remaining jobs, plus their
+    # total processing time, plus the minimal time after the machine
+    begin_times = np.maximum(releases,
+                             releases[:, :1] + _min_excluding(heads[jobs]))
+    bounds = begin_times + (sums - job_times) + _min_excluding(tails[jobs])
+    return bounds.max(axis=1), releases
+
+
+def _depth_first_search(proc_times: np.ndarray, root: tuple,
+                        end_time: int, solution: list,
+                        node_limit: int = None,
+                        deadline: float = None) -> tuple:
+    # root - (lower bound, sequence, release times, sums of processing times
+    # of unscheduled jobs); `deadline` - value of `time.time()`, that is
+    # comparable between processes; returns the best found end time and
+    # solution, count of expanded nodes and the lower bound of the subtree
+    count_jobs = proc_times.shape[0]
+    heads, tails = _heads_and_tails(proc_times)
+
+    nodes = 0
+    stack = [root]
+    while stack:
+        if node_limit is not None and nodes >= node_limit:
+            break
+        if deadline is not None and time.time() >= deadline:
+            break
+
+        bound, sequence, release, sums = stack.pop()
+        if bound >= end_time:
+            continue
+        nodes += 1
+
+        unscheduled = np.ones(count_jobs, dtype=bool)
+        unscheduled[sequence] = False
+        jobs = np.flatnonzero(unscheduled)
+
+        bounds, releases = _children_bounds(proc_times, heads, tails,
+                                            release, jobs, sums)
+        if len(jobs) == 1:
+            if bounds[0] < end_time:
+                end_time = int(bounds[0])
+                solution = sequence + [int(jobs[0])]
+            continue
+
+        # the most promising child is expanded first
+        for idx in np.argsort(-bounds, kind='stable'):
+            if bounds[idx] < end_time:
+                idx_job = int(jobs[idx])
+                stack.append((int(bounds[idx]), sequence + [idx_job],
+                              releases[idx], sums - proc_times[idx_job]))
+
+    lower_bound = min([end_time] + [node[0] for node in stack])
+    return end_time, solution, nodes, lower_bound
+
+
+def _search_subtree(proc_times: np.ndarray, end_time: int, solution: list,
+                    node_limit: int, deadline: float, root: tuple) -> tuple:
+    return _depth_first_search(proc_times, root, end_time, solution,
+                               node_limit, deadline)
+
+
+def branch_and_bound(frame: JobSchedulingFrame, init_jobs: list = None,
+                     node_limit: int = None, time_limit: float = None,
+                     workers: int = 1) -> BranchAndBoundResult:
+    """
+    Compute exact solution of flow job problem by depth-first
+    branch and bound.
+
+    Nodes are partial sequences; a node is pruned if its machine-based
+    lower bound isn't less than the makespan of the best found sequence.
+    Bounds of all children of a node are computed at once from the release
+    times of the node, updated by the appended job.
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+    init_jobs: list, default None
+        initial solution; if None, jobs in NEH order are inserted one by one
+        at the best position
+    node_limit: int, default None
+        if specified, limits count of expanded nodes; with several workers
+        it's divided between the subtrees of the first job
+    time_limit: float, default None
+        if specified, wall-clock budget in seconds; computing of the
+        initial solution, if `init_jobs` is None, counts against it
+    workers: int or None, default 1
+        count of worker processes; subtrees of the first job are searched
+        in parallel, each one with its own best found solution.
+        If None then `os.cpu_count()` is used.
+
+    Returns
+    -------
+    result: BranchAndBoundResult
+        solution - the best found sequence of job index;
+        end_time - makespan of `solution`;
+        lower_bound - lower bound of the optimal makespan;
+        gap - (end_time - lower_bound) / lower_bound * 100; infinity if
+        `solution` isn't proven optimal and `lower_bound` is 0;
+        optimal - True if `solution` is proven to be optimal;
+        nodes - count of expanded nodes;
+        elapsed_time - in seconds;
+        nodes_per_second
+
+    Notes
+    -----
+    Journal Paper:
+        Ignall, E., Schrage, L., 1965. Application of the branch and bound
+        technique to some flow-shop scheduling problems.
+        Operations Research 13(3), 400-412
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if isinstance(workers, bool) or not isinstance(workers, int) or \
+            workers < 1:
+        raise ValueError('workers must be an integer > 0 or None')
+
+    begin = time.perf_counter()
+    deadline = None
+    if time_limit is not None:
+        deadline = time.time() + time_limit
+
+    if init_jobs is None:
+        # imported here, because `simple_heuristics` depends on this module
+        from amyachev_degree.simple_heuristics import neh_heuristics
+        init_jobs = neh_heuristics(frame)
+    solution = list(init_jobs)
+    end_time = compute_end_time(frame, solution)
+
+    proc_times = frame.array.astype(np.int64)
+    count_jobs, count_machines = proc_times.shape
+    sums = proc_times.sum(axis=0)
+    root = (0, [], np.zeros(count_machines, dtype=np.int64), sums)
+
+    if workers == 1 or count_jobs < 2:
+        end_time, solution, nodes, lower_bound = _depth_first_search(
+            proc_times, root, end_time, solution, node_limit, deadline)
+    else:
+        # expand the root, then search subtrees of the first job in parallel
+        heads, tails = _heads_and_tails(proc_times)
+        bounds, releases = _children_bounds(
+            proc_times, heads, tails, root[2], np.arange(count_jobs), sums)
+        nodes = 1
+        subtrees = [(int(bounds[idx_job]), [idx_job], releases[idx_job],
+                     sums - proc_times[idx_job])
+                    for idx_job in np.argsort(bounds, kind='stable').tolist()
+                    if bounds[idx_job] < end_time]
+
+        lower_bound = end_time
+        if subtrees:
+            subtree_node_limit = None
+            if node_limit is not None:
+                subtree_node_limit = max(1, (node_limit - nodes) //
+                                         len(subtrees))
+
+            search = partial(_search_subtree, proc_times, end_time, solution,
+                             subtree_node_limit, deadline)
+            with ProcessPoolExecutor(
+                    max_workers=min(workers, len(subtrees))) as executor:
+                results = list(executor.map(search, subtrees))
+
+            for subtree_end_time, subtree_solution, subtree_nodes, \
+                    subtree_lower_bound in results:
+                nodes += subtree_nodes
+                lower_bound = min(lower_bound, subtree_lower_bound)
+                if subtree_end_time < end_time:
+                    end_time, solution = subtree_end_time, subtree_solution
+
+    # the bound of the whole problem holds, even if the budget is exhausted
+    # before the root is expanded
+    if count_jobs > 0:
+        lower_bound = max(lower_bound, root_lower_bound(frame))
+    lower_bound = min(lower_bound, end_time)
+    if lower_bound == end_time:
+        gap = 0.
+    elif lower_bound > 0:
+        gap = (end_time - lower_bound) / lower_bound * 100
+    else:
+        gap = float('inf')
+    elapsed_time = time.perf_counter() - begin
+    return BranchAndBoundResult(
+        solution=solution, end_time=end_time, lower_bound=lower_bound,
+        gap=gap,
+        optimal=lower_bound == end_time, nodes=nodes,
+        elapsed_time=elapsed_time,
+        nodes_per_second=nodes / elapsed_time if elapsed_time else 0.)
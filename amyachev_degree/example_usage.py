@@ -1,5 +1,5 @@
 from amyachev_degree import (
-    read_flow_shop_instances, neh_heuristics, create_schedule)
+    read_flow_shop_instances, neh_heuristics, create_schedule, lower_bound)
 
 instances = read_flow_shop_instances("D:/pipeline_task.txt")
 
@@ -12,5 +12,4 @@ print(schedule)
 print(sch.end_time)
 print(sch)
 
-
-# TODO implement lower bound of flow shop problem
+print(lower_bound(instances[1]))
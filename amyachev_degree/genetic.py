@@ -0,0 +1,419 @@
+"""
+Genetic algorithm for the permutation flow shop problem.
+
+Port of `old_src_from_course_work/genetic_algorithm.{h,cpp}`. The population
+is stored as one 2-D integer array (one individual per row), so fitness of
+the whole population is computed by one call of `compute_end_times` and
+crossover, mutation and selection operate on all individuals at once.
+"""
+import time
+
+import numpy as np
+
+from amyachev_degree.core import (
+    EvaluationCounter, JobSchedulingFrame, compute_end_times)
+
+
+SHARE_MUTATION = 0.05
+SIZE_TOURNAMENT = 4
+
+
+def create_initial_population(count_jobs: int, size_population: int,
+                              rng: np.random.Generator,
+                              init_jobs: list = None) -> np.ndarray:
+    """
+    Create initial population.
+
+    Parameters
+    ----------
+    count_jobs: int
+    size_population: int
+        count of random individuals, if `init_jobs` isn't specified
+    rng: numpy.random.Generator
+    init_jobs: list, default None
+        if specified, the population consists of `init_jobs` and
+        `count_jobs - 1` sequences obtained by exchanging its neighbouring
+        jobs, as in the reference; `size_population` isn't used then
+
+    Returns
+    -------
+    population: numpy.ndarray
+        population[i] - permutation of job indexes
+    """
+    if init_jobs is None:
+        return np.argsort(rng.random((size_population, count_jobs)), axis=1)
+
+    population = np.tile(np.asarray(init_jobs, dtype=np.intp),
+                         (count_jobs, 1))
+    rows = np.arange(1, count_jobs)
+    population[rows, rows - 1], population[rows, rows] = \
+        population[rows, rows], population[rows, rows - 1]
+    return population
+
+
+def crossover_ox(first_parents: np.ndarray, second_parents: np.ndarray,
+                 first_points: np.ndarray,
+                 second_points: np.ndarray) -> np.ndarray:
+    """
+    Order crossover (OX).
+
+    The child keeps the section `[first_point, second_point]` of the first
+    parent; the rest positions, starting after the section, are filled with
+    the missing jobs in the order they follow in the second parent, also
+    starting after the section.
+
+    Parameters
+    ----------
+    first_parents: numpy.ndarray
+    second_parents: numpy.ndarray
+    first_points: numpy.ndarray
+        first_points[i] - begin of the section for the i-th pair of parents
+    second_points: numpy.ndarray
+        second_points[i] - end of the section (inclusive),
+        `first_points[i] <= second_points[i]`
+
+    Returns
+    -------
+    children: numpy.ndarray
+    """
+    count_children, count_jobs = first_parents.shape
+    rows = np.arange(count_children)[:, np.newaxis]
+    positions = np.arange(count_jobs)
+
+    in_section = (positions >= first_points[:, np.newaxis]) & \
+        (positions <= second_points[:, np.newaxis])
+    # in_section_jobs[i][job] - `job` is in the section of the first parent
+    in_section_jobs = np.zeros_like(in_section)
+    in_section_jobs[rows, first_parents] = in_section
+
+    # positions in the order they are filled, starting after the section
+    order = (second_points[:, np.newaxis] + 1 + positions) % count_jobs
+    second_jobs = second_parents[rows, order]
+    missing_jobs = ~in_section_jobs[rows, second_jobs]
+    free_positions = ~in_section[rows, order]
+
+    # each row has as many missing jobs as free positions, so row-major
+    # boolean indexing matches them row by row
+    children = first_parents.copy()
+    children[np.broadcast_to(rows, order.shape)[free_positions],
+             order[free_positions]] = second_jobs[missing_jobs]
+    return children
+
+
+def crossover_cx(first_parents: np.ndarray, second_parents: np.ndarray,
+                 rng: np.random.Generator) -> np.ndarray:
+    """
+    Cycle crossover (CX).
+
+    Positions of parents are divided into cycles; each cycle of the child
+    is inherited from a random parent.
+
+    Parameters
+    ----------
+    first_parents: numpy.ndarray
+    second_parents: numpy.ndarray
+    rng: numpy.random.Generator
+
+    Returns
+    -------
+    children: numpy.ndarray
+    """
+    count_children, count_jobs = first_parents.shape
+    rows = np.arange(count_children)[:, np.newaxis]
+
+    first_positions = np.empty_like(first_parents)
+    first_positions[rows, first_parents] = np.arange(count_jobs)
+    # next position in the cycle
+    successors = first_positions[rows, second_parents]
+
+    # label each position with the minimal position of its cycle
+    # by pointer jumping
+    cycles = np.broadcast_to(np.arange(count_jobs),
+                             first_parents.shape).copy()
+    for _ in range(max(1, int(count_jobs - 1).bit_length())):
+        np.minimum(cycles, cycles[rows, successors], out=cycles)
+        successors = successors[rows, successors]
+
+    from_second = rng.random(first_parents.shape) < 0.5
+    from_second = from_second[rows, cycles]
+    return np.where(from_second, second_parents, first_parents)
+
+
+def point_mutation(population: np.ndarray,
+                   rng: np.random.Generator) -> np.ndarray:
+    """
+    Exchange two random neighbouring jobs in each individual.
+
+    Parameters
+    ----------
+    population: numpy.ndarray
+    rng: numpy.random.Generator
+
+    Returns
+    -------
+    mutants: numpy.ndarray
+    """
+    count_mutants, count_jobs = population.shape
+    first_points = rng.integers(0, count_jobs - 1, count_mutants)
+    return _exchange(population, first_points, first_points + 1)
+
+
+def saltation(population: np.ndarray,
+              rng: np.random.Generator) -> np.ndarray:
+    """
+    Exchange two random different jobs in each individual.
+
+    Parameters
+    ----------
+    population: numpy.ndarray
+    rng: numpy.random.Generator
+
+    Returns
+    -------
+    mutants: numpy.ndarray
+    """
+    count_mutants, count_jobs = population.shape
+    first_points = rng.integers(0, count_jobs, count_mutants)
+    second_points = rng.integers(0, count_jobs - 1, count_mutants)
+    second_points += second_points >= first_points
+    return _exchange(population, first_points, second_points)
+
+
+def _exchange(population, first_points, second_points):
+    mutants = population.copy()
+    rows = np.arange(len(population))
+    mutants[rows, first_points] = population[rows, second_points]
+    mutants[rows, second_points] = population[rows, first_points]
+    return mutants
+
+
+def b_tournament_selection(fitness: np.ndarray, count: int,
+                           rng: np.random.Generator) -> np.ndarray:
+    """
+    Select `count` different individuals, each one is the best of
+    `SIZE_TOURNAMENT` random individuals, that aren't selected yet.
+
+    As in the reference, participants of a tournament are drawn with
+    replacement, and the winner is removed from the next tournaments.
+
+    Parameters
+    ----------
+    fitness: numpy.ndarray
+        makespans of individuals
+    count: int
+        not greater than `len(fitness)`
+    rng: numpy.random.Generator
+
+    Returns
+    -------
+    indexes: numpy.ndarray
+        indexes of selected individuals
+    """
+    # tournaments depend on the previous winners, so they are sequential
+    remaining = np.arange(len(fitness))
+    indexes = np.empty(count, dtype=np.intp)
+    for idx in range(count):
+        participants = rng.integers(0, len(remaining), SIZE_TOURNAMENT)
+        winner = participants[fitness[remaining[participants]].argmin()]
+        indexes[idx] = remaining[winner]
+        remaining = np.delete(remaining, winner)
+    return indexes
+
+
+def roulette_selection(fitness: np.ndarray, count: int,
+                       rng: np.random.Generator,
+                       population: np.ndarray = None) -> np.ndarray:
+    """
+    Select `count` individuals with probabilities, that are the greater,
+    the less is makespan of an individual.
+
+    As in the reference, the share of an individual is its makespan
+    divided by the total one; the shares are reassigned in reverse order
+    of their size, so the individual with the least share gets the
+    greatest one, the second least - the second greatest and so on.
+
+    Parameters
+    ----------
+    fitness: numpy.ndarray
+        makespans of individuals
+    count: int
+    rng: numpy.random.Generator
+    population: numpy.ndarray, default None
+        if specified, identical individuals are a single entry of the
+        roulette with their total share, as in the reference
+
+    Returns
+    -------
+    indexes: numpy.ndarray
+        indexes of selected individuals; the first one of identical
+        individuals is selected
+    """
+    entries = np.arange(len(fitness))
+    shares = fitness.astype(np.float64)
+    if population is not None:
+        _, entries, inverse = np.unique(population, axis=0,
+                                        return_index=True,
+                                        return_inverse=True)
+        shares = np.bincount(inverse.ravel(), weights=shares)
+    if shares.sum() == 0:
+        shares[:] = 1.
+
+    order = np.argsort(shares, kind='stable')
+    probabilities = np.empty_like(shares)
+    probabilities[order] = shares[order[::-1]]
+    return entries[rng.choice(len(entries), count,
+                              p=probabilities / probabilities.sum())]
+
+
+CROSSOVERS = {'ox', 'cx'}
+MUTATIONS = {'point': point_mutation, 'saltation': saltation}
+SELECTIONS = {'b_tournament', 'roulette'}
+
+
+def genetic_algorithm(frame: JobSchedulingFrame, init_jobs: list = None,
+                      size_population: int = 10, crossover: str = 'ox',
+                      mutation: str = 'saltation',
+                      selection: str = 'b_tournament',
+                      count_generations_wait: int = None,
+                      max_generations: int = None, time_limit: float = None,
+                      seed: int = None,
+                      counter: EvaluationCounter = None,
+                      on_improvement: object = None) -> list:
+    """
+    Compute approximate solution for instance of Flow Job problem by
+    genetic algorithm.
+
+    Each generation pairs of parents are chosen at random (panmixia),
+    every pair gives two children by `crossover`, `SHARE_MUTATION` of the
+    children are mutated; the next generation is selected from children
+    and mutants by `selection` and always keeps the best parent.
+
+    Unlike the reference, the evolution stops after `count_generations_wait`
+    generations without improvement of the best solution; the reference
+    counts generations, where the best solution isn't getting worse.
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+    init_jobs: list, default None
+        if specified, the initial population is created around it,
+        otherwise it's random (see `create_initial_population`)
+    size_population: int, default 10
+        size of each generation after the initial one
+    crossover: {'ox', 'cx'}, default 'ox'
+    mutation: {'point', 'saltation'}, default 'saltation'
+    selection: {'b_tournament', 'roulette'}, default 'b_tournament'
+    count_generations_wait: int, default None
+        the evolution stops after this count of generations without
+        improvement of the best solution; 6 * count of jobs by default
+    max_generations: int, default None
+        if specified, limits count of generations
+    time_limit: float, default None
+        if specified, wall-clock budget in seconds
+    seed: int, default None
+    counter: EvaluationCounter, default None
+        if specified, counts performed full evaluations
+    on_improvement: object, default None
+        function callback, that is called with each new best found
+        solution and its makespan
+
+    Returns
+    -------
+    solution: list
+        sequence of job index
+    """
+    if crossover not in CROSSOVERS:
+        raise ValueError('crossover must be one of %s' % sorted(CROSSOVERS))
+    if mutation not in MUTATIONS:
+        raise ValueError('mutation must be one of %s' % sorted(MUTATIONS))
+    if selection not in SELECTIONS:
+        raise ValueError('selection must be one of %s' % sorted(SELECTIONS))
+    if size_population < 2:
+        raise ValueError('size_population must be an integer > 1')
+
+    count_jobs = frame.count_jobs
+    if count_jobs < 2:
+        return list(range(count_jobs))
+
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    if count_generations_wait is None:
+        count_generations_wait = 6 * count_jobs
+
+    rng = np.random.default_rng(seed)
+    mutate = MUTATIONS[mutation]
+    count_pairs = 2 * size_population
+
+    def evaluate(population):
+        if counter is not None:
+            counter.full_evaluations += len(population)
+        return compute_end_times(frame, population)
+
+    parents = create_initial_population(count_jobs, size_population, rng,
+                                        init_jobs)
+    parents_fitness = evaluate(parents)
+
+    def improved():
+        if on_improvement is not None:
+            idx_best = parents_fitness.argmin()
+            on_improvement(parents[idx_best].tolist(),
+                           int(parents_fitness[idx_best]))
+
+    generation = 0
+    generations_without_improvement = 0
+    best_fitness = parents_fitness.min()
+    improved()
+    while generations_without_improvement < count_generations_wait:
+        if max_generations is not None and generation >= max_generations:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        generation += 1
+
+        # reproduction
+        pairs = rng.integers(0, len(parents), (count_pairs, 2))
+        first_parents = parents[pairs[:, 0]]
+        second_parents = parents[pairs[:, 1]]
+        if crossover == 'ox':
+            points = np.sort(rng.integers(0, count_jobs, (count_pairs, 2)),
+                             axis=1)
+            children = np.concatenate([
+                crossover_ox(first_parents, second_parents,
+                             points[:, 0], points[:, 1]),
+                crossover_ox(second_parents, first_parents,
+                             points[:, 0], points[:, 1])])
+        else:
+            children = np.concatenate([
+                crossover_cx(first_parents, second_parents, rng),
+                crossover_cx(second_parents, first_parents, rng)])
+
+        # mutation
+        is_mutant = rng.random(len(children)) < SHARE_MUTATION
+        candidates = np.concatenate([children,
+                                     mutate(children[is_mutant], rng)])
+        candidates_fitness = evaluate(candidates)
+
+        # selection of the next generation with the best parent
+        idx_best = parents_fitness.argmin()
+        if selection == 'b_tournament':
+            selected = b_tournament_selection(candidates_fitness,
+                                              size_population - 1, rng)
+        else:
+            selected = roulette_selection(candidates_fitness,
+                                          size_population - 1, rng,
+                                          candidates)
+        parents = np.concatenate([parents[idx_best:idx_best + 1],
+                                  candidates[selected]])
+        parents_fitness = np.concatenate([
+            parents_fitness[idx_best:idx_best + 1],
+            candidates_fitness[selected]])
+
+        if parents_fitness.min() < best_fitness:
+            best_fitness = parents_fitness.min()
+            generations_without_improvement = 0
+            improved()
+        else:
+            generations_without_improvement += 1
+
+    return parents[parents_fitness.argmin()].tolist()
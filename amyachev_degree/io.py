@@ -1,7 +1,8 @@
+import hashlib
+import os
 import re
 import time
-import plotly
-import plotly.figure_factory as ff
+import numpy as np
 
 from amyachev_degree.core import JobSchedulingFrame
 
@@ -19,13 +20,285 @@ class FlowShopFormatError(Exception):
         return 'File "%s", %s' % (self.file_name, self.error_message)
 
 
-def read_flow_shop_instances(file_name):
+# size of buffer used to read files with instances
+READ_BUFFER_SIZE = 1 << 20
+
+
+def _parse_integers(string):
+    try:
+        # fast path for lines of whitespace separated numbers
+        return [int(token) for token in string.split()]
+    except ValueError:
+        return [int(token) for token in re.findall(r'\d+', string)]
+
+
+def _iter_instance_records(file_name, lines=None):
+    # yields (count_jobs, count_machines, initial_seed, upper_bound,
+    # lower_bound, processing times machine by machine) for each instance
+    # from `lines` or from the file; lower bound is -1 if it's absent
+    if lines is None:
+        with open(file_name, buffering=READ_BUFFER_SIZE) as file:
+            yield from _iter_instance_records(file_name, file)
+        return
+
+    file = iter(lines)
+    counter_lines = 0
+    count_instances = 0
+    for string in file:
+        counter_lines += 1
+        if not string.strip().startswith('number'):
+            continue
+
+        try:
+            string = next(file)
+            counter_lines += 1
+            params = _parse_integers(string)[:5]
+            if len(params) < 4:
+                raise FlowShopFormatError(file_name, counter_lines)
+            count_jobs, count_machines, initial_seed, upper_bound = \
+                params[:4]
+            lower_bound = params[4] if len(params) == 5 else -1
+
+            string = next(file)
+            counter_lines += 1
+            if not string.strip().startswith('processing'):
+                raise FlowShopFormatError(file_name, counter_lines)
+
+            machines_times = []
+            for _ in range(count_machines):
+                string = next(file)
+                counter_lines += 1
+                times = _parse_integers(string)
+                if len(times) != count_jobs:
+                    raise FlowShopFormatError(file_name, counter_lines)
+                machines_times.append(times)
+        except StopIteration:
+            raise FlowShopFormatError(file_name, counter_lines)
+
+        count_instances += 1
+        yield (count_jobs, count_machines, initial_seed, upper_bound,
+               lower_bound, machines_times)
+
+    if count_instances == 0:
+        raise FlowShopFormatError(file_name, None)
+
+
+def iter_flow_shop_instances(file_name):
+    """
+    Lazy read from file with Tailard's instances to JobSchedulingFrames;
+    only the instance that is being read is kept in memory.
+
+    Parameters
+    ----------
+    file_name: str
+
+    Yields
+    ------
+    frame: JobSchedulingFrame
+
+    Raises
+    ------
+    FlowShopFormatError
+        if the file has wrong format or doesn't contain any instance;
+        the instances, that precede the wrong place, are yielded before
+
+    Notes
+    -----
+    File format is described in `read_flow_shop_instances`.
+    """
+    return _iter_frames(_iter_instance_records(file_name))
+
+
+def parse_flow_shop_instances(text, name='<string>'):
+    """
+    Read Tailard's instances from string to JobSchedulingFrames.
+
+    Parameters
+    ----------
+    text: str
+        instances in the format described in `read_flow_shop_instances`
+    name: str, default '<string>'
+        source name used in error messages
+
+    Returns
+    -------
+    frames: list
+        list of JobSchedulingFrame
+
+    Raises
+    ------
+    FlowShopFormatError
+        if `text` has wrong format or doesn't contain any instance
+    """
+    lines = iter(text.splitlines())
+    return list(_iter_frames(_iter_instance_records(name, lines)))
+
+
+def _iter_frames(records):
+    for count_jobs, count_machines, _, upper_bound, _, machines_times in \
+            records:
+        processing_time = list(zip(*machines_times))  # transpose
+
+        assert count_jobs == len(processing_time)
+        assert count_machines == len(processing_time[0])
+
+        yield JobSchedulingFrame(processing_time, upper_bound=upper_bound)
+
+
+# binary cache of instances: header, table of instances, processing times
+# of each instance as N x M array, job by job; all numbers are little-endian
+CACHE_SUFFIX = '.fscache'
+_CACHE_MAGIC = b'FSCACHE1'
+_CACHE_VERSION = 1
+_CACHE_HEADER = np.dtype([('magic', 'S8'), ('version', '<i8'),
+                          ('mtime_ns', '<i8'), ('size', '<i8'),
+                          ('digest', 'u1', (32,)), ('count_instances', '<i8'),
+                          ('itemsize', '<i8')])
+_CACHE_RECORD = np.dtype([('count_jobs', '<i8'), ('count_machines', '<i8'),
+                          ('initial_seed', '<i8'), ('upper_bound', '<i8'),
+                          ('lower_bound', '<i8'), ('offset', '<i8')])
+_CACHE_ALIGNMENT = 8
+
+
+def _file_digest(file_name):
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as file:
+        for block in iter(lambda: file.read(READ_BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def _write_instances_cache(file_name, cache_file):
+    stat = os.stat(file_name)
+    digest = _file_digest(file_name)
+    records = list(_iter_instance_records(file_name))
+
+    arrays = [np.array(machines_times, dtype=np.int64).T
+              for *_, machines_times in records]
+    dtype = np.dtype('<i8')
+    for candidate in ('<i2', '<i4'):
+        info = np.iinfo(candidate)
+        if all(array.size == 0 or (info.min <= array.min() and
+                                   array.max() <= info.max)
+               for array in arrays):
+            dtype = np.dtype(candidate)
+            break
+
+    header = np.zeros(1, dtype=_CACHE_HEADER)
+    header[0] = (_CACHE_MAGIC, _CACHE_VERSION, stat.st_mtime_ns,
+                 stat.st_size, np.frombuffer(digest, dtype=np.uint8),
+                 len(records), dtype.itemsize)
+
+    table = np.zeros(len(records), dtype=_CACHE_RECORD)
+    offset = _CACHE_HEADER.itemsize + table.nbytes
+    for idx, (record, array) in enumerate(zip(records, arrays)):
+        offset += -offset % _CACHE_ALIGNMENT
+        table[idx] = record[:5] + (offset,)
+        offset += array.size * dtype.itemsize
+
+    # write to a temporary file to not leave a broken cache
+    temp_file = '%s.%d.tmp' % (cache_file, os.getpid())
+    try:
+        with open(temp_file, 'wb') as file:
+            file.write(header.tobytes())
+            file.write(table.tobytes())
+            for record, array in zip(table, arrays):
+                file.write(b'\0' * (int(record['offset']) - file.tell()))
+                file.write(array.astype(dtype).tobytes())
+        os.replace(temp_file, cache_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def _refresh_cache_header(cache_file, stat):
+    # stores the current modification time and size of the source, so the
+    # next loads don't hash it again
+    mtime_offset = _CACHE_HEADER.fields['mtime_ns'][1]
+    size_offset = _CACHE_HEADER.fields['size'][1]
+    try:
+        with open(cache_file, 'r+b') as file:
+            file.seek(mtime_offset)
+            file.write(np.array(stat.st_mtime_ns, dtype='<i8').tobytes())
+            file.seek(size_offset)
+            file.write(np.array(stat.st_size, dtype='<i8').tobytes())
+    except OSError:
+        pass
+
+
+def _load_instances_cache(file_name, cache_file):
+    # returns None if the cache doesn't exist or is invalid
+    try:
+        buffer = np.memmap(cache_file, dtype=np.uint8, mode='r')
+    except (OSError, ValueError):
+        return None
+    try:
+        return _instances_from_cache(file_name, cache_file, buffer)
+    except (ValueError, TypeError):
+        # truncated or corrupted file
+        return None
+
+
+def _instances_from_cache(file_name, cache_file, buffer):
+    if len(buffer) < _CACHE_HEADER.itemsize:
+        return None
+
+    header = np.frombuffer(buffer, dtype=_CACHE_HEADER, count=1)[0]
+    if header['magic'] != _CACHE_MAGIC or \
+            header['version'] != _CACHE_VERSION:
+        return None
+
+    count_instances = int(header['count_instances'])
+    itemsize = int(header['itemsize'])
+    if itemsize not in (2, 4, 8) or count_instances < 0 or \
+            _CACHE_HEADER.itemsize + count_instances * \
+            _CACHE_RECORD.itemsize > len(buffer):
+        return None
+
+    table = np.frombuffer(buffer, dtype=_CACHE_RECORD,
+                          count=count_instances,
+                          offset=_CACHE_HEADER.itemsize).tolist()
+    for count_jobs, count_machines, _, _, _, offset in table:
+        if count_jobs < 0 or count_machines < 0 or offset < 0 or \
+                offset + count_jobs * count_machines * itemsize > \
+                len(buffer):
+            return None
+
+    stat = os.stat(file_name)
+    if (header['mtime_ns'], header['size']) != (stat.st_mtime_ns,
+                                                stat.st_size):
+        # the source could be touched without changes
+        if header['digest'].tobytes() != _file_digest(file_name):
+            return None
+        _refresh_cache_header(cache_file, stat)
+
+    dtype = np.dtype('<i%d' % itemsize)
+    frames = []
+    for record in table:
+        count_jobs, count_machines, _, upper_bound, _, offset = record
+        # view of the mapped file, without copying
+        processing_times = np.frombuffer(
+            buffer, dtype=dtype, count=count_jobs * count_machines,
+            offset=offset).reshape(count_jobs, count_machines)
+        frames.append(JobSchedulingFrame(processing_times,
+                                         upper_bound=upper_bound))
+    return frames
+
+
+def read_flow_shop_instances(file_name, cache=False, cache_file=None):
     """
     Read from file with Tailard's instances to JobSchedulingFrames
 
     Parameters
     ----------
     file_name: str
+    cache: bool, default False
+        if True, instances are loaded from the binary cache file, that is
+        created on the first read and recreated when modification time
+        and content hash of `file_name` change. Processing times of frames
+        are read-only arrays mapped from the cache file, without copying.
+    cache_file: str, default None
+        path of the cache file; `file_name + CACHE_SUFFIX` by default
 
     Returns
     -------
@@ -45,64 +318,163 @@ def read_flow_shop_instances(file_name):
         66 58 31 68 78 91 13 59 49 85 85  9 39 41 56 40 54 77 51 31
         58 56 20 85 53 35 53 41 69 13 86 72  8 49 47 87 58 18 68 28
     """
+    if not cache:
+        return list(iter_flow_shop_instances(file_name))
 
-    file = open(file_name)
-    frames = []
-    counter_lines = 0
-    for string in iter(file):
-        counter_lines += 1
+    if cache_file is None:
+        cache_file = file_name + CACHE_SUFFIX
+
+    frames = _load_instances_cache(file_name, cache_file)
+    if frames is None:
         try:
-            if string.strip().startswith('number'):
-                string = next(file)
-                counter_lines += 1
-                params = re.findall(r'\d+', string)[:4]
-                if len(params) != 4:
-                    raise FlowShopFormatError(file_name, counter_lines)
-                count_jobs, count_machines, \
-                    _, upper_bound = (int(param) for param in params)
+            _write_instances_cache(file_name, cache_file)
+        except OSError:
+            # e.g. read-only directory
+            return list(iter_flow_shop_instances(file_name))
+        frames = _load_instances_cache(file_name, cache_file)
+    return frames
 
-                string = next(file)
-                counter_lines += 1
-                if string.strip().startswith('processing'):
-                    processing_time = []
-                    for _ in range(count_machines):
-                        string = next(file)
-                        counter_lines += 1
-                        times = re.findall(r'\d+', string)
-                        if len(times) != count_jobs:
-                            raise FlowShopFormatError(file_name, counter_lines)
-                        processing_time.append((int(time) for time in times))
-
-                    processing_time = list(zip(*processing_time))  # transpose
-
-                    assert count_jobs == len(processing_time)
-                    assert count_machines == len(processing_time[0])
-
-                    frames.append(
-                        JobSchedulingFrame(
-                            processing_time,
-                            upper_bound=upper_bound
-                        )
-                    )
-                else:
-                    raise FlowShopFormatError(file_name, counter_lines)
-        except StopIteration:
-            raise FlowShopFormatError(file_name, counter_lines)
 
-    if len(frames) == 0:
-        raise FlowShopFormatError(file_name, None)
+def _axis_step(end_time, max_count_ticks=10):
+    # the least integer step 1, 2, 5, 10, 20, ... with at most
+    # `max_count_ticks` ticks
+    step = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            if end_time <= step * multiplier * max_count_ticks:
+                return step * multiplier
+        step *= 10
 
-    file.close()
-    return frames
 
+def _merge_bars(begin_times, end_times, scale):
+    # merges neighbouring bars, that are narrower than a pixel and are
+    # separated by less than a pixel; returns indexes of the first and
+    # the last bar of each group
+    narrow = (end_times - begin_times) * scale < 1
+    touching = (begin_times[1:] - end_times[:-1]) * scale < 1
+    continues = narrow[1:] & narrow[:-1] & touching
+
+    firsts = np.flatnonzero(np.concatenate([[True], ~continues]))
+    lasts = np.concatenate([firsts[1:] - 1, [len(begin_times) - 1]])
+    return firsts, lasts
 
-# TODO test this!
-def create_gantt_chart(schedule, filename='gantt_chart.html'):
+
+def write_gantt_chart(schedule, file, width=1200, row_height=24,
+                      html=False):
     """
-    :param schedule: Schedule object
-    :param filename: str object
-    :return:
+    Write Gantt chart of `schedule` to `file` as SVG image.
+
+    The chart is written machine by machine directly from the begin and
+    end times of `schedule`. Neighbouring operations, that are narrower than
+    a pixel, are drawn as one gray bar.
+
+    Parameters
+    ----------
+    schedule: Schedule
+    file: file object
+        opened in text mode
+    width: int, default 1200
+        width of the image in pixels
+    row_height: int, default 24
+        height of the row of a machine in pixels
+    html: bool, default False
+        if True, the image is embedded in HTML page
     """
+    jobs_sequence = schedule.jobs_sequence.tolist()
+    begin_times = schedule.begin_times
+    end_times = schedule.end_times
+    count_machines = begin_times.shape[1]
+
+    left_margin, top_margin, bottom_margin = 100, 10, 30
+    plot_width = width - left_margin - 10
+    height = top_margin + count_machines * row_height + bottom_margin
+    end_time = max(schedule.end_time(), 1)
+    scale = plot_width / end_time
+
+    if html:
+        file.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8">'
+                   '<title>Gantt chart</title></head>\n<body>\n')
+    file.write('<svg xmlns="http://www.w3.org/2000/svg" width="%d" '
+               'height="%d" font-family="sans-serif" font-size="12">\n'
+               % (width, height))
+
+    for idx_machine in range(count_machines):
+        y = top_margin + idx_machine * row_height
+        file.write('<text x="%d" y="%.1f" text-anchor="end" '
+                   'dominant-baseline="middle">Machine #%d</text>\n'
+                   % (left_margin - 8, y + row_height / 2, idx_machine + 1))
+
+        machine_begin_times = begin_times[:, idx_machine]
+        machine_end_times = end_times[:, idx_machine]
+        firsts, lasts = _merge_bars(machine_begin_times, machine_end_times,
+                                    scale)
+
+        bars = []
+        for first, last in zip(firsts.tolist(), lasts.tolist()):
+            begin = int(machine_begin_times[first])
+            end = int(machine_end_times[last])
+            if first == last:
+                idx_job = jobs_sequence[first]
+                color = 'hsl(%d,65%%,55%%)' % (idx_job * 137 % 360)
+                title = 'Job #%d: %d - %d' % (idx_job + 1, begin, end)
+            else:
+                color = '#888'
+                title = '%d operations: %d - %d' % (
+                    last - first + 1, begin, end)
+            bars.append('<rect x="%.2f" y="%d" width="%.2f" height="%d" '
+                        'fill="%s"><title>%s</title></rect>\n'
+                        % (left_margin + begin * scale, y + 2,
+                           max((end - begin) * scale, 1.), row_height - 4,
+                           color, title))
+        file.write(''.join(bars))
+
+    # integer time axis
+    axis_y = top_margin + count_machines * row_height
+    file.write('<line x1="%d" y1="%d" x2="%d" y2="%d" stroke="black"/>\n'
+               % (left_margin, axis_y, left_margin + plot_width, axis_y))
+    step = _axis_step(end_time)
+    for tick in range(0, end_time + 1, step):
+        x = left_margin + tick * scale
+        file.write('<line x1="%.2f" y1="%d" x2="%.2f" y2="%d" '
+                   'stroke="black"/><text x="%.2f" y="%d" '
+                   'text-anchor="middle">%d</text>\n'
+                   % (x, axis_y, x, axis_y + 5, x, axis_y + 18, tick))
+
+    file.write('</svg>\n')
+    if html:
+        file.write('</body>\n</html>\n')
+
+
+def create_gantt_chart(schedule, filename='gantt_chart.html',
+                       use_plotly=False, width=1200):
+    """
+    Create file with Gantt chart of `schedule`.
+
+    Parameters
+    ----------
+    schedule: Schedule
+    filename: str, default 'gantt_chart.html'
+        SVG image is written if the extension is '.svg', otherwise
+        HTML page
+    use_plotly: bool, default False
+        if True, interactive chart is created by plotly with wall-clock
+        time axis and opened in browser
+    width: int, default 1200
+        width of the image in pixels; isn't used by plotly
+    """
+    if use_plotly:
+        _create_plotly_gantt_chart(schedule, filename)
+        return
+
+    with open(filename, 'w', buffering=READ_BUFFER_SIZE) as file:
+        write_gantt_chart(schedule, file, width=width,
+                          html=not filename.endswith('.svg'))
+
+
+def _create_plotly_gantt_chart(schedule, filename):
+    import plotly
+    import plotly.figure_factory as ff
+
     def sec_to_date_time(secs):  # secs count from 1970-01-01 03:00:00
         return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(secs))
 
@@ -0,0 +1,90 @@
+import numpy as np
+
+from amyachev_degree.core import JobSchedulingFrame
+
+
+def _cumulative_times(frame: JobSchedulingFrame) -> tuple:
+    proc_times = frame.array.astype(np.int64)
+    return proc_times, np.cumsum(proc_times, axis=1)
+
+
+def _machine_based(proc_times, cumulative_times):
+    heads = cumulative_times - proc_times
+    tails = cumulative_times[:, -1:] - cumulative_times
+    return int((heads.min(axis=0) + proc_times.sum(axis=0) +
+                tails.min(axis=0)).max())
+
+
+def _job_based(proc_times, cumulative_times):
+    min_times = np.minimum(proc_times[:, 0], proc_times[:, -1])
+    return int((cumulative_times[:, -1] + min_times.sum() -
+                min_times).max())
+
+
+def machine_based_lower_bound(frame: JobSchedulingFrame) -> int:
+    """
+    Compute lower bound of makespan as maximum by machines of
+    minimal head + total processing time + minimal tail.
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+
+    Returns
+    -------
+    lower bound: int
+
+    Notes
+    -----
+    Head of a job on machine is the total processing time of the job on the
+    previous machines, tail - on the next machines.
+    """
+    return _machine_based(*_cumulative_times(frame))
+
+
+def job_based_lower_bound(frame: JobSchedulingFrame) -> int:
+    """
+    Compute lower bound of makespan as maximum by jobs of
+    total processing time of the job + sum by the other jobs of the minimum
+    of their processing times on the first and the last machines.
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+
+    Returns
+    -------
+    lower bound: int
+
+    Notes
+    -----
+    Each other job either precedes the job on the first machine or follows
+    it on the last machine.
+    """
+    return _job_based(*_cumulative_times(frame))
+
+
+def lower_bound(frame: JobSchedulingFrame) -> int:
+    """
+    Compute lower bound of makespan as maximum of machine-based and
+    job-based lower bounds in one pass over processing times.
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+
+    Returns
+    -------
+    lower bound: int
+
+    Notes
+    -----
+    Not less than the lower bounds shipped with Taillard's instances.
+
+    Journal Paper:
+        Taillard, E., 1993. Benchmarks for basic scheduling problems.
+        European Journal of Operational Research 64(2), 278-285
+    """
+    proc_times, cumulative_times = _cumulative_times(frame)
+    return max(_machine_based(proc_times, cumulative_times),
+               _job_based(proc_times, cumulative_times))
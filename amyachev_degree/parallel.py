@@ -0,0 +1,67 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+
+def _solve(heuristic: object, heuristic_args: dict, frame) -> list:
+    return heuristic(frame, **heuristic_args)
+
+
+def _is_picklable(value) -> bool:
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def solve_many(frames: list, heuristic: object, heuristic_args: dict = None,
+               workers: int = 1, chunksize: int = None) -> list:
+    """
+    Compute solutions for each frame from `frames` by `heuristic`
+    using a pool of `workers` processes.
+
+    Parameters
+    ----------
+    frames: list
+        list of `JobSchedulingFrame` objects
+    heuristic: object
+        function callback; if it or `heuristic_args` can't be pickled
+        (e.g. a local function), all frames are solved in the current
+        process
+    heuristic_args: dict, default None
+        named arguments for `heuristic`
+    workers: int or None, default 1
+        count of worker processes; if None then `os.cpu_count()` is used.
+        With 1 worker all frames are solved in the current process.
+    chunksize: int, default None
+        count of frames sent to a worker at once; by default frames
+        are split into about 4 chunks per worker
+
+    Returns
+    -------
+    solutions: list
+        solutions[i] - solution for `frames[i]`
+    """
+    if heuristic_args is None:
+        heuristic_args = {}
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if isinstance(workers, bool) or not isinstance(workers, int) or \
+            workers < 1:
+        raise ValueError('workers must be an integer > 0 or None')
+
+    solve = partial(_solve, heuristic, heuristic_args)
+    frames = list(frames)
+
+    if workers == 1 or len(frames) < 2 or not _is_picklable(solve):
+        return [solve(frame) for frame in frames]
+
+    workers = min(workers, len(frames))
+    if chunksize is None:
+        chunksize = max(1, len(frames) // (4 * workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # `map` returns results in the order of `frames`
+        return list(executor.map(solve, frames, chunksize=chunksize))
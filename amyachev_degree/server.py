@@ -0,0 +1,483 @@
+"""
+Local scheduling service: solves instances of Flow Job problem sent over
+a socket by a pool of worker processes.
+
+Starts as follows (from root folder):
+    `python -m amyachev_degree.server --port 8765 --workers 4`
+
+    `python -m amyachev_degree.server --unix /tmp/flow_shop.sock`
+
+Protocol: each request is one JSON object on a line; the fields are
+    id - any value, that is returned in the messages about the request;
+    method - one of `solver.METHODS`, 'neh' by default;
+    time_limit - in seconds, not greater than the limit of the server;
+    args - named arguments for the method, see `solver.METHOD_ARGUMENTS`;
+    progress - if true, each improvement of the solution is reported;
+    instance - one of:
+        processing_times - matrix N x M, `upper_bound` is optional;
+        taillard - text in the format of `io.read_flow_shop_instances`,
+            `index` of the instance in the text is 0 by default;
+        instance_id - id of the instance sent by one of previous requests.
+
+Messages of the server are JSON objects on a line:
+    {"type": "progress", "id": ..., "end_time": ..., "elapsed_time": ...}
+    {"type": "result", "id": ..., "instance_id": ..., "solution": [...],
+     "end_time": ..., "evaluations": ..., "elapsed_time": ...,
+     "timed_out": ...}
+    {"type": "error", "id": ..., "message": ...}
+
+Several requests can be sent by one connection without waiting for the
+answers. The same requests are accepted by HTTP: `POST /solve` with the
+request as body answers by the messages (application/x-ndjson),
+`GET /health` - by the statistics of the server.
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from amyachev_degree.cache import ResultCache, set_result_cache
+from amyachev_degree.core import JobSchedulingFrame
+from amyachev_degree.io import FlowShopFormatError, parse_flow_shop_instances
+from amyachev_degree.solver import check_method_args, solve
+
+
+# time after the time limit of a request, when the server answers with
+# error; the worker isn't given the next request until it completes
+TIME_LIMIT_GRACE = 5.
+MAX_REQUEST_SIZE = 1 << 26
+
+
+class RequestError(Exception):
+    pass
+
+
+def _init_worker(result_cache):
+    if result_cache is not None:
+        set_result_cache(ResultCache(result_cache))
+
+
+def _solve_in_worker(frame, method, time_limit, method_args, progress_queue,
+                     token):
+    def report(solution, end_time, elapsed_time):
+        progress_queue.put((token, end_time, elapsed_time))
+
+    return solve(frame, method, time_limit=time_limit,
+                 on_improvement=None if progress_queue is None else report,
+                 **method_args)
+
+
+class SchedulingServer:
+
+    def __init__(self, workers: int = None, max_pending: int = 64,
+                 max_time_limit: float = 60., cache_size: int = 32,
+                 result_cache: str = None):
+        """
+        Creates server; it's started by `start`.
+
+        Parameters
+        ----------
+        workers: int or None, default None
+            count of worker processes; if None then `os.cpu_count()` is used
+        max_pending: int, default 64
+            count of requests, that can wait for a worker; the next ones are
+            rejected with error 'queue is full'
+        max_time_limit: float, default 60.
+            time limit of a request, that is used if the request has greater
+            one or hasn't it
+        cache_size: int, default 32
+            count of the last used instances kept in memory
+        result_cache: str, default None
+            if specified, directory of `cache.ResultCache` shared by
+            workers, so repeated requests aren't solved again
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if isinstance(workers, bool) or not isinstance(workers, int) or \
+                workers < 1:
+            raise ValueError('workers must be an integer > 0 or None')
+        if max_pending < 1:
+            raise ValueError('max_pending must be an integer > 0')
+
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_time_limit = max_time_limit
+        self.cache_size = cache_size
+        self.result_cache = result_cache
+        self.stats = {'requests': 0, 'completed': 0, 'rejected': 0,
+                      'errors': 0, 'cache_hits': 0, 'cache_misses': 0}
+
+        self._frames = OrderedDict()  # instance id -> frame, LRU order
+        self._tokens = itertools.count()
+        self._progress_callbacks = {}
+        self._servers = []
+        self._queue = None
+        self._executor = None
+        self._manager = None
+        self._progress_queue = None
+        self._tasks = []
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0,
+                    path: str = None):
+        """
+        Start worker processes and listen at `host`:`port` or at unix
+        socket `path`. Port 0 means any free port, see `addresses`.
+        """
+        # forked workers would inherit sockets of open connections and
+        # keep them open, so they are started by a clean process
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        else:
+            context = multiprocessing.get_context('spawn')
+
+        self._queue = asyncio.Queue(self.max_pending)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context,
+            initializer=_init_worker, initargs=(self.result_cache,))
+        self._manager = context.Manager()
+        self._progress_queue = self._manager.Queue()
+
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._dispatch())
+                       for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._forward_progress()))
+
+        if path is not None:
+            server = await asyncio.start_unix_server(
+                self._handle_connection, path, limit=MAX_REQUEST_SIZE)
+        else:
+            server = await asyncio.start_server(
+                self._handle_connection, host, port, limit=MAX_REQUEST_SIZE)
+        self._servers.append(server)
+
+    @property
+    def addresses(self) -> list:
+        return [sock.getsockname() for server in self._servers
+                for sock in server.sockets]
+
+    async def serve_forever(self):
+        await asyncio.gather(*(server.serve_forever()
+                               for server in self._servers))
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+        self._progress_queue.put(None)  # stops `_forward_progress`
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._manager.shutdown()
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            request, future = await self._queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                frame, method, time_limit, method_args, token, progress = \
+                    request
+                solving = loop.run_in_executor(
+                    self._executor, _solve_in_worker, frame, method,
+                    time_limit, method_args,
+                    self._progress_queue if progress else None, token)
+                done, _ = await asyncio.wait(
+                    {solving}, timeout=time_limit + TIME_LIMIT_GRACE)
+                if not done:
+                    # the worker can't be interrupted, so the error is sent
+                    # at once, but the slot stays occupied until the worker
+                    # completes the request
+                    if not future.cancelled():
+                        future.set_exception(
+                            RequestError('time limit is exceeded'))
+                    await asyncio.wait({solving})
+                    if not solving.cancelled():
+                        solving.exception()  # the result isn't needed
+                    continue
+                if future.cancelled():
+                    continue
+                if solving.cancelled():
+                    future.set_exception(RequestError('request is cancelled'))
+                elif solving.exception() is not None:
+                    future.set_exception(
+                        RequestError(str(solving.exception())))
+                else:
+                    future.set_result(solving.result())
+            finally:
+                self._queue.task_done()
+
+    async def _forward_progress(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # the manager's queue is blocking, so it's read in a thread
+            message = await loop.run_in_executor(None,
+                                                 self._progress_queue.get)
+            if message is None:
+                return
+            token, end_time, elapsed_time = message
+            callback = self._progress_callbacks.get(token)
+            if callback is not None:
+                callback(end_time, elapsed_time)
+
+    def _get_frame(self, request):
+        if 'instance_id' in request:
+            instance_id = request['instance_id']
+            frame = self._frames.get(instance_id)
+            if frame is None:
+                self.stats['cache_misses'] += 1
+                raise RequestError('unknown instance_id %r' % instance_id)
+            self.stats['cache_hits'] += 1
+            self._frames.move_to_end(instance_id)
+            return instance_id, frame
+
+        if 'processing_times' in request:
+            payload = json.dumps([request['processing_times'],
+                                  request.get('upper_bound')],
+                                 separators=(',', ':'))
+        elif 'taillard' in request:
+            payload = json.dumps([request['taillard'],
+                                  request.get('index', 0)])
+        else:
+            raise RequestError('request must contain one of '
+                               "'processing_times', 'taillard', "
+                               "'instance_id'")
+
+        instance_id = hashlib.sha1(payload.encode()).hexdigest()
+        frame = self._frames.get(instance_id)
+        if frame is not None:
+            self.stats['cache_hits'] += 1
+            self._frames.move_to_end(instance_id)
+            return instance_id, frame
+
+        self.stats['cache_misses'] += 1
+        try:
+            if 'processing_times' in request:
+                upper_bound = request.get('upper_bound')
+                frame = JobSchedulingFrame(
+                    request['processing_times'],
+                    as_array=True,
+                    **({} if upper_bound is None
+                       else {'upper_bound': upper_bound}))
+            else:
+                frame = parse_flow_shop_instances(
+                    request['taillard'])[request.get('index', 0)]
+        except (FlowShopFormatError, ValueError, TypeError,
+                IndexError) as error:
+            raise RequestError('wrong instance: %s' % error)
+
+        if self.cache_size > 0:
+            self._frames[instance_id] = frame
+            while len(self._frames) > self.cache_size:
+                self._frames.popitem(last=False)
+        return instance_id, frame
+
+    async def solve_request(self, request: dict, send: object):
+        """
+        Solve `request` and pass messages about it to `send`.
+
+        Parameters
+        ----------
+        request: dict
+            fields are described in the module docstring
+        send: object
+            function callback, that is called with each message (dict)
+        """
+        self.stats['requests'] += 1
+        request_id = request.get('id') if isinstance(request, dict) else None
+        token = next(self._tokens)
+        try:
+            if not isinstance(request, dict):
+                raise RequestError('request must be a JSON object')
+
+            method = request.get('method', 'neh')
+            method_args = request.get('args', {})
+            if not isinstance(method_args, dict):
+                raise RequestError("'args' must be a JSON object")
+            try:
+                check_method_args(method, method_args)
+            except ValueError as error:
+                raise RequestError(str(error))
+
+            time_limit = request.get('time_limit', self.max_time_limit)
+            if isinstance(time_limit, bool) or \
+                    not isinstance(time_limit, (int, float)) or \
+                    not math.isfinite(time_limit) or time_limit < 0:
+                raise RequestError("'time_limit' must be a number >= 0")
+            time_limit = min(time_limit, self.max_time_limit)
+
+            instance_id, frame = self._get_frame(request)
+
+            if request.get('progress'):
+                self._progress_callbacks[token] = \
+                    lambda end_time, elapsed_time: send({
+                        'type': 'progress', 'id': request_id,
+                        'end_time': end_time, 'elapsed_time': elapsed_time})
+
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self._queue.put_nowait(((frame, method, time_limit,
+                                         method_args, token,
+                                         bool(request.get('progress'))),
+                                        future))
+            except asyncio.QueueFull:
+                self.stats['rejected'] += 1
+                raise RequestError('queue is full')
+
+            result = await future
+        except RequestError as error:
+            self.stats['errors'] += 1
+            send({'type': 'error', 'id': request_id, 'message': str(error)})
+            return
+        finally:
+            self._progress_callbacks.pop(token, None)
+
+        self.stats['completed'] += 1
+        send({'type': 'result', 'id': request_id,
+              'instance_id': instance_id, 'solution': result.solution,
+              'end_time': result.end_time,
+              'evaluations': result.evaluations,
+              'elapsed_time': result.elapsed_time,
+              'timed_out': result.timed_out})
+
+    def health(self) -> dict:
+        health = dict(self.stats)
+        health.update(pending=self._queue.qsize(), workers=self.workers,
+                      cached_instances=len(self._frames))
+        return health
+
+    async def _handle_connection(self, reader, writer):
+        def send(message):
+            if not writer.is_closing():
+                writer.write(json.dumps(message).encode() + b'\n')
+
+        try:
+            line = await reader.readline()
+            if line.startswith((b'GET ', b'POST ')):
+                await self._handle_http(line, reader, writer, send)
+                return
+
+            requests = set()
+            while line:
+                if line.strip():
+                    try:
+                        request = json.loads(line)
+                    except ValueError as error:
+                        send({'type': 'error', 'id': None,
+                              'message': 'wrong JSON: %s' % error})
+                    else:
+                        task = asyncio.ensure_future(
+                            self.solve_request(request, send))
+                        requests.add(task)
+                        task.add_done_callback(requests.discard)
+                await writer.drain()
+                line = await reader.readline()
+            await asyncio.gather(*requests)
+            await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http(self, request_line, reader, writer, send):
+        method, path = request_line.decode('latin-1').split()[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        def start_response(status, content_type):
+            writer.write(('HTTP/1.1 %s\r\nContent-Type: %s\r\n'
+                          'Connection: close\r\n\r\n'
+                          % (status, content_type)).encode())
+
+        if method == 'GET' and path == '/health':
+            start_response('200 OK', 'application/json')
+            writer.write(json.dumps(self.health()).encode())
+        elif method == 'POST' and path == '/solve':
+            try:
+                length = int(headers.get('content-length', 0))
+                if not 0 <= length <= MAX_REQUEST_SIZE:
+                    raise ValueError('Content-Length must be in [0, %d]'
+                                     % MAX_REQUEST_SIZE)
+                request = json.loads(await reader.readexactly(length))
+            except asyncio.IncompleteReadError as error:
+                start_response('400 Bad Request', 'application/json')
+                send({'type': 'error', 'id': None,
+                      'message': 'body is shorter than Content-Length: '
+                                 '%d of %d bytes' % (len(error.partial),
+                                                     error.expected)})
+            except ValueError as error:
+                start_response('400 Bad Request', 'application/json')
+                send({'type': 'error', 'id': None,
+                      'message': 'wrong request: %s' % error})
+            else:
+                start_response('200 OK', 'application/x-ndjson')
+                await self.solve_request(request, send)
+        else:
+            start_response('404 Not Found', 'application/json')
+            send({'type': 'error', 'id': None,
+                  'message': 'unknown path %s %s' % (method, path)})
+        await writer.drain()
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Local service solving instances of Flow Job problem')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None,
+                        help='path of unix socket used instead of TCP')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='count of worker processes, '
+                             'count of CPUs by default')
+    parser.add_argument('--max-pending', type=int, default=64,
+                        help='count of requests waiting for a worker')
+    parser.add_argument('--max-time-limit', type=float, default=60.,
+                        help='time limit of a request in seconds')
+    parser.add_argument('--cache-size', type=int, default=32,
+                        help='count of instances kept in memory')
+    parser.add_argument('--result-cache', default=None,
+                        help='directory of the disk cache of solutions')
+    return parser.parse_args(argv)
+
+
+async def _serve(args):
+    server = SchedulingServer(workers=args.workers,
+                              max_pending=args.max_pending,
+                              max_time_limit=args.max_time_limit,
+                              cache_size=args.cache_size,
+                              result_cache=args.result_cache)
+    await server.start(args.host, args.port, path=args.unix)
+    print('listening at %s' % ', '.join(map(str, server.addresses)))
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: list = None) -> int:
+    args = _parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
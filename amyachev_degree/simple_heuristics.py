@@ -1,11 +1,21 @@
+import numpy as np
+
+from amyachev_degree.cache import cached
 from amyachev_degree.core import (
-    JobSchedulingFrame, compute_end_time, create_schedule)
-from amyachev_degree.exact_algorithm import johnson_algorithm
+    EvaluationCounter, JobSchedulingFrame, PartialScheduleEvaluator,
+    compute_end_times)
+from amyachev_degree.exact_algorithm import batch_johnson_algorithm
 from amyachev_degree.composite_heuristics import (
     local_search_partitial_sequence)
 from copy import copy
 
 
+def _slope_weights(count_machines: int) -> np.ndarray:
+    # weight of machine `idx_machine` is
+    # -(count_machines - (2 * (idx_machine + 1) - 1))
+    return np.arange(1 - count_machines, count_machines, 2, dtype=np.int64)
+
+
 def slope_index_func(frame: JobSchedulingFrame, idx_job: int) -> int:
     """
     Compute slope index for `idx_job` using the method invented by Palmer, D.S.
@@ -27,13 +37,8 @@ def slope_index_func(frame: JobSchedulingFrame, idx_job: int) -> int:
         Operations Research Quarterly 16(1), 101-107
 
     """
-    count_machines = frame.count_machines
-    slope_index = 0
-    for idx_machine in range(count_machines):
-        slope_index -= (count_machines - (2 * (idx_machine + 1) - 1)) * \
-                        frame.get_processing_time(idx_job, idx_machine)
-
-    return slope_index
+    weights = _slope_weights(frame.count_machines)
+    return int(frame.get_job_processing_times(idx_job) @ weights)
 
 
 def palmer_heuristics(frame: JobSchedulingFrame) -> list:
@@ -58,15 +63,27 @@ def palmer_heuristics(frame: JobSchedulingFrame) -> list:
         Operations Research Quarterly 16(1), 101-107
 
     """
-    count_jobs = frame.count_jobs
+    slope_indexes = frame.array @ _slope_weights(frame.count_machines)
 
-    slope_indexes = []
-    for idx_job in range(count_jobs):
-        slope_indexes.append(slope_index_func(frame, idx_job))
+    # stable sort by decreasing slope index
+    return np.argsort(-slope_indexes, kind='stable').tolist()
 
-    solution = [idx_job for idx_job in range(count_jobs)]
-    solution.sort(key=lambda _idx_job: slope_indexes[_idx_job], reverse=True)
-    return solution
+
+def _cds_machine_times(frame: JobSchedulingFrame, sub_problems):
+    # sums of processing times on the first machines and
+    # on the last machines for each job, both arrays: sub_problems x jobs
+    sub_problems = np.asarray(sub_problems)
+    count_machines = frame.count_machines
+    # cum_times[:, k] - sum of processing times on the first `k` machines,
+    # so `sub_problem == count_machines` takes all of them
+    cum_times = np.zeros((frame.count_jobs, count_machines + 1),
+                         dtype=np.int64)
+    np.cumsum(frame.array, axis=1, dtype=np.int64, out=cum_times[:, 1:])
+
+    first_machine_times = cum_times[:, sub_problems].T
+    second_machine_times = (cum_times[:, count_machines, np.newaxis] -
+                            cum_times[:, count_machines - sub_problems]).T
+    return first_machine_times, second_machine_times
 
 
 def cds_create_proc_times(frame: JobSchedulingFrame, sub_problem: int) -> list:
@@ -89,31 +106,20 @@ def cds_create_proc_times(frame: JobSchedulingFrame, sub_problem: int) -> list:
     Developed by Campbell, Dudek, and Smith in 1970.
 
     """
-    processing_times = []
-    count_machines = frame.count_machines
+    # From `sub_problem` first machines and from `sub_problem` last machines
+    # will make two artificial, summing up the processing times
+    # on each of them.
+    first_machine_times, second_machine_times = _cds_machine_times(
+        frame, [sub_problem])
 
-    for idx_job in range(frame.count_jobs):
-        first_machine_time = 0
-        second_machine_time = 0
+    return [[first_time, second_time] for first_time, second_time in
+            zip(first_machine_times[0].tolist(),
+                second_machine_times[0].tolist())]
 
-        # From `sub_problem` count machines will make one artificial,
-        # summing up the processing times on each of them.
-        for idx_machine in range(sub_problem):
-            first_machine_time += frame.get_processing_time(idx_job,
-                                                            idx_machine)
 
-        # From `sub_problem` machines will make one artificial,
-        # summing up the processing times on each of them.
-        for idx_machine in range(count_machines - sub_problem, count_machines):
-            second_machine_time += frame.get_processing_time(idx_job,
-                                                             idx_machine)
-
-        processing_times.append([first_machine_time, second_machine_time])
-
-    return processing_times
-
-
-def cds_heuristics(frame: JobSchedulingFrame) -> list:
+@cached
+def cds_heuristics(frame: JobSchedulingFrame,
+                   counter: EvaluationCounter = None) -> list:
     """
     Compute approximate solution for instance of Flow Job problem by
     Campbell, Dudek, and Smith (CDS) heuristic.
@@ -121,6 +127,8 @@ def cds_heuristics(frame: JobSchedulingFrame) -> list:
     Parameters
     ----------
     frame: JobSchedulingFrame
+    counter: EvaluationCounter, default None
+        if specified, counts makespan evaluations
 
     Returns
     -------
@@ -132,28 +140,25 @@ def cds_heuristics(frame: JobSchedulingFrame) -> list:
     Developed by Campbell, Dudek, and Smith in 1970.
 
     """
-    johnson_frame = JobSchedulingFrame([[]])
-    johnson_solutions_with_end_time = []
-
     # Create `count_machines - 1` sub-problems
-    # which will be solved by Johnson's algorithm
-    for sub_problem in range(1, frame.count_machines):
-        # Create processing times matrix for all jobs on only 2 machines
-        proc_times = cds_create_proc_times(frame, sub_problem)
-        johnson_frame.set_processing_times(proc_times)
-        johnson_solution = johnson_algorithm(johnson_frame)
-
-        # end time compute for the original task, that is `frame`
-        end_time = compute_end_time(frame, johnson_solution)
-        johnson_solutions_with_end_time.append((johnson_solution, end_time))
+    # which will be solved by Johnson's algorithm at once;
+    # processing times are taken from cumulative sums over machines
+    sub_problems = np.arange(1, frame.count_machines)
+    johnson_solutions = batch_johnson_algorithm(
+        *_cds_machine_times(frame, sub_problems))
 
-    johnson_solutions_with_end_time.sort(key=lambda elem: elem[1])
+    # end times compute for the original task, that is `frame`
+    end_times = compute_end_times(frame, johnson_solutions)
+    if counter is not None:
+        counter.full_evaluations += len(johnson_solutions)
 
     # return only solution with minimum makespan (end_time)
-    return johnson_solutions_with_end_time[0][0]
+    return johnson_solutions[int(end_times.argmin())].tolist()
 
 
-def neh_heuristics(frame: JobSchedulingFrame) -> list:
+@cached
+def neh_heuristics(frame: JobSchedulingFrame,
+                   counter: EvaluationCounter = None) -> list:
     """
     Compute approximate solution for instance of Flow Job problem by
     NEH heuristic.
@@ -161,6 +166,8 @@ def neh_heuristics(frame: JobSchedulingFrame) -> list:
     Parameters
     ----------
     frame: JobSchedulingFrame
+    counter: EvaluationCounter, default None
+        if specified, counts makespan evaluations
 
     Returns
     -------
@@ -174,136 +181,152 @@ def neh_heuristics(frame: JobSchedulingFrame) -> list:
         the m Machine, n Job Flowshop Sequencing Problem.
         Omega-International Journal of Management Science 11(1), 91-95
 
+    """
+    solution, _ = local_search_partitial_sequence(frame, neh_order(frame),
+                                                  counter=counter)
+    return solution
+
+
+def neh_order(frame: JobSchedulingFrame) -> list:
+    """
+    Returns jobs in the order they are inserted by NEH heuristic, i.e.
+    by decreasing total processing time.
     """
     count_jobs = frame.count_jobs
 
-    all_processing_times = [0] * count_jobs
-    for j in range(count_jobs):
-        all_processing_times[j] = frame.get_sum_processing_time(j)
+    all_processing_times = frame.get_sum_processing_times()
 
     init_jobs = [j for j in range(count_jobs)]
     init_jobs.sort(key=lambda x: all_processing_times[x], reverse=True)
-
-    solution, _ = local_search_partitial_sequence(frame, init_jobs)
-    return solution
+    return init_jobs
 
 
 # supported functions for liu_reeves_heuristric heuristics ####################
-def _weighted_idle_time(frame: JobSchedulingFrame,
-                        scheduled_jobs: list, next_job: int) -> float:
-    # TODO make sure that `jobs` does not change
-    # during the operation of the function
-    scheduled_jobs.append(next_job)
-    sch = create_schedule(frame, scheduled_jobs)
-    idle_time = 0.
-
-    if len(scheduled_jobs) != 1:
-        idx_second_last_job = scheduled_jobs[-2]
-        idx_last_job = scheduled_jobs[-1]
-        for idx_machine in range(1, frame.count_machines):
-            cmpl_time1 = sch.end_time(idx_last_job, idx_machine - 1)
-            cmpl_time2 = sch.end_time(idx_second_last_job, idx_machine)
-            numerator = frame.count_machines * max(cmpl_time1 - cmpl_time2, 0)
-            denominator = idx_machine + (len(scheduled_jobs) - 1) * \
-                (frame.count_machines - idx_machine) / (frame.count_jobs - 2)
-            idle_time += numerator / denominator
-    else:
-        idx_last_job = scheduled_jobs[-1]
-        for idx_machine in range(1, frame.count_machines):
-            cmpl_time1 = sch.end_time(idx_last_job, idx_machine - 1)
-            numerator = frame.count_machines * cmpl_time1
-            denominator = idx_machine + (len(scheduled_jobs) - 1) * \
-                (frame.count_machines - idx_machine) / (frame.count_jobs - 2)
-            idle_time += numerator / denominator
-
-    scheduled_jobs.pop()  # remove this; see TODO
-    return idle_time
+def _weighted_idle_times(frame: JobSchedulingFrame,
+                         evaluator: PartialScheduleEvaluator,
+                         next_jobs: list) -> np.ndarray:
+    count_machines = frame.count_machines
+    count_scheduled_jobs = len(evaluator) + 1
+    release_times = evaluator.release_times
+
+    # completion times of each job from `next_jobs`
+    # appended to the scheduled jobs
+    proc_times = frame.array[next_jobs]
+    last_jobs_times = np.empty(proc_times.shape, dtype=np.int64)
+    end_times = np.zeros(len(next_jobs), dtype=np.int64)
+    for idx_machine in range(count_machines):
+        np.maximum(end_times, release_times[idx_machine], out=end_times)
+        end_times += proc_times[:, idx_machine]
+        last_jobs_times[:, idx_machine] = end_times
+
+    idle_times = np.zeros(len(next_jobs))
+    for idx_machine in range(1, count_machines):
+        cmpl_times1 = last_jobs_times[:, idx_machine - 1]
+        if count_scheduled_jobs != 1:
+            cmpl_time2 = release_times[idx_machine]
+            numerators = count_machines * np.maximum(cmpl_times1 - cmpl_time2,
+                                                     0)
+        else:
+            numerators = count_machines * cmpl_times1
+        # `count_jobs` <= 2 leaves at most one candidate after the first step
+        denominator = idx_machine + (count_scheduled_jobs - 1) * \
+            (count_machines - idx_machine) / max(frame.count_jobs - 2, 1)
+        idle_times += numerators / denominator
+
+    return idle_times
 
 
 def _artificial_time(frame: JobSchedulingFrame,
-                     jobs: list, unscheduled_jobs: list) -> int:
-    #  copy processing time matrix jobs x machines from frame
-    processing_times = frame.copy_proc_time
-
-    #  creating processing times for artificial job as average of
-    #  the processing times of jobs from `unscheduled_jobs`
-    artificial_prc_times = []
-    for idx_machine in range(frame.count_machines):
-        average_time = 0.
-        for idx_job in range(len(unscheduled_jobs)):
-            average_time += processing_times[idx_job][idx_machine]
-
-        average_time /= len(unscheduled_jobs)
-        artificial_prc_times.append(round(average_time))
-
-    processing_times.append(artificial_prc_times)
-
-    assert frame.count_jobs + 1 == len(processing_times)
-    assert frame.count_machines == len(processing_times[0])
-
-    frame_with_artificial_job = JobSchedulingFrame(processing_times)
-    jobs.append(frame.count_jobs - 1)  # added index of artificial job
-
-    if len(jobs) != 1:
-        end_time_sec_last_job = compute_end_time(frame_with_artificial_job,
-                                                 jobs, len(jobs) - 1,
-                                                 frame.count_machines - 1)
-    else:
-        end_time_sec_last_job = 0
-
-    end_time_last_job = compute_end_time(frame_with_artificial_job,
-                                         jobs, len(jobs),
-                                         frame.count_machines - 1)
-    result_time = end_time_sec_last_job + end_time_last_job
-    jobs.pop()
-    return result_time
-
-
-def _index_function(frame: JobSchedulingFrame, jobs: list,
-                    unscheduled_jobs: list, next_job: int) -> float:
-    return (frame.count_jobs - len(jobs) - 2) * \
-        _weighted_idle_time(frame, jobs, next_job) + \
-        _artificial_time(frame, jobs, unscheduled_jobs)
+                     evaluator: PartialScheduleEvaluator) -> int:
+    # The job with index `count_jobs - 1` is appended to the scheduled jobs
+    # as the artificial job; it doesn't depend on the candidate job, so
+    # the term is computed once per step from the cached release times
+    # of machines, without copying the processing times matrix.
+    idx_machine = frame.count_machines - 2
+
+    end_time_sec_last_job = evaluator.release_times[idx_machine]
+    end_time_last_job = evaluator.peek(frame.count_jobs - 1)[idx_machine]
+    return end_time_sec_last_job + end_time_last_job
+
+
+def _index_function(frame: JobSchedulingFrame,
+                    evaluator: PartialScheduleEvaluator,
+                    unscheduled_jobs: list) -> np.ndarray:
+    """
+    Compute index function of Liu and Reeves for all jobs from
+    `unscheduled_jobs` as candidates for the next position at once.
+    """
+    return (frame.count_jobs - len(evaluator) - 2) * \
+        _weighted_idle_times(frame, evaluator, unscheduled_jobs) + \
+        _artificial_time(frame, evaluator)
 ###############################################################################
 
 
-def liu_reeves_heuristics(frame: JobSchedulingFrame, count_sequences: int):
+@cached
+def liu_reeves_heuristics(frame: JobSchedulingFrame, count_sequences: int,
+                          counter: EvaluationCounter = None):
+    solutions = list(liu_reeves_sequences(frame, count_sequences))
+    return best_solution(frame, solutions, counter)
+
+
+def best_solution(frame: JobSchedulingFrame, solutions: list,
+                  counter: EvaluationCounter = None) -> list:
+    """
+    Returns the first solution with minimum makespan.
+    """
+    end_times = compute_end_times(frame, solutions)
+    if counter is not None:
+        counter.full_evaluations += len(solutions)
+    return solutions[int(end_times.argmin())]
+
+
+def liu_reeves_sequences(frame: JobSchedulingFrame, count_sequences: int):
+    """
+    Yields sequences built by Liu and Reeves heuristic one by one, starting
+    from the jobs with the least `count_sequences` indexes.
+    """
     init_sequence = [idx_job for idx_job in range(frame.count_jobs)]
     unscheduled_jobs = copy(init_sequence)
-    init_sequence.sort(key=lambda next_job: _index_function(frame, [],
-                                                            unscheduled_jobs,
-                                                            next_job))
-
-    solutions = []
+    indexes = _index_function(frame, PartialScheduleEvaluator(frame),
+                              unscheduled_jobs)
+    init_sequence = np.argsort(indexes, kind='stable').tolist()
 
     for idx in range(count_sequences):
         solution = [init_sequence[idx]]
+        evaluator = PartialScheduleEvaluator(frame, solution)
 
         unscheduled_jobs.remove(init_sequence[idx])
         for _ in range(frame.count_jobs - 1):
-            min_job = min(unscheduled_jobs,
-                          key=lambda next_job: _index_function(
-                                                    frame, solution,
-                                                    unscheduled_jobs,
-                                                    next_job))
+            # the first job with minimum index
+            indexes = _index_function(frame, evaluator, unscheduled_jobs)
+            min_job = unscheduled_jobs[int(indexes.argmin())]
             solution.append(min_job)
+            evaluator.push(min_job)
             unscheduled_jobs.remove(min_job)
-        solutions.append(solution)
+        yield solution
         unscheduled_jobs = copy(init_sequence)
 
-    solutions.sort(key=lambda solution: compute_end_time(frame, solution))
-    return solutions[0]
-
 
 def fgh_index(time: int, alpha: float, tetta: float) -> float:
     denomenator = 1 + alpha**2 * (((1 - alpha) / alpha) * time - tetta)**2
     return 1/denomenator
 
 
-def fgh_heuristic(frame: JobSchedulingFrame, count_alpha: int = 1) -> list:
+@cached
+def fgh_heuristic(frame: JobSchedulingFrame, count_alpha: int = 1,
+                  counter: EvaluationCounter = None) -> list:
+    solutions = list(fgh_sequences(frame, count_alpha, counter))
+    return best_solution(frame, solutions, counter)
+
+
+def fgh_sequences(frame: JobSchedulingFrame, count_alpha: int = 1,
+                  counter: EvaluationCounter = None):
+    """
+    Yields sequences built by FGH heuristic for each of `count_alpha`
+    values of alpha, from the greatest one.
+    """
     init_jobs = [idx_job for idx_job in range(frame.count_jobs)]
-    sum_times = [frame.get_sum_processing_time(idx_job)
-                 for idx_job in init_jobs]
+    sum_times = frame.get_sum_processing_times()
     tetta = sum(sum_times) / frame.count_jobs
 
     time_min = min(sum_times)
@@ -321,7 +344,6 @@ def fgh_heuristic(frame: JobSchedulingFrame, count_alpha: int = 1) -> list:
         solutions.append(copy(init_jobs))
 
     for i in range(count_alpha):
-        solutions[i], _ = local_search_partitial_sequence(frame, solutions[i])
-
-    solutions.sort(key=lambda solution: compute_end_time(frame, solution))
-    return solutions[0]
+        solution, _ = local_search_partitial_sequence(frame, solutions[i],
+                                                      counter=counter)
+        yield solution
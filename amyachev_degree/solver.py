@@ -0,0 +1,206 @@
+import inspect
+import time
+from collections import namedtuple
+
+from amyachev_degree.core import (
+    EvaluationCounter, JobSchedulingFrame, compute_end_time)
+from amyachev_degree.composite_heuristics import (
+    iterated_greedy, local_search, local_search_partitial_sequence)
+from amyachev_degree.genetic import genetic_algorithm
+from amyachev_degree.simple_heuristics import (
+    best_solution, cds_heuristics, fgh_heuristic, fgh_sequences,
+    liu_reeves_heuristics, liu_reeves_sequences, neh_heuristics, neh_order,
+    palmer_heuristics)
+
+
+SolveResult = namedtuple('SolveResult', [
+    'solution', 'end_time', 'evaluations', 'elapsed_time', 'timed_out'])
+
+
+def _neh_seed(frame, counter, time_limit):
+    # initial solution of anytime methods; the insertion phase is cut by
+    # the time limit
+    solution, _ = local_search_partitial_sequence(
+        frame, neh_order(frame), counter=counter, time_limit=time_limit)
+    return solution
+
+
+def _best_until(frame, counter, sequences, time_limit):
+    # the best of sequences built before the time limit, at least one
+    deadline = time.perf_counter() + time_limit
+    solutions = []
+    for solution in sequences:
+        solutions.append(solution)
+        if time.perf_counter() >= deadline:
+            break
+    return best_solution(frame, solutions, counter)
+
+
+def _fgh(frame, counter, time_limit, **kwargs):
+    kwargs.setdefault('count_alpha',
+                      frame.count_jobs // frame.count_machines + 11)
+    if time_limit is None:
+        return fgh_heuristic(frame, counter=counter, **kwargs)
+    return _best_until(frame, counter,
+                       fgh_sequences(frame, counter=counter, **kwargs),
+                       time_limit)
+
+
+def _liu_reeves(frame, counter, time_limit, **kwargs):
+    kwargs.setdefault('count_sequences', min(5, frame.count_jobs))
+    if time_limit is None:
+        return liu_reeves_heuristics(frame, counter=counter, **kwargs)
+    return _best_until(frame, counter,
+                       liu_reeves_sequences(frame, **kwargs), time_limit)
+
+
+# method name -> function(frame, counter, time_limit, **method_args) ->
+# solution; if `time_limit` isn't None, methods building several sequences
+# return the best one built within it
+CONSTRUCTIVE_METHODS = {
+    'palmer': lambda frame, counter, time_limit: palmer_heuristics(frame),
+    'cds': lambda frame, counter, time_limit: cds_heuristics(
+        frame, counter=counter),
+    'neh': lambda frame, counter, time_limit: neh_heuristics(
+        frame, counter=counter),
+    'liu_reeves': _liu_reeves,
+    'fgh': _fgh,
+}
+# methods, that improve the solution until the time limit
+ANYTIME_METHODS = {'iterated_greedy', 'genetic'}
+METHODS = set(CONSTRUCTIVE_METHODS) | ANYTIME_METHODS
+
+# arguments of anytime methods passed by `solve` itself
+_SOLVE_ARGUMENTS = {'frame', 'init_jobs', 'time_limit', 'counter',
+                    'on_improvement'}
+# method name -> names of arguments, that can be in `method_args`
+METHOD_ARGUMENTS = {
+    'palmer': set(),
+    'cds': set(),
+    'neh': set(),
+    'liu_reeves': {'count_sequences'},
+    'fgh': {'count_alpha'},
+    'iterated_greedy': set(inspect.signature(iterated_greedy).parameters) -
+    _SOLVE_ARGUMENTS,
+    'genetic': set(inspect.signature(genetic_algorithm).parameters) -
+    _SOLVE_ARGUMENTS,
+}
+
+
+def check_method_args(method: str, method_args: dict):
+    """
+    Check, that `method` is one of `METHODS` and takes all of
+    `method_args`.
+
+    Raises
+    ------
+    ValueError
+        if `method` is unknown or doesn't take some of `method_args`
+    """
+    if method not in METHODS:
+        raise ValueError('method must be one of %s' % sorted(METHODS))
+    unexpected = set(method_args) - METHOD_ARGUMENTS[method]
+    if unexpected:
+        raise ValueError('method %r takes %s, got unexpected %s'
+                         % (method, sorted(METHOD_ARGUMENTS[method]),
+                            sorted(unexpected)))
+
+
+class _Incumbent:
+
+    def __init__(self, on_improvement, begin):
+        self.solution = None
+        self.end_time = None
+        self._on_improvement = on_improvement
+        self._begin = begin
+
+    def offer(self, solution, end_time):
+        if self.end_time is not None and self.end_time <= end_time:
+            return
+        self.solution = list(solution)
+        self.end_time = end_time
+        if self._on_improvement is not None:
+            self._on_improvement(list(solution), end_time,
+                                 time.perf_counter() - self._begin)
+
+
+def solve(frame: JobSchedulingFrame, method: str = 'neh',
+          time_limit: float = None, on_improvement: object = None,
+          improve: bool = True, **method_args) -> SolveResult:
+    """
+    Compute solution for instance of Flow Job problem by `method`
+    within `time_limit` and return the best found one.
+
+    Constructive methods ('palmer', 'cds', 'neh', 'liu_reeves', 'fgh')
+    build a solution, that is improved by `local_search` while time
+    remains. Anytime methods ('iterated_greedy', 'genetic') improve the
+    solution of 'neh' until the time limit.
+
+    Parameters
+    ----------
+    frame: JobSchedulingFrame
+    method: str, default 'neh'
+        one of `METHODS`
+    time_limit: float, default None
+        wall-clock budget in seconds; it's checked between the sequences
+        built by 'liu_reeves' and 'fgh' (at least one is always built),
+        between insertions of the initial solution of anytime methods and
+        inside the loops of improving algorithms. When it's exhausted,
+        the best solution found so far is returned. Required for anytime
+        methods.
+    on_improvement: object, default None
+        function callback, that is called with each new best found
+        solution, its makespan and elapsed time in seconds
+    improve: bool, default True
+        if False, the solution of constructive method isn't improved
+    method_args: dict
+        named arguments for the function of `method`, their names are
+        listed in `METHOD_ARGUMENTS`
+
+    Returns
+    -------
+    result: SolveResult
+        solution - the best found sequence of job index;
+        end_time - makespan of `solution`;
+        evaluations - count of full and saved makespan evaluations;
+        elapsed_time - in seconds;
+        timed_out - True if the search was stopped by the time limit
+    """
+    check_method_args(method, method_args)
+    if method in ANYTIME_METHODS and time_limit is None:
+        raise ValueError('time_limit is required for method %r' % method)
+
+    begin = time.perf_counter()
+    counter = EvaluationCounter()
+    incumbent = _Incumbent(on_improvement, begin)
+
+    def remaining_time():
+        if time_limit is None:
+            return None
+        return max(0., time_limit - (time.perf_counter() - begin))
+
+    if method in CONSTRUCTIVE_METHODS:
+        solution = CONSTRUCTIVE_METHODS[method](frame, counter, time_limit,
+                                                **method_args)
+        incumbent.offer(solution, compute_end_time(frame, solution))
+
+        if improve and remaining_time() != 0.:
+            solution, _ = local_search(frame, solution, counter=counter,
+                                       time_limit=remaining_time())
+            incumbent.offer(solution, compute_end_time(frame, solution))
+    else:
+        init_jobs = _neh_seed(frame, counter, remaining_time())
+        incumbent.offer(init_jobs, compute_end_time(frame, init_jobs))
+
+        algorithm = iterated_greedy if method == 'iterated_greedy' \
+            else genetic_algorithm
+        solution = algorithm(frame, init_jobs, time_limit=remaining_time(),
+                             counter=counter, on_improvement=incumbent.offer,
+                             **method_args)
+        incumbent.offer(solution, compute_end_time(frame, solution))
+
+    elapsed_time = time.perf_counter() - begin
+    return SolveResult(
+        solution=incumbent.solution, end_time=incumbent.end_time,
+        evaluations=counter.evaluations, elapsed_time=elapsed_time,
+        timed_out=time_limit is not None and elapsed_time >= time_limit)
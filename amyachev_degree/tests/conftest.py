@@ -0,0 +1,6 @@
+import os
+
+
+# tests don't use the cache of solutions turned on in the environment;
+# `test_cache` sets its own one
+os.environ['AMYACHEV_DEGREE_CACHE'] = '0'
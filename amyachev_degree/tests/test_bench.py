@@ -0,0 +1,59 @@
+import json
+import pytest
+
+from amyachev_degree.bench import (
+    compare_with_baseline, instance_classes, main, run_benchmark)
+from amyachev_degree.core import JobSchedulingFrame
+
+
+def test_instance_classes():
+    classes = instance_classes()
+
+    assert 12 == len(classes)
+    assert '20jobs_5machines' == classes[0]
+    assert '500jobs_20machines' == classes[-1]
+
+
+@pytest.mark.parametrize('heuristic', ['palmer', 'cds', 'neh', 'fgh',
+                                       'liu_reeves'])
+@pytest.mark.parametrize('with_local_search', [False, True])
+def test_run_benchmark(heuristic, with_local_search):
+    frame = JobSchedulingFrame([[17, 19, 13], [15, 11, 12], [14, 21, 16],
+                                [20, 16, 20], [16, 17, 17]], upper_bound=114)
+
+    result = run_benchmark(heuristic, [frame], with_local_search)
+
+    assert result['wall_time'] > 0
+    assert isinstance(result['arpd'], float)
+    if heuristic != 'palmer' or with_local_search:
+        assert result['evaluations'] > 0
+
+
+def test_compare_with_baseline():
+    baseline = [{'heuristic': 'neh', 'local_search': False,
+                 'instances': '20jobs_5machines', 'frames': 10,
+                 'wall_time': 1.}]
+    fast = [dict(baseline[0], wall_time=1.1)]
+    slow = [dict(baseline[0], wall_time=1.5)]
+    other = [dict(baseline[0], frames=5, wall_time=1.5)]
+
+    assert [] == compare_with_baseline(fast, baseline, tolerance=0.2)
+    assert [(slow[0], baseline[0])] == compare_with_baseline(slow, baseline,
+                                                             tolerance=0.2)
+    assert [] == compare_with_baseline(other, baseline, tolerance=0.2)
+
+
+def test_main(tmpdir):
+    output = str(tmpdir.join('bench.json'))
+    args = ['--heuristics', 'palmer', 'neh', '--instances',
+            '20jobs_5machines', '--max-frames', '2', '--output', output]
+
+    assert 0 == main(args)
+
+    with open(output) as file:
+        results = json.load(file)['results']
+    assert ['palmer', 'neh'] == [result['heuristic'] for result in results]
+    assert all(2 == result['frames'] for result in results)
+
+    assert 0 == main(args[:-2] + ['--baseline', output, '--tolerance', '1e9'])
+    assert 1 == main(args[:-2] + ['--baseline', output, '--tolerance', '-1'])
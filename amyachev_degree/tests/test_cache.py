@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+import amyachev_degree.cache
+from amyachev_degree.cache import (
+    CACHE_DIR_ENV, CACHE_ENV, DEFAULT_CACHE_DIR, ResultCache, cached,
+    get_result_cache, set_result_cache)
+from amyachev_degree.core import EvaluationCounter, JobSchedulingFrame
+from amyachev_degree.io import read_flow_shop_instances
+from amyachev_degree.simple_heuristics import (
+    liu_reeves_heuristics, neh_heuristics)
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TAILLARD_INS_DIR = TEST_DIR + '/../Taillard_instances'
+FLOW_SHOP_INSTANCE_DIR = TAILLARD_INS_DIR + '/flow_shop_sequences'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    previous = set_result_cache(cache)
+    yield cache
+    set_result_cache(previous)
+
+
+class TestResultCache:
+
+    def setup_method(self):
+        self.frames = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                               '/20jobs_5machines.txt')[:2]
+
+    def test_hits(self, cache):
+        calls = []
+
+        @cached
+        def heuristic(frame, count, counter=None):
+            calls.append(count)
+            return list(range(count))
+
+        assert heuristic(self.frames[0], 3) == [0, 1, 2]
+        assert heuristic(self.frames[0], count=3,
+                         counter=EvaluationCounter()) == [0, 1, 2]
+        assert heuristic(self.frames[0], 2) == [0, 1]
+        assert heuristic(self.frames[1], 2) == [0, 1]
+        assert calls == [3, 2, 2]
+        assert cache.stats == {'hits': 1, 'misses': 3, 'evictions': 0}
+
+    def test_same_solutions(self, cache):
+        for frame in self.frames:
+            solution = neh_heuristics(frame)
+            assert neh_heuristics(frame) == solution
+
+            counters = [EvaluationCounter(), EvaluationCounter()]
+            solution = liu_reeves_heuristics(frame, 3, counters[0])
+            assert liu_reeves_heuristics(frame, 3, counters[1]) == solution
+            # evaluations are counted as if the solution was computed
+            assert counters[1].evaluations == counters[0].evaluations > 0
+
+        assert cache.hits == 4
+        assert cache.misses == 4
+
+    def test_key(self):
+        frame = JobSchedulingFrame([[1, 2], [3, 4]])
+        key = ResultCache.key(frame, 'neh', {'count': 1})
+
+        assert key == ResultCache.key(
+            JobSchedulingFrame([[1, 2], [3, 4]], as_array=True), 'neh',
+            {'count': 1})
+        assert key != ResultCache.key(frame, 'cds', {'count': 1})
+        assert key != ResultCache.key(frame, 'neh', {'count': 2})
+        assert key != ResultCache.key(JobSchedulingFrame([[1, 2], [4, 3]]),
+                                      'neh', {'count': 1})
+        assert key != ResultCache.key(JobSchedulingFrame([[1, 2, 3, 4]]),
+                                      'neh', {'count': 1})
+
+    def test_eviction(self, tmp_path):
+        cache = ResultCache(str(tmp_path), max_size=100)
+        for idx in range(10):
+            cache.put('key%d' % idx, list(range(10)))  # 30 bytes
+            cache.get('key0')
+
+        assert cache.get('key0') == (True, list(range(10)))
+        assert cache.get('key9') == (True, list(range(10)))
+        assert cache.get('key1') == (False, None)
+        assert cache.evictions == 7
+        assert len(os.listdir(str(tmp_path))) == 3
+
+        cache.clear()
+        assert os.listdir(str(tmp_path)) == []
+
+    def test_opt_out(self, cache):
+        set_result_cache(None)
+        assert get_result_cache() is None
+
+        neh_heuristics(self.frames[0])
+        assert cache.stats == {'hits': 0, 'misses': 0, 'evictions': 0}
+        assert not os.path.exists(cache.directory)
+
+    @pytest.mark.parametrize('environ, directory', [
+        ({}, None),
+        ({CACHE_ENV: '0'}, None),
+        ({CACHE_ENV: '0', CACHE_DIR_ENV: 'cache'}, None),
+        ({CACHE_ENV: '1'}, os.path.expanduser(DEFAULT_CACHE_DIR)),
+        ({CACHE_DIR_ENV: 'cache'}, 'cache'),
+    ])
+    def test_environment(self, monkeypatch, environ, directory):
+        monkeypatch.delenv(CACHE_ENV, raising=False)
+        monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+        for name, value in environ.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.setattr(amyachev_degree.cache, '_result_cache_created',
+                            False)
+        monkeypatch.setattr(amyachev_degree.cache, '_result_cache', None)
+
+        cache = get_result_cache()
+        assert directory == (cache and cache.directory)
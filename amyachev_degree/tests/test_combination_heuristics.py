@@ -2,12 +2,14 @@ import os
 import pytest
 
 from amyachev_degree.io import read_flow_shop_instances
-from amyachev_degree.core import compute_end_time, JobSchedulingFrame
+from amyachev_degree.core import (
+    compute_end_time, EvaluationCounter, JobSchedulingFrame)
 from amyachev_degree.simple_heuristics import (
     cds_heuristics, liu_reeves_heuristics, neh_heuristics, palmer_heuristics)
 
 from amyachev_degree.composite_heuristics import (
-    local_search, local_search_partitial_sequence)
+    insertion_local_search, iterated_greedy, local_search,
+    local_search_partitial_sequence)
 
 from amyachev_degree.util.testing import percentage_deviation_using_upper_bound
 
@@ -435,6 +437,180 @@ class TestHeuristicsWithCombinationLocalSearches:
         assert round(average_percent_ratio, 2) == expected_percent_ratio
 
 
+@pytest.mark.parametrize('file_name', ['/20jobs_5machines.txt',
+                                       '/50jobs_10machines.txt'])
+def test_accelerated_local_search_partitial_sequence(file_name):
+    frames = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR + file_name)
+
+    for frame in frames:
+        init_jobs = palmer_heuristics(frame)
+
+        assert local_search_partitial_sequence(frame, init_jobs) == \
+            local_search_partitial_sequence(frame, init_jobs,
+                                            accelerated=False)
+
+
+@pytest.mark.parametrize('file_name', ['/20jobs_5machines.txt',
+                                       '/50jobs_10machines.txt'])
+def test_accelerated_local_search(file_name):
+    frames = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR + file_name)
+
+    for frame in frames:
+        init_jobs = palmer_heuristics(frame)
+
+        assert local_search(frame, init_jobs) == \
+            local_search(frame, init_jobs, accelerated=False)
+
+
+def test_local_search_counter():
+    frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                     '/20jobs_5machines.txt')[0]
+    init_jobs = palmer_heuristics(frame)
+
+    counter = EvaluationCounter()
+    local_search(frame, init_jobs, counter=counter)
+    naive_counter = EvaluationCounter()
+    local_search(frame, init_jobs, accelerated=False, counter=naive_counter)
+
+    count_passes = counter.full_evaluations
+    assert 2 * 19 * count_passes == counter.saved_evaluations
+    assert naive_counter.full_evaluations == counter.saved_evaluations
+    assert 0 == naive_counter.saved_evaluations
+
+
+class TestIteratedGreedy:
+
+    def setup_method(self):
+        self.frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                              '/20jobs_5machines.txt')[0]
+
+    def test_not_worse_than_neh(self):
+        neh_solution = neh_heuristics(self.frame)
+        solution = iterated_greedy(self.frame, time_limit=10.,
+                                   max_iterations=20, seed=0)
+
+        assert sorted(solution) == list(range(self.frame.count_jobs))
+        assert compute_end_time(self.frame, solution) <= \
+            compute_end_time(self.frame, neh_solution)
+        assert compute_end_time(self.frame, solution) >= \
+            self.frame.upper_bound
+
+    def test_seed(self):
+        solutions = [iterated_greedy(self.frame, time_limit=10.,
+                                     max_iterations=10, seed=42)
+                     for _ in range(2)]
+        assert solutions[0] == solutions[1]
+
+    def test_init_jobs(self):
+        init_jobs = palmer_heuristics(self.frame)
+        init_copy = list(init_jobs)
+        solution = iterated_greedy(self.frame, init_jobs, time_limit=10.,
+                                   max_iterations=5, seed=0)
+
+        assert init_jobs == init_copy
+        assert compute_end_time(self.frame, solution) <= \
+            compute_end_time(self.frame, init_jobs)
+
+    def test_time_limit(self):
+        counter = EvaluationCounter()
+        solution = iterated_greedy(self.frame, time_limit=0., counter=counter)
+
+        assert solution == neh_heuristics(self.frame)
+        assert counter.full_evaluations > 0
+
+    def test_wrong_d(self):
+        with pytest.raises(ValueError, match='d must be'):
+            iterated_greedy(self.frame, d=0)
+
+
+def naive_rz_pass(frame, solution, reference):
+    # move each job of `reference` to the first best position,
+    # if it decreases the makespan
+    end_time = compute_end_time(frame, solution)
+    for idx_job in reference:
+        partial = list(solution)
+        partial.remove(idx_job)
+        candidates = [partial[:place] + [idx_job] + partial[place:]
+                      for place in range(len(solution))]
+        end_times = [compute_end_time(frame, candidate)
+                     for candidate in candidates]
+        best_place = end_times.index(min(end_times))
+        if end_times[best_place] < end_time:
+            solution, end_time = candidates[best_place], end_times[best_place]
+    return solution
+
+
+class TestInsertionLocalSearch:
+
+    def setup_method(self):
+        self.frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                              '/20jobs_5machines.txt')[1]
+        self.init_jobs = palmer_heuristics(self.frame)
+
+    def is_local_optimum(self, solution):
+        end_time = compute_end_time(self.frame, solution)
+        for idx_job in solution:
+            improved, _ = insertion_local_search(
+                self.frame, solution, reference=[idx_job] + [
+                    job for job in solution if job != idx_job],
+                max_passes=1)
+            if compute_end_time(self.frame, improved) < end_time:
+                return False
+        return True
+
+    def test_rz_same_as_naive(self):
+        solution, changed = insertion_local_search(self.frame,
+                                                   self.init_jobs,
+                                                   max_passes=1)
+
+        assert solution == naive_rz_pass(self.frame, self.init_jobs,
+                                         self.init_jobs)
+        assert changed
+
+    @pytest.mark.parametrize('improvement', ['first', 'best'])
+    @pytest.mark.parametrize('order', ['referenced', 'random'])
+    def test_local_optimum(self, improvement, order):
+        init_copy = list(self.init_jobs)
+        counter = EvaluationCounter()
+        solution, changed = insertion_local_search(
+            self.frame, self.init_jobs, improvement=improvement,
+            order=order, seed=0, counter=counter)
+
+        assert self.init_jobs == init_copy
+        assert sorted(solution) == list(range(self.frame.count_jobs))
+        assert changed == (compute_end_time(self.frame, solution) <
+                           compute_end_time(self.frame, self.init_jobs))
+        assert changed
+        assert self.is_local_optimum(solution)
+        assert counter.saved_evaluations > 0
+
+    def test_not_worse_than_swaps(self):
+        solution, _ = insertion_local_search(self.frame, self.init_jobs)
+        swaps_solution, _ = local_search(self.frame, self.init_jobs)
+
+        assert compute_end_time(self.frame, solution) <= \
+            compute_end_time(self.frame, swaps_solution)
+
+    def test_time_limit(self):
+        solution, changed = insertion_local_search(
+            self.frame, self.init_jobs, time_limit=0.)
+
+        assert solution == self.init_jobs
+        assert not changed
+
+    def test_short_sequence(self):
+        assert insertion_local_search(self.frame, [3]) == ([3], False)
+
+    @pytest.mark.parametrize('kwargs, message', [
+        ({'improvement': 'worst'}, 'improvement must be one of'),
+        ({'order': 'sorted'}, 'order must be one of'),
+        ({'reference': [0, 1]}, 'reference must contain'),
+    ])
+    def test_wrong_args(self, kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            insertion_local_search(self.frame, self.init_jobs, **kwargs)
+
+
 # for research interests
 def test_difference():
     frames = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR
@@ -1,7 +1,13 @@
+import numpy as np
 import pytest
 
-from amyachev_degree.core import (compute_end_time, create_schedule,
-                                  Jobs, Machines,
+from amyachev_degree.core import (compute_end_time, compute_end_times,
+                                  create_schedule,
+                                  compute_heads, compute_tails,
+                                  compute_insertion_end_times,
+                                  EvaluationCounter, Jobs, Machines,
+                                  PartialScheduleEvaluator,
+                                  PrefixTreeEvaluator,
                                   JobSchedulingFrame, NaN, Duration,
                                   Schedule, flow_job_generator,
                                   johnson_three_machines_generator)
@@ -33,6 +39,17 @@ class TestMachines:
         assert 3 == Machines(3).count_machines
 
 
+class TestEvaluationCounter:
+
+    def test_evaluations(self):
+        counter = EvaluationCounter()
+        counter.full_evaluations += 2
+        counter.saved_evaluations += 3
+
+        assert 5 == counter.evaluations
+        assert "full evaluations: 2, saved evaluations: 3" == str(counter)
+
+
 class TestJobSchedulingFrame:
 
     def setup_method(self):
@@ -100,6 +117,97 @@ class TestJobSchedulingFrame:
 
         tm.assert_js_frame(frame, expected_frame)
 
+    @pytest.mark.parametrize('idx_job', [0, 1, 2, 3, 4])
+    @pytest.mark.parametrize('idx_machine', [0, 1, 2])
+    def test_get_processing_time_as_array(self, idx_job, idx_machine):
+        frame = JobSchedulingFrame(self.processing_times, as_array=True)
+
+        proc_time = frame.get_processing_time(idx_job, idx_machine)
+
+        assert isinstance(proc_time, int)
+        assert self.processing_times[idx_job][idx_machine] == proc_time
+
+    @pytest.mark.parametrize('max_value, dtype', [(99, np.int16),
+                                                  (2**15 - 1, np.int16),
+                                                  (2**15, np.int32),
+                                                  (2**31, np.int64)])
+    def test_array_dtype(self, max_value, dtype):
+        frame = JobSchedulingFrame([[1, max_value], [3, 4]], as_array=True)
+
+        assert frame.is_array
+        assert dtype == frame.array.dtype
+        assert max_value == frame.get_processing_time(0, 1)
+
+    def test_array_without_copy(self):
+        proc_times = np.array(self.processing_times, dtype=np.int32)
+        frame = JobSchedulingFrame(proc_times)
+
+        assert frame.is_array
+        assert proc_times is frame.processing_times
+        assert np.shares_memory(proc_times, frame.machine_major)
+        assert np.shares_memory(proc_times, frame.get_job_processing_times(1))
+        assert np.shares_memory(proc_times,
+                                frame.get_machine_processing_times(1))
+
+    @pytest.mark.parametrize('proc_times, dtype', [
+        (np.array([[1, 2], [3, 4]], dtype=np.uint8), np.int16),
+        (np.array([[1, 2], [3, 4]], dtype='>i4'), np.int16),
+        (np.asfortranarray([[1, 2], [3, 2**20]], dtype=np.int64), np.int32),
+        (np.array([[1, 2, 3], [3, 4, 5]], dtype=np.int32)[:, ::2], np.int16),
+        (np.array([[1., 2.], [3., 4.]]), np.int16)])
+    def test_array_normalized(self, proc_times, dtype):
+        frame = JobSchedulingFrame(proc_times)
+
+        assert dtype == frame.array.dtype
+        assert frame.array.flags.c_contiguous
+        assert proc_times.tolist() == frame.array.tolist()
+
+    @pytest.mark.parametrize('proc_times', [
+        np.array([[1., 2.5], [3., 4.]]),
+        np.array([[1., np.nan], [3., 4.]]),
+        np.array([[1, 2**63], [3, 4]], dtype=np.uint64)])
+    def test_array_not_integer(self, proc_times):
+        with pytest.raises(ValueError, match='processing_times must'):
+            JobSchedulingFrame(proc_times)
+        with pytest.raises(ValueError, match='processing_times must'):
+            JobSchedulingFrame(proc_times.tolist(), as_array=True)
+
+    @pytest.mark.parametrize('value', [2**63, 2**64, -2**63 - 1])
+    def test_list_out_of_int64(self, value):
+        with pytest.raises(ValueError, match='processing_times must fit'):
+            JobSchedulingFrame([[1, value], [3, 4]], as_array=True)
+
+    def test_array_from_list(self):
+        frame = JobSchedulingFrame(self.processing_times)
+
+        assert not frame.is_array
+        assert self.processing_times == frame.array.tolist()
+        assert [19, 11, 21, 16, 17] == \
+            frame.get_machine_processing_times(1).tolist()
+        assert [15, 11, 12] == frame.get_job_processing_times(1).tolist()
+        assert frame.machine_major.tolist() == \
+            [list(times) for times in zip(*self.processing_times)]
+
+        frame.set_processing_times([[1, 2]])
+        assert [[1, 2]] == frame.array.tolist()
+
+    def test_get_sum_processing_times(self):
+        frame = JobSchedulingFrame(self.processing_times)
+        array_frame = JobSchedulingFrame(self.processing_times, as_array=True)
+
+        expected = [sum(times) for times in self.processing_times]
+
+        assert expected == frame.get_sum_processing_times()
+        assert expected == array_frame.get_sum_processing_times()
+        assert expected == [array_frame.get_sum_processing_time(idx_job)
+                            for idx_job in range(len(expected))]
+
+    def test_str_as_array(self):
+        frame = JobSchedulingFrame(self.processing_times)
+        array_frame = JobSchedulingFrame(self.processing_times, as_array=True)
+
+        assert str(frame) == str(array_frame)
+
     def test_str(self):
         taillard_str = ("number of jobs, number of machines, "
                         "initial seed, upper bound and lower bound :\n"
@@ -154,6 +262,19 @@ class TestSchedule:
         for idx_job, original_proc_times in self.schedule_dict.items():
             assert original_proc_times == self.schedule.process_times(idx_job)
 
+    def test_unknown_job(self):
+        with pytest.raises(KeyError):
+            self.schedule.end_time(7)
+        with pytest.raises(KeyError):
+            self.schedule.process_times(7)
+
+    def test_empty(self):
+        schedule = Schedule({}, 0)
+
+        assert 0 == schedule.end_time()
+        assert [] == list(schedule.jobs)
+        assert "" == str(schedule)
+
 
 class TestFlowJobGenerator:
 
@@ -284,6 +405,15 @@ class TestScheduleCreate:
         sch = create_schedule(self.frame1, self.frame1_solution1)
         assert sch.end_time() == self.end_time_f1_s1
         assert str(sch) == self.str_f1_s1
+        assert list(sch.jobs) == self.frame1_solution1
+        assert sch.process_times(4) == [Duration(0, 14, 30),
+                                        Duration(1, 35, 52),
+                                        Duration(2, 52, 69)]
+        for idx_job in sch.jobs:
+            assert type(sch.end_time(idx_job)) is int
+            assert type(sch.end_time(idx_job, 0)) is int
+        assert [82, 98, 114] == [sch.end_time(idx_machine=idx_machine)
+                                 for idx_machine in range(3)]
 
         sch2 = create_schedule(self.frame1, self.frame1_solution2)
         assert sch2.end_time() == self.end_time_f1_s2
@@ -309,6 +439,39 @@ class TestScheduleCreate:
                                          count_machine=1)
         assert sch2_end_time == 82
 
+    def test_compute_end_times(self):
+        sequences = [self.frame1_solution1, self.frame1_solution2]
+        end_times = compute_end_times(self.frame1, sequences)
+
+        assert [self.end_time_f1_s1, self.end_time_f1_s2] == end_times.tolist()
+        assert end_times.tolist() == \
+            compute_end_times(self.frame1, np.array(sequences)).tolist()
+
+    @pytest.mark.parametrize('count_job', [None, 1, 3, 5])
+    @pytest.mark.parametrize('count_machine', [None, 1, 2, 3])
+    def test_compute_end_times_with_counts(self, count_job, count_machine):
+        frame = flow_job_generator(count_jobs=10, count_machines=3,
+                                   initial_seed=12345)
+        sequences = [[(shift + idx) % 10 for idx in range(10)]
+                     for shift in range(10)]
+
+        expected = [compute_end_time(frame, sequence, count_job,
+                                     count_machine)
+                    for sequence in sequences]
+        end_times = compute_end_times(frame, sequences, count_job,
+                                      count_machine)
+
+        assert expected == end_times.tolist()
+
+    def test_compute_end_times_empty(self):
+        assert 0 == len(compute_end_times(self.frame1, []))
+
+    def test_compute_end_times_bad_sequences(self):
+        msg = 'jobs_sequences must be sequences of the same length'
+
+        with pytest.raises(ValueError, match=msg):
+            compute_end_times(self.frame1, [[0, 1], [0, 1, 2]])
+
     @pytest.mark.parametrize('count_job, count_machine', [(0.6, 1),
                                                           (2, 1.6),
                                                           (NaN, 1),
@@ -323,3 +486,214 @@ class TestScheduleCreate:
                             self.frame1_solution1,
                             count_job=count_job,
                             count_machine=count_machine)
+
+
+class TestInsertionEndTimes:
+
+    def setup_method(self):
+        self.frame = JobSchedulingFrame([[17, 19, 13], [15, 11, 12],
+                                         [14, 21, 16], [20, 16, 20],
+                                         [16, 17, 17]])
+        self.sequence = [2, 4, 3, 0]
+
+    def test_compute_heads(self):
+        sch = create_schedule(self.frame, self.sequence)
+        heads = compute_heads(self.frame, self.sequence)
+
+        for position, idx_job in enumerate(self.sequence):
+            for idx_machine in range(self.frame.count_machines):
+                assert heads[position][idx_machine] == sch.end_time(
+                    idx_job, idx_machine)
+
+    def test_compute_tails(self):
+        tails = compute_tails(self.frame, self.sequence)
+
+        assert len(self.sequence) + 1 == len(tails)
+        assert [0, 0, 0] == tails[-1].tolist()
+        # tail of the first job on the first machine is the makespan
+        assert compute_end_time(self.frame, self.sequence) == tails[0][0]
+
+    @pytest.mark.parametrize('seed', [1, 12, 123, 1234])
+    def test_compute_insertion_end_times(self, seed):
+        frame = flow_job_generator(count_jobs=8, count_machines=4,
+                                   initial_seed=seed)
+        sequence = [5, 1, 7, 0, 3, 6, 2]
+
+        expected = [compute_end_time(frame, sequence[:place] + [4] +
+                                     sequence[place:])
+                    for place in range(len(sequence) + 1)]
+
+        assert expected == compute_insertion_end_times(frame, sequence,
+                                                       4).tolist()
+
+    def test_compute_insertion_end_times_empty_sequence(self):
+        end_times = compute_insertion_end_times(self.frame, [], 0)
+        assert [49] == end_times.tolist()
+
+
+class TestPartialScheduleEvaluator:
+
+    def setup_method(self):
+        self.frame = JobSchedulingFrame([[17, 19, 13], [15, 11, 12],
+                                         [14, 21, 16], [20, 16, 20],
+                                         [16, 17, 17]])
+        self.sequence = [2, 4, 3, 0, 1]
+        self.schedule = create_schedule(self.frame, self.sequence)
+
+    def test_empty(self):
+        evaluator = PartialScheduleEvaluator(self.frame)
+
+        assert 0 == len(evaluator)
+        assert 0 == evaluator.end_time
+        assert [0, 0, 0] == evaluator.release_times
+
+    def test_returned_times_are_copies(self):
+        evaluator = PartialScheduleEvaluator(self.frame, self.sequence[:2])
+        end_time = evaluator.end_time
+
+        evaluator.release_times[-1] = 0
+        evaluator.completion_times()[-1] = 0
+        evaluator.push(self.sequence[2])
+
+        assert end_time == evaluator.completion_times(1)[-1]
+        assert compute_end_time(self.frame, self.sequence[:3]) == \
+            evaluator.end_time
+
+    def test_push(self):
+        evaluator = PartialScheduleEvaluator(self.frame)
+
+        for position, idx_job in enumerate(self.sequence):
+            evaluator.push(idx_job)
+            assert self.sequence[:position + 1] == evaluator.jobs
+            assert compute_end_time(self.frame, evaluator.jobs) == \
+                evaluator.end_time
+
+        for position, idx_job in enumerate(self.sequence):
+            expected = [self.schedule.end_time(idx_job, idx_machine)
+                        for idx_machine in range(3)]
+            assert expected == evaluator.completion_times(position)
+
+        assert evaluator.completion_times(3) == evaluator.completion_times(-2)
+        assert self.schedule.end_time() == evaluator.end_time
+
+    def test_peek(self):
+        evaluator = PartialScheduleEvaluator(self.frame, self.sequence[:-1])
+
+        release_times = evaluator.peek(self.sequence[-1])
+
+        assert 4 == len(evaluator)
+        assert 114 == release_times[-1]
+        assert [82, 98, 114] == release_times
+
+    def test_pop(self):
+        evaluator = PartialScheduleEvaluator(self.frame, self.sequence)
+
+        assert 1 == evaluator.pop()
+        assert 0 == evaluator.pop()
+        assert 89 == evaluator.end_time
+        assert self.sequence[:3] == evaluator.jobs
+
+    def test_bad_operations(self):
+        evaluator = PartialScheduleEvaluator(self.frame, [1])
+
+        with pytest.raises(IndexError, match='position out of range'):
+            evaluator.completion_times(-2)
+
+        evaluator.pop()
+        with pytest.raises(IndexError, match='pop from empty sequence'):
+            evaluator.pop()
+
+
+class TestPrefixTreeEvaluator:
+
+    def setup_method(self):
+        self.frame = flow_job_generator(count_jobs=8, count_machines=4,
+                                        initial_seed=123)
+        rng = np.random.RandomState(0)
+        self.sequences = [rng.permutation(8).tolist() for _ in range(20)]
+
+    def test_end_times(self):
+        evaluator = PrefixTreeEvaluator(self.frame)
+
+        for jobs_sequence in self.sequences:
+            assert compute_end_time(self.frame, jobs_sequence) == \
+                evaluator.end_time(jobs_sequence)
+            assert compute_end_time(self.frame, jobs_sequence[:3]) == \
+                evaluator.end_time(jobs_sequence[:3])
+
+        assert evaluator.end_time([]) == 0
+        np.testing.assert_array_equal(
+            compute_end_times(self.frame, self.sequences),
+            evaluator.end_times(self.sequences))
+
+        schedule = create_schedule(self.frame, self.sequences[0])
+        expected = [schedule.end_time(self.sequences[0][-1], idx_machine)
+                    for idx_machine in range(4)]
+        assert expected == evaluator.release_times(self.sequences[0]).tolist()
+
+    def test_shared_prefixes(self):
+        evaluator = PrefixTreeEvaluator(self.frame)
+
+        evaluator.end_time([0, 1, 2, 3, 4, 5, 6, 7])
+        assert (8, 0) == (evaluator.computed_jobs, evaluator.reused_jobs)
+        assert 8 == len(evaluator)
+
+        evaluator.end_time([0, 1, 2, 3, 4, 5, 7, 6])
+        assert (10, 6) == (evaluator.computed_jobs, evaluator.reused_jobs)
+        assert 10 == len(evaluator)
+
+        evaluator.end_time([0, 1, 2])
+        assert (10, 9) == (evaluator.computed_jobs, evaluator.reused_jobs)
+
+    def test_eviction(self):
+        evaluator = PrefixTreeEvaluator(self.frame, max_nodes=10)
+
+        for jobs_sequence in self.sequences:
+            assert compute_end_time(self.frame, jobs_sequence) == \
+                evaluator.end_time(jobs_sequence)
+            assert len(evaluator) <= 10
+
+        # the last sequence is the most recently used one
+        computed_jobs = evaluator.computed_jobs
+        evaluator.end_time(self.sequences[-1])
+        assert computed_jobs == evaluator.computed_jobs
+
+        evaluator.clear()
+        assert 0 == len(evaluator)
+
+    def test_sequence_longer_than_max_nodes(self):
+        evaluator = PrefixTreeEvaluator(self.frame, max_nodes=5)
+
+        evaluator.end_time([0, 1, 2, 3, 4])
+        assert 5 == len(evaluator)
+
+        # the deepest jobs are removed, the prefix is kept
+        assert compute_end_time(self.frame, [0, 1, 2, 3, 4, 5]) == \
+            evaluator.end_time([0, 1, 2, 3, 4, 5])
+        assert 5 == len(evaluator)
+        assert (6, 5) == (evaluator.computed_jobs, evaluator.reused_jobs)
+
+        evaluator.end_time([0, 1, 2, 3, 4])
+        assert (6, 10) == (evaluator.computed_jobs, evaluator.reused_jobs)
+
+    def test_different_first_jobs(self):
+        evaluator = PrefixTreeEvaluator(self.frame, max_nodes=10)
+
+        evaluator.end_time([0, 1, 2, 3, 4, 5, 6, 7])
+        evaluator.end_time([7, 6, 5])
+        assert 10 == len(evaluator)
+
+        # only the leaf of the least recently used path is removed
+        evaluator.end_time([0, 1, 2, 3, 4, 5, 6, 5])
+        assert (12, 7) == (evaluator.computed_jobs, evaluator.reused_jobs)
+        assert 10 == len(evaluator)
+
+        assert compute_end_time(self.frame, [7, 6, 5]) == \
+            evaluator.end_time([7, 6, 5])
+        assert (13, 9) == (evaluator.computed_jobs, evaluator.reused_jobs)
+        assert 10 == len(evaluator)
+
+    def test_bad_max_nodes(self):
+        with pytest.raises(ValueError,
+                           match='max_nodes must be an integer >= 0'):
+            PrefixTreeEvaluator(self.frame, max_nodes=-1)
@@ -1,7 +1,19 @@
+import itertools
+import os
+
 import pytest
 
-from amyachev_degree.core import compute_end_time, JobSchedulingFrame
-from amyachev_degree.exact_algorithm import johnson_algorithm
+from amyachev_degree.core import (
+    compute_end_time, flow_job_generator, JobSchedulingFrame)
+from amyachev_degree.exact_algorithm import (
+    batch_johnson_algorithm, branch_and_bound, johnson_algorithm)
+from amyachev_degree.io import read_flow_shop_instances
+from amyachev_degree.lower_bounds import lower_bound
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TAILLARD_INS_DIR = TEST_DIR + '/../Taillard_instances'
+FLOW_SHOP_INSTANCE_DIR = TAILLARD_INS_DIR + '/flow_shop_sequences'
 
 
 class TestJohnsonAlgorithm:
@@ -25,3 +37,106 @@ class TestJohnsonAlgorithm:
 
         with pytest.raises(ValueError, match=msg):
             johnson_algorithm(frame)
+
+    def test_johnson_algorithm_with_ties(self):
+        frame = JobSchedulingFrame([[3, 3], [2, 5], [5, 2], [3, 3], [2, 5],
+                                    [5, 2]])
+
+        assert [1, 4, 3, 0, 5, 2] == johnson_algorithm(frame)
+
+
+class TestBatchJohnsonAlgorithm:
+
+    @pytest.mark.parametrize('seed', [1, 12, 123, 1234])
+    def test_same_as_johnson_algorithm(self, seed):
+        frames = [flow_job_generator(count_jobs=30, count_machines=2,
+                                     initial_seed=seed + shift)
+                  for shift in range(5)]
+
+        solutions = batch_johnson_algorithm(
+            [frame.get_machine_processing_times(0) for frame in frames],
+            [frame.get_machine_processing_times(1) for frame in frames])
+
+        assert [johnson_algorithm(frame) for frame in frames] == \
+            solutions.tolist()
+
+    def test_one_problem(self):
+        solutions = batch_johnson_algorithm([2, 8, 4, 9, 6, 9],
+                                            [3, 3, 6, 5, 8, 7])
+
+        assert [[0, 2, 4, 5, 3, 1]] == solutions.tolist()
+
+
+class TestBranchAndBound:
+
+    @pytest.mark.parametrize('count_jobs, count_machines, seed', [
+        (1, 3, 1), (2, 1, 2), (5, 3, 3), (6, 4, 4), (7, 2, 5), (7, 5, 6)])
+    def test_optimal_solution(self, count_jobs, count_machines, seed):
+        frame = flow_job_generator(count_jobs, count_machines,
+                                   initial_seed=seed)
+        optimal_end_time = min(
+            compute_end_time(frame, list(sequence))
+            for sequence in itertools.permutations(range(count_jobs)))
+
+        result = branch_and_bound(frame)
+
+        assert result.optimal
+        assert result.gap == 0.
+        assert result.end_time == optimal_end_time == result.lower_bound
+        assert compute_end_time(frame, result.solution) == optimal_end_time
+        assert result.nodes > 0
+
+    def test_workers(self):
+        frame = flow_job_generator(7, 4, initial_seed=7)
+
+        result = branch_and_bound(frame)
+        parallel_result = branch_and_bound(frame, workers=2)
+
+        assert parallel_result.optimal
+        assert parallel_result.end_time == result.end_time
+
+    def test_node_limit(self):
+        frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                         '/20jobs_5machines.txt')[0]
+
+        result = branch_and_bound(frame, node_limit=100)
+
+        assert result.nodes == 100
+        assert not result.optimal
+        assert result.lower_bound <= frame.upper_bound <= result.end_time
+        assert result.gap == pytest.approx(
+            (result.end_time - result.lower_bound) / result.lower_bound * 100)
+        assert sorted(result.solution) == list(range(frame.count_jobs))
+
+    def test_time_limit(self):
+        frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                         '/50jobs_10machines.txt')[0]
+        init_jobs = list(range(frame.count_jobs))
+
+        result = branch_and_bound(frame, init_jobs, time_limit=0.5)
+
+        assert result.elapsed_time < 5
+        assert result.end_time <= compute_end_time(frame, init_jobs)
+        assert result.lower_bound <= frame.upper_bound
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    @pytest.mark.parametrize('limits', [{'time_limit': 0},
+                                        {'node_limit': 0}])
+    def test_root_not_expanded(self, limits, workers):
+        frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                         '/20jobs_5machines.txt')[0]
+
+        result = branch_and_bound(frame, workers=workers, **limits)
+
+        assert result.lower_bound >= lower_bound(frame) > 0
+        assert result.lower_bound <= frame.upper_bound
+        assert not result.optimal
+        assert result.gap == pytest.approx(
+            (result.end_time - result.lower_bound) / result.lower_bound * 100)
+        assert result.gap > 0.
+
+    @pytest.mark.parametrize('workers', [0, True])
+    def test_wrong_workers(self, workers):
+        frame = JobSchedulingFrame([[1, 2], [2, 1]])
+        with pytest.raises(ValueError, match='workers must be'):
+            branch_and_bound(frame, workers=workers)
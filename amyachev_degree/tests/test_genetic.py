@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+import pytest
+
+from amyachev_degree.core import (
+    compute_end_time, EvaluationCounter, JobSchedulingFrame)
+from amyachev_degree.genetic import (
+    b_tournament_selection, create_initial_population, crossover_cx,
+    crossover_ox, genetic_algorithm, point_mutation, roulette_selection,
+    saltation)
+from amyachev_degree.io import read_flow_shop_instances
+from amyachev_degree.simple_heuristics import neh_heuristics
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TAILLARD_INS_DIR = TEST_DIR + '/../Taillard_instances'
+FLOW_SHOP_INSTANCE_DIR = TAILLARD_INS_DIR + '/flow_shop_sequences'
+
+
+def assert_permutations(population, count_jobs):
+    assert (np.sort(population, axis=1) == np.arange(count_jobs)).all()
+
+
+def test_initial_population():
+    rng = np.random.default_rng(0)
+    population = create_initial_population(5, 10, rng)
+    assert population.shape == (10, 5)
+    assert_permutations(population, 5)
+
+    # count of individuals is count of jobs, as in the reference
+    population = create_initial_population(3, 4, rng, init_jobs=[2, 0, 1])
+    assert population.tolist() == [[2, 0, 1], [0, 2, 1], [2, 1, 0]]
+
+
+def test_crossover_ox():
+    first_parents = np.array([[0, 1, 2, 3, 4, 5, 6, 7]])
+    second_parents = np.array([[7, 6, 5, 4, 3, 2, 1, 0]])
+
+    children = crossover_ox(first_parents, second_parents,
+                            np.array([2]), np.array([4]))
+    # section [2, 3, 4] is kept, the rest jobs are taken from the second
+    # parent starting after the section: 2, 1, 0, 7, 6, 5, 4, 3
+    assert children.tolist() == [[6, 5, 2, 3, 4, 1, 0, 7]]
+
+
+def test_crossover_cx():
+    first_parents = np.array([[0, 1, 2, 3, 4, 5]] * 20)
+    # cycles of positions: (0, 1), (2, 3, 4), (5)
+    second_parents = np.array([[1, 0, 4, 2, 3, 5]] * 20)
+
+    children = crossover_cx(first_parents, second_parents,
+                            np.random.default_rng(0))
+
+    assert_permutations(children, 6)
+    for cycle in ([0, 1], [2, 3, 4]):
+        from_first = children[:, cycle] == first_parents[:, cycle]
+        assert (from_first.all(axis=1) | (~from_first).all(axis=1)).all()
+
+
+@pytest.mark.parametrize('mutation', [point_mutation, saltation])
+def test_mutation(mutation):
+    population = create_initial_population(7, 50,
+                                           np.random.default_rng(0))
+    mutants = mutation(population, np.random.default_rng(1))
+
+    assert_permutations(mutants, 7)
+    assert ((mutants != population).sum(axis=1) == 2).all()
+
+
+@pytest.mark.parametrize('selection', [b_tournament_selection,
+                                       roulette_selection])
+def test_selection(selection):
+    fitness = np.array([4, 1, 3, 2, 5])
+    rng = np.random.default_rng(0)
+    indexes = np.concatenate([selection(fitness, 2, rng)
+                              for _ in range(1000)])
+
+    assert len(indexes) == 2000
+    assert np.bincount(indexes).argmax() == 1
+
+
+def test_b_tournament_selection():
+    indexes = b_tournament_selection(np.array([4, 1, 3, 2, 5]), 5,
+                                     np.random.default_rng(0))
+
+    # winners don't take part in the next tournaments
+    assert sorted(indexes) == [0, 1, 2, 3, 4]
+
+
+def test_roulette_selection():
+    fitness = np.array([2, 2, 3])
+    population = np.array([[0, 1], [0, 1], [1, 0]])
+
+    indexes = roulette_selection(fitness, 100, np.random.default_rng(0),
+                                 population)
+
+    # the identical individuals are one entry with share 4/7, so after
+    # reassignment it gets 3/7 of the other one
+    assert set(indexes) == {0, 2}
+    assert np.bincount(indexes)[2] > np.bincount(indexes)[0]
+
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'crossover': 'cx', 'mutation': 'point', 'selection': 'roulette'},
+])
+def test_genetic_algorithm(kwargs):
+    frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                     '/20jobs_5machines.txt')[0]
+    init_jobs = neh_heuristics(frame)
+    counter = EvaluationCounter()
+
+    solution = genetic_algorithm(frame, init_jobs, max_generations=50,
+                                 seed=0, counter=counter, **kwargs)
+
+    assert sorted(solution) == list(range(frame.count_jobs))
+    # the best individual is never lost
+    assert compute_end_time(frame, solution) <= \
+        compute_end_time(frame, init_jobs)
+    assert counter.full_evaluations > 0
+    assert solution == genetic_algorithm(frame, init_jobs,
+                                         max_generations=50, seed=0,
+                                         **kwargs)
+
+
+def test_genetic_algorithm_wrong_args():
+    frame = JobSchedulingFrame([[1, 2], [2, 1]])
+    with pytest.raises(ValueError, match='crossover'):
+        genetic_algorithm(frame, crossover='pmx')
+    with pytest.raises(ValueError, match='size_population'):
+        genetic_algorithm(frame, size_population=1)
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+import amyachev_degree
+
+
+IMPORT_TIME_SCRIPT = """
+import sys
+import time
+
+begin = time.perf_counter()
+import amyachev_degree
+import_time = time.perf_counter() - begin
+loaded = set(sys.modules)
+
+amyachev_degree.neh_heuristics
+print(import_time)
+print(int('amyachev_degree.core' in loaded))
+print(int('numpy' in loaded))
+print(int('plotly' in sys.modules))
+"""
+
+
+def run_import_script():
+    output = subprocess.run([sys.executable, '-c', IMPORT_TIME_SCRIPT],
+                            check=True, stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout
+    import_time, core_loaded, numpy_loaded, plotly_loaded = output.split()
+    return (float(import_time), bool(int(core_loaded)),
+            bool(int(numpy_loaded)), bool(int(plotly_loaded)))
+
+
+def test_import_time():
+    import_time, core_loaded, numpy_loaded, plotly_loaded = \
+        run_import_script()
+
+    assert not core_loaded
+    assert not numpy_loaded
+    # heuristics don't need plotly
+    assert not plotly_loaded
+    assert import_time < 0.5
+
+
+@pytest.mark.parametrize('name', amyachev_degree.__all__)
+def test_lazy_attributes(name):
+    assert getattr(amyachev_degree, name) is not None
+    assert name in dir(amyachev_degree)
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match='no_such_name'):
+        amyachev_degree.no_such_name
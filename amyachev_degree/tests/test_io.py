@@ -0,0 +1,210 @@
+import io
+import os
+import types
+
+import numpy as np
+import pytest
+
+import amyachev_degree.io
+
+from amyachev_degree.core import (
+    create_schedule, flow_job_generator, JobSchedulingFrame)
+from amyachev_degree.io import (
+    CACHE_SUFFIX, create_gantt_chart, FlowShopFormatError,
+    iter_flow_shop_instances, parse_flow_shop_instances,
+    read_flow_shop_instances, write_gantt_chart)
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TAILLARD_INS_DIR = TEST_DIR + '/../Taillard_instances'
+FLOW_SHOP_INSTANCE_DIR = TAILLARD_INS_DIR + '/flow_shop_sequences'
+
+
+INSTANCE = """number of jobs, number of machines, initial seed, upper bound \
+and lower bound :
+           3           2   873654221          20          18
+processing times :
+  5  3  8
+  4  9  2
+"""
+
+
+def write_file(tmp_path, text):
+    file_name = str(tmp_path / 'instances.txt')
+    with open(file_name, 'w') as file:
+        file.write(text)
+    return file_name
+
+
+class TestIterFlowShopInstances:
+
+    def test_lazy(self, tmp_path):
+        # the second instance is broken, but the first one is yielded
+        file_name = write_file(tmp_path, INSTANCE + INSTANCE[:-3])
+        frames = iter_flow_shop_instances(file_name)
+        assert isinstance(frames, types.GeneratorType)
+
+        frame = next(frames)
+        assert frame.copy_proc_time == [(5, 4), (3, 9), (8, 2)]
+        assert frame.upper_bound == 20
+
+        with pytest.raises(FlowShopFormatError, match='line 10'):
+            next(frames)
+
+    def test_same_as_read(self):
+        file_name = FLOW_SHOP_INSTANCE_DIR + '/20jobs_5machines.txt'
+        frames = read_flow_shop_instances(file_name)
+
+        assert len(frames) == 10
+        assert [str(frame) for frame in frames] == \
+            [str(frame) for frame in iter_flow_shop_instances(file_name)]
+
+    def test_separators(self, tmp_path):
+        file_name = write_file(tmp_path, INSTANCE.replace('  5  3  8',
+                                                          '5, 3, 8'))
+        frame, = read_flow_shop_instances(file_name)
+        assert frame.copy_proc_time == [(5, 4), (3, 9), (8, 2)]
+
+    def test_parse_string(self):
+        frame, = parse_flow_shop_instances(INSTANCE)
+        assert frame.copy_proc_time == [(5, 4), (3, 9), (8, 2)]
+        assert frame.upper_bound == 20
+
+        with pytest.raises(FlowShopFormatError, match='"request", line 4'):
+            parse_flow_shop_instances(INSTANCE[:-12], 'request')
+
+    @pytest.mark.parametrize('text, message', [
+        ('', 'File is empty'),
+        ('number\n 3 2 1\n', 'line 2'),
+        ('number\n 3 2 1 5\nfoo\n', 'line 3'),
+        ('number\n 3 2 1 5\nprocessing\n1 2 3\n1 2\n', 'line 5'),
+        ('number\n 3 2 1 5\nprocessing\n1 2 3\n', 'line 4'),
+    ])
+    def test_wrong_format(self, tmp_path, text, message):
+        file_name = write_file(tmp_path, text)
+        with pytest.raises(FlowShopFormatError, match=message):
+            read_flow_shop_instances(file_name)
+
+
+class TestInstancesCache:
+
+    def test_same_as_text(self, tmp_path):
+        file_name = FLOW_SHOP_INSTANCE_DIR + '/20jobs_5machines.txt'
+        cache_file = str(tmp_path / 'instances.fscache')
+        frames = read_flow_shop_instances(file_name)
+
+        for _ in range(2):  # create and load
+            cached_frames = read_flow_shop_instances(
+                file_name, cache=True, cache_file=cache_file)
+
+            assert os.path.exists(cache_file)
+            assert [str(frame) for frame in frames] == \
+                [str(frame) for frame in cached_frames]
+            assert [frame.upper_bound for frame in frames] == \
+                [frame.upper_bound for frame in cached_frames]
+
+    def test_memory_mapped(self, tmp_path):
+        file_name = write_file(tmp_path, INSTANCE + INSTANCE)
+        read_flow_shop_instances(file_name, cache=True)
+        frames = read_flow_shop_instances(file_name, cache=True)
+
+        assert os.path.exists(file_name + CACHE_SUFFIX)
+        for frame in frames:
+            assert frame.is_array
+            assert frame.array.dtype == np.int16
+            assert not frame.array.flags.writeable
+            assert frame.array.tolist() == [[5, 4], [3, 9], [8, 2]]
+            assert frame.upper_bound == 20
+
+    def test_invalidation(self, tmp_path):
+        file_name = write_file(tmp_path, INSTANCE)
+        read_flow_shop_instances(file_name, cache=True)
+
+        # same size, other content and modification time
+        write_file(tmp_path, INSTANCE.replace('  5  3  8', '  7  3  8'))
+        stat = os.stat(file_name)
+        os.utime(file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        frame, = read_flow_shop_instances(file_name, cache=True)
+        assert frame.array.tolist() == [[7, 4], [3, 9], [8, 2]]
+
+    def test_touched_source(self, tmp_path, monkeypatch):
+        file_name = write_file(tmp_path, INSTANCE)
+        read_flow_shop_instances(file_name, cache=True)
+        cache_size = os.stat(file_name + CACHE_SUFFIX).st_size
+
+        stat = os.stat(file_name)
+        os.utime(file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        frame, = read_flow_shop_instances(file_name, cache=True)
+        assert frame.array.tolist() == [[5, 4], [3, 9], [8, 2]]
+        # content is the same, so only the header is refreshed
+        assert os.stat(file_name + CACHE_SUFFIX).st_size == cache_size
+
+        # and the source isn't hashed by the next loads
+        def file_digest(file_name):
+            raise AssertionError('source is hashed')
+        monkeypatch.setattr(amyachev_degree.io, '_file_digest', file_digest)
+        frame, = read_flow_shop_instances(file_name, cache=True)
+        assert frame.array.tolist() == [[5, 4], [3, 9], [8, 2]]
+
+    @pytest.mark.parametrize('size', [0, 10, 80, 150, -1])
+    def test_truncated_cache(self, tmp_path, size):
+        file_name = write_file(tmp_path, INSTANCE + INSTANCE)
+        cache_file = file_name + CACHE_SUFFIX
+        read_flow_shop_instances(file_name, cache=True)
+        with open(cache_file, 'r+b') as file:
+            file.truncate(os.path.getsize(cache_file) + size
+                          if size < 0 else size)
+
+        frames = read_flow_shop_instances(file_name, cache=True)
+        assert [frame.array.tolist() for frame in frames] == \
+            [[[5, 4], [3, 9], [8, 2]]] * 2
+
+    def test_wrong_format(self, tmp_path):
+        file_name = write_file(tmp_path, 'number\n 3 2 1\n')
+        with pytest.raises(FlowShopFormatError, match='line 2'):
+            read_flow_shop_instances(file_name, cache=True)
+        assert not os.path.exists(file_name + CACHE_SUFFIX)
+
+
+class TestGanttChart:
+
+    def setup_method(self):
+        frame = JobSchedulingFrame([[17, 19, 13], [15, 11, 12],
+                                    [14, 21, 16], [20, 16, 20],
+                                    [16, 17, 17]])
+        self.schedule = create_schedule(frame, [2, 4, 3, 0, 1])
+
+    def test_svg(self, tmp_path):
+        file_name = str(tmp_path / 'chart.svg')
+        create_gantt_chart(self.schedule, file_name)
+
+        with open(file_name) as file:
+            image = file.read()
+        assert image.startswith('<svg')
+        assert image.count('<rect') == 15
+        assert 'Machine #3' in image
+        # job 4 on machine 2: (35, 52)
+        assert 'Job #5: 35 - 52' in image
+        assert '>100</text>' in image  # axis step is 20
+
+    def test_html(self):
+        file = io.StringIO()
+        write_gantt_chart(self.schedule, file, html=True)
+
+        assert file.getvalue().startswith('<!DOCTYPE html>')
+        assert file.getvalue().endswith('</html>\n')
+
+    def test_merge_narrow_bars(self):
+        frame = flow_job_generator(count_jobs=1000, count_machines=2,
+                                   initial_seed=1)
+        schedule = create_schedule(frame, list(range(1000)))
+
+        file = io.StringIO()
+        write_gantt_chart(schedule, file, width=300)
+
+        # about 1000 operations on each machine are drawn on 190 pixels
+        count_bars = file.getvalue().count('<rect')
+        assert 0 < count_bars < 2 * 190
+        assert 'operations: ' in file.getvalue()
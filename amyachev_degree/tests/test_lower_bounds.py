@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from amyachev_degree.core import (
+    compute_end_time, flow_job_generator, JobSchedulingFrame)
+from amyachev_degree.io import read_flow_shop_instances
+from amyachev_degree.lower_bounds import (
+    job_based_lower_bound, lower_bound, machine_based_lower_bound)
+from amyachev_degree.simple_heuristics import neh_heuristics
+from amyachev_degree.util.testing import (
+    percentage_deviation_using_lower_bound)
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TAILLARD_INS_DIR = TEST_DIR + '/../Taillard_instances'
+FLOW_SHOP_INSTANCE_DIR = TAILLARD_INS_DIR + '/flow_shop_sequences'
+
+
+def read_taillard_lower_bounds(file_name):
+    with open(file_name) as file:
+        lines = file.read().splitlines()
+    return [int(lines[idx + 1].split()[4])
+            for idx, line in enumerate(lines)
+            if line.strip().startswith('number')]
+
+
+def test_small_frame():
+    frame = JobSchedulingFrame([[3, 1, 4],
+                                [2, 5, 1]])
+
+    # machine 0: 0 + (3 + 2) + min(1 + 4, 5 + 1)
+    assert machine_based_lower_bound(frame) == 10
+    # job 1: (2 + 5 + 1) + min(3, 4)
+    assert job_based_lower_bound(frame) == 11
+    # the bound is reached
+    assert lower_bound(frame) == 11 == compute_end_time(frame, [0, 1])
+
+
+@pytest.mark.parametrize('file_name', ['/20jobs_5machines.txt',
+                                       '/20jobs_20machines.txt',
+                                       '/50jobs_10machines.txt'])
+def test_taillard_lower_bounds(file_name):
+    file_name = FLOW_SHOP_INSTANCE_DIR + file_name
+    frames = read_flow_shop_instances(file_name)
+    taillard_lower_bounds = read_taillard_lower_bounds(file_name)
+
+    for frame, taillard_lower_bound in zip(frames, taillard_lower_bounds):
+        # bound from the paper uses only the longest job
+        assert max(machine_based_lower_bound(frame),
+                   max(frame.get_sum_processing_times())) == \
+            taillard_lower_bound
+        assert taillard_lower_bound <= lower_bound(frame) <= \
+            frame.upper_bound
+
+
+@pytest.mark.parametrize('seed', [1, 12, 123])
+def test_not_greater_than_makespan(seed):
+    frame = flow_job_generator(30, 7, initial_seed=seed)
+    assert lower_bound(frame) <= compute_end_time(frame,
+                                                  neh_heuristics(frame))
+
+
+def test_percentage_deviation_using_lower_bound():
+    frames = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                      '/20jobs_5machines.txt')
+
+    deviation = percentage_deviation_using_lower_bound(neh_heuristics, {},
+                                                       frames)
+    assert 0 < deviation < 10
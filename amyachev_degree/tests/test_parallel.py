@@ -0,0 +1,75 @@
+import pytest
+
+from amyachev_degree.core import flow_job_generator, JobSchedulingFrame
+from amyachev_degree.parallel import solve_many
+from amyachev_degree.simple_heuristics import (
+    liu_reeves_heuristics, neh_heuristics, palmer_heuristics)
+from amyachev_degree.util.testing import (
+    percentage_deviation, percentage_deviation_using_upper_bound)
+
+
+class TestSolveMany:
+
+    def setup_method(self):
+        self.frames = [flow_job_generator(count_jobs=10, count_machines=4,
+                                          initial_seed=seed)
+                       for seed in range(1, 8)]
+
+    @pytest.mark.parametrize('workers', [1, 2, 3, None])
+    def test_result_order(self, workers):
+        expected = [neh_heuristics(frame) for frame in self.frames]
+
+        assert expected == solve_many(self.frames, neh_heuristics,
+                                      workers=workers)
+
+    @pytest.mark.parametrize('chunksize', [1, 2, 10])
+    def test_heuristic_args(self, chunksize):
+        expected = [liu_reeves_heuristics(frame, count_sequences=2)
+                    for frame in self.frames]
+
+        assert expected == solve_many(self.frames, liu_reeves_heuristics,
+                                      {'count_sequences': 2}, workers=2,
+                                      chunksize=chunksize)
+
+    def test_local_heuristic(self):
+        def heuristic(frame, count_sequences):
+            return liu_reeves_heuristics(frame, count_sequences)
+
+        expected = [heuristic(frame, 2) for frame in self.frames]
+
+        # can't be pickled, so the frames are solved in this process
+        assert expected == solve_many(self.frames, heuristic,
+                                      {'count_sequences': 2}, workers=2)
+        assert percentage_deviation(heuristic, {'count_sequences': 2},
+                                    neh_heuristics, {}, self.frames,
+                                    workers=2) >= 0.
+
+    def test_empty_frames(self):
+        assert [] == solve_many([], palmer_heuristics, workers=2)
+
+    @pytest.mark.parametrize('workers', [0, -1, 1.5, "2", True, False])
+    def test_bad_workers(self, workers):
+        msg = 'workers must be an integer > 0 or None'
+
+        with pytest.raises(ValueError, match=msg):
+            solve_many(self.frames, palmer_heuristics, workers=workers)
+
+    def test_percentage_deviation(self):
+        deviation = percentage_deviation(palmer_heuristics, {},
+                                         neh_heuristics, {}, self.frames)
+
+        assert deviation == percentage_deviation(
+            palmer_heuristics, {}, neh_heuristics, {}, self.frames, workers=2)
+        assert deviation == percentage_deviation(
+            palmer_heuristics, {}, neh_heuristics, {}, self.frames,
+            workers=None)
+
+    def test_percentage_deviation_using_upper_bound(self):
+        frames = [JobSchedulingFrame(frame.processing_times, upper_bound=500)
+                  for frame in self.frames]
+
+        deviation = percentage_deviation_using_upper_bound(
+            palmer_heuristics, {}, frames)
+
+        assert deviation == percentage_deviation_using_upper_bound(
+            palmer_heuristics, {}, frames, workers=3)
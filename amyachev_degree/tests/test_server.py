@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+
+import amyachev_degree.server
+from amyachev_degree.core import compute_end_time
+from amyachev_degree.io import read_flow_shop_instances
+from amyachev_degree.server import SchedulingServer
+from amyachev_degree.simple_heuristics import neh_heuristics
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TAILLARD_INS_DIR = TEST_DIR + '/../Taillard_instances'
+FLOW_SHOP_INSTANCE_DIR = TAILLARD_INS_DIR + '/flow_shop_sequences'
+INSTANCES_FILE = FLOW_SHOP_INSTANCE_DIR + '/20jobs_5machines.txt'
+
+
+def _run_with_server(client, **server_args):
+    async def run():
+        server = SchedulingServer(workers=1, **server_args)
+        await server.start(port=0)
+        try:
+            host, port = server.addresses[0][:2]
+            return await client(server, host, port)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+async def _send_lines(host, port, requests):
+    reader, writer = await asyncio.open_connection(host, port)
+    for request in requests:
+        writer.write(json.dumps(request).encode() + b'\n')
+    writer.write_eof()
+    messages = [json.loads(line) for line in await _read_lines(reader)]
+    writer.close()
+    return messages
+
+
+async def _read_lines(reader):
+    data = await reader.read()
+    return [line for line in data.split(b'\n') if line]
+
+
+class TestSchedulingServer:
+
+    def setup_method(self):
+        self.frame = read_flow_shop_instances(INSTANCES_FILE)[0]
+        self.processing_times = [list(map(int, times))
+                                 for times in self.frame.array]
+
+    def test_solve(self):
+        with open(INSTANCES_FILE) as file:
+            text = file.read()
+
+        async def client(server, host, port):
+            return await _send_lines(host, port, [
+                {'id': 1, 'method': 'neh', 'args': {},
+                 'processing_times': self.processing_times,
+                 'time_limit': 0},
+                {'id': 2, 'method': 'neh', 'taillard': text,
+                 'time_limit': 0}])
+
+        messages = _run_with_server(client)
+        results = {message['id']: message for message in messages}
+
+        expected = neh_heuristics(self.frame)
+        for request_id in (1, 2):
+            assert results[request_id]['type'] == 'result'
+            assert results[request_id]['end_time'] == \
+                compute_end_time(self.frame, expected)
+            assert sorted(results[request_id]['solution']) == \
+                list(range(self.frame.count_jobs))
+
+    def test_warm_instance(self):
+        async def client(server, host, port):
+            first, = await _send_lines(host, port, [
+                {'processing_times': self.processing_times,
+                 'time_limit': 0}])
+            # messages come in the order of completion
+            second, third = sorted(await _send_lines(host, port, [
+                {'id': 'a', 'instance_id': first['instance_id'],
+                 'time_limit': 0},
+                {'id': 'b', 'instance_id': 'unknown'}]),
+                key=lambda message: message['id'])
+            return first, second, third, server.health()
+
+        first, second, third, health = _run_with_server(client)
+
+        assert second['type'] == 'result'
+        assert second['end_time'] == first['end_time']
+        assert third == {'type': 'error', 'id': 'b',
+                         'message': "unknown instance_id 'unknown'"}
+        assert health['cache_hits'] == 1
+        assert health['cached_instances'] == 1
+
+    def test_result_cache(self, tmp_path):
+        async def client(server, host, port):
+            request = {'method': 'cds', 'time_limit': 0,
+                       'processing_times': self.processing_times}
+            return (await _send_lines(host, port, [request]) +
+                    await _send_lines(host, port, [request]))
+
+        first, second = _run_with_server(client,
+                                         result_cache=str(tmp_path))
+
+        assert first['solution'] == second['solution']
+        assert first['evaluations'] == second['evaluations']
+        assert len(os.listdir(str(tmp_path))) == 1
+
+    def test_progress(self):
+        async def client(server, host, port):
+            return await _send_lines(host, port, [
+                {'id': 1, 'method': 'iterated_greedy', 'time_limit': 0.5,
+                 'args': {'seed': 0}, 'progress': True,
+                 'processing_times': self.processing_times}])
+
+        messages = _run_with_server(client)
+
+        assert messages[-1]['type'] == 'result'
+        assert messages[-1]['timed_out']
+        progress = [message for message in messages
+                    if message['type'] == 'progress']
+        assert progress
+        assert progress[0]['end_time'] >= messages[-1]['end_time']
+
+    def test_backpressure(self):
+        async def client(server, host, port):
+            return await _send_lines(host, port, [
+                {'id': idx, 'method': 'iterated_greedy', 'time_limit': 0.2,
+                 'processing_times': self.processing_times}
+                for idx in range(4)])
+
+        messages = _run_with_server(client, max_pending=1)
+
+        assert len(messages) == 4
+        assert any(message['type'] == 'result' for message in messages)
+        errors = [message for message in messages
+                  if message['type'] == 'error']
+        assert errors
+        assert all(error['message'] == 'queue is full' for error in errors)
+
+    def test_wrong_requests(self):
+        async def client(server, host, port):
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b'{"id": 1, "method": "unknown"}\n'
+                         b'not json\n'
+                         b'{"id": 3, "time_limit": 1}\n'
+                         b'{"id": 4, "processing_times": [[1, 2], [3]]}\n'
+                         b'{"id": 5, "method": "palmer", "args": {"x": 1},'
+                         b' "processing_times": [[1, 2], [3, 4]]}\n'
+                         b'{"id": 6, "time_limit": true,'
+                         b' "processing_times": [[1, 2], [3, 4]]}\n'
+                         b'{"id": 7, "time_limit": NaN,'
+                         b' "processing_times": [[1, 2], [3, 4]]}\n'
+                         b'{"id": 8, "time_limit": Infinity,'
+                         b' "processing_times": [[1, 2], [3, 4]]}\n')
+            writer.write_eof()
+            lines = await _read_lines(reader)
+            writer.close()
+            return [json.loads(line) for line in lines]
+
+        messages = _run_with_server(client)
+
+        assert len(messages) == 8
+        assert all(message['type'] == 'error' for message in messages)
+        assert sorted(message['id'] is None for message in messages) == \
+            [False] * 7 + [True]
+        errors = {message['id']: message['message'] for message in messages}
+        assert 'unexpected' in errors[5]
+        for request_id in (6, 7, 8):
+            assert errors[request_id] == "'time_limit' must be a number >= 0"
+
+    def test_time_limit_exceeded(self, monkeypatch):
+        monkeypatch.setattr(amyachev_degree.server, 'TIME_LIMIT_GRACE', 0.)
+        big_frame = read_flow_shop_instances(
+            FLOW_SHOP_INSTANCE_DIR + '/500jobs_20machines.txt')[0]
+
+        async def client(server, host, port):
+            messages = []
+
+            def send(message):
+                messages.append((message, server.health()['pending']))
+
+            await asyncio.gather(
+                server.solve_request(
+                    {'id': 1, 'method': 'fgh', 'time_limit': 0,
+                     'processing_times': big_frame.array.tolist()}, send),
+                server.solve_request(
+                    {'id': 2, 'time_limit': 0,
+                     'processing_times': self.processing_times}, send))
+            return messages
+
+        (error, pending), (result, _) = _run_with_server(client)
+
+        assert error == {'type': 'error', 'id': 1,
+                         'message': 'time limit is exceeded'}
+        # the second request waits until the worker completes the first
+        assert pending == 1
+        assert result['id'] == 2
+
+    def test_http(self):
+        request = json.dumps({'id': 1, 'time_limit': 0,
+                              'processing_times': self.processing_times})
+
+        async def http(host, port, data):
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(data)
+            writer.write_eof()
+            response = await reader.read()
+            writer.close()
+            head, _, body = response.partition(b'\r\n\r\n')
+            return head.split(b'\r\n')[0], body
+
+        async def client(server, host, port):
+            solved = await http(host, port, (
+                'POST /solve HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s'
+                % (len(request), request)).encode())
+            health = await http(host, port, b'GET /health HTTP/1.1\r\n\r\n')
+            missing = await http(host, port, b'GET /x HTTP/1.1\r\n\r\n')
+            truncated = await http(host, port, (
+                'POST /solve HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s'
+                % (len(request) + 1, request)).encode())
+            return solved, health, missing, truncated
+
+        solved, health, missing, truncated = _run_with_server(client)
+
+        assert solved[0] == b'HTTP/1.1 200 OK'
+        assert json.loads(solved[1])['type'] == 'result'
+        assert health[0] == b'HTTP/1.1 200 OK'
+        assert json.loads(health[1])['completed'] == 1
+        assert missing[0] == b'HTTP/1.1 404 Not Found'
+        assert truncated[0] == b'HTTP/1.1 400 Bad Request'
+        assert json.loads(truncated[1])['type'] == 'error'
@@ -28,6 +28,16 @@ def test_slope_index(idx_job, slope_index):
     assert slope_index == slope_index_func(frame, idx_job)
 
 
+def test_palmer_heuristics_order():
+    # slope indexes: -8, -6, 4, 0, 2; jobs with equal slope index
+    # keep ascending order
+    processing_times = [[17, 19, 13], [15, 11, 12], [14, 21, 16],
+                        [20, 16, 20], [16, 17, 17], [16, 17, 17]]
+    frame = JobSchedulingFrame(processing_times)
+
+    assert palmer_heuristics(frame) == [2, 4, 5, 3, 1, 0]
+
+
 def test_cds_create_proc_times():
     processing_times = [[17, 19, 13], [15, 11, 12],
                         [14, 21, 16], [20, 16, 20], [16, 17, 17]]
@@ -49,6 +59,10 @@ def test_cds_create_proc_times():
                                                        [35, 37], [36, 36],
                                                        [33, 34]]))
 
+    # all machines are summed up in both artificial ones
+    assert cds_create_proc_times(frame, 3) == [[49, 49], [38, 38], [51, 51],
+                                               [56, 56], [50, 50]]
+
 
 @pytest.mark.parametrize('file_name, expected_percent_ratio',
                          [('/20jobs_5machines.txt', 10.81),
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from amyachev_degree.composite_heuristics import local_search
+from amyachev_degree.core import JobSchedulingFrame, compute_end_time
+from amyachev_degree.io import read_flow_shop_instances
+from amyachev_degree.simple_heuristics import (
+    neh_heuristics, palmer_heuristics)
+from amyachev_degree.solver import METHODS, solve
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TAILLARD_INS_DIR = TEST_DIR + '/../Taillard_instances'
+FLOW_SHOP_INSTANCE_DIR = TAILLARD_INS_DIR + '/flow_shop_sequences'
+
+
+class TestSolve:
+
+    def setup_method(self):
+        self.frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                              '/20jobs_5machines.txt')[0]
+
+    @pytest.mark.parametrize('method', sorted(METHODS))
+    def test_methods(self, method):
+        improvements = []
+        result = solve(self.frame, method, time_limit=0.2,
+                       on_improvement=lambda *args: improvements.append(args))
+
+        assert sorted(result.solution) == list(range(self.frame.count_jobs))
+        assert result.end_time == compute_end_time(self.frame,
+                                                   result.solution)
+        assert result.evaluations > 0 or method == 'palmer'
+        # the last reported improvement is the result
+        assert improvements[-1][:2] == (result.solution, result.end_time)
+        end_times = [end_time for _, end_time, _ in improvements]
+        assert end_times == sorted(end_times, reverse=True)
+
+    def test_same_as_heuristic(self):
+        result = solve(self.frame, 'neh', improve=False)
+
+        assert result.solution == neh_heuristics(self.frame)
+        assert not result.timed_out
+
+    def test_local_search(self):
+        solution, _ = local_search(self.frame,
+                                   palmer_heuristics(self.frame))
+        result = solve(self.frame, 'palmer')
+
+        assert result.solution == solution
+
+    def test_time_limit(self):
+        result = solve(self.frame, 'iterated_greedy', time_limit=0.1)
+
+        assert result.timed_out
+        assert result.elapsed_time < 1.
+        assert result.end_time <= compute_end_time(
+            self.frame, neh_heuristics(self.frame))
+
+    @pytest.mark.parametrize('count_jobs', [1, 2, 4])
+    def test_few_jobs(self, count_jobs):
+        frame = JobSchedulingFrame(self.frame.array[:count_jobs])
+
+        result = solve(frame, 'liu_reeves')
+
+        assert sorted(result.solution) == list(range(count_jobs))
+
+    def test_wrong_args(self):
+        with pytest.raises(ValueError, match='method must be'):
+            solve(self.frame, 'tabu')
+        with pytest.raises(ValueError, match='time_limit is required'):
+            solve(self.frame, 'genetic')
+        with pytest.raises(ValueError, match='unexpected'):
+            solve(self.frame, 'palmer', count_alpha=2)
+
+
+def test_local_search_time_limit():
+    frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                     '/50jobs_10machines.txt')[0]
+    init_jobs = palmer_heuristics(frame)
+
+    solution, changed = local_search(frame, init_jobs, time_limit=0.)
+
+    assert solution == init_jobs
+    assert not changed
+
+
+@pytest.mark.parametrize('method', ['liu_reeves', 'fgh', 'genetic'])
+def test_time_limit_exceeded(method):
+    frame = read_flow_shop_instances(FLOW_SHOP_INSTANCE_DIR +
+                                     '/500jobs_20machines.txt')[0]
+
+    result = solve(frame, method, time_limit=0.05)
+
+    assert result.timed_out
+    assert result.elapsed_time < 1.
+    assert sorted(result.solution) == list(range(frame.count_jobs))
@@ -1,4 +1,6 @@
 from amyachev_degree.core import compute_end_time, JobSchedulingFrame
+from amyachev_degree.lower_bounds import lower_bound
+from amyachev_degree.parallel import solve_many
 
 
 def assert_js_frame(fst: JobSchedulingFrame, scnd: JobSchedulingFrame) -> bool:
@@ -26,7 +28,7 @@ def my_round(value):
 
 def percentage_deviation(fst_heuristic: object, fst_args: dict,
                          scnd_heuristic: object, scnd_args: dict,
-                         frames: list) -> float:
+                         frames: list, workers: int = 1) -> float:
     """
     The calculations are performed with respect to the results
     of the second heuristics.
@@ -43,6 +45,9 @@ def percentage_deviation(fst_heuristic: object, fst_args: dict,
         named arguments for `scnd_heuristic`
     frames: list
         list of `JobSchedulingFrame` objects
+    workers: int or None, default 1
+        count of worker processes used by `solve_many`; if None then
+        `os.cpu_count()` is used
 
     Returns
     -------
@@ -53,12 +58,13 @@ def percentage_deviation(fst_heuristic: object, fst_args: dict,
     Averaging occurs by the count of frames.
 
     """
+    fst_solutions = solve_many(frames, fst_heuristic, fst_args, workers)
+    scnd_solutions = solve_many(frames, scnd_heuristic, scnd_args, workers)
+
     solutions_ratio = 0.
-    for frame in frames:
-        fst_solution = fst_heuristic(frame, **fst_args)
+    for frame, fst_solution, scnd_solution in zip(frames, fst_solutions,
+                                                  scnd_solutions):
         fst_end_time = compute_end_time(frame, fst_solution)
-
-        scnd_solution = scnd_heuristic(frame, **scnd_args)
         scnd_end_time = compute_end_time(frame, scnd_solution)
 
         end_time_diff = fst_end_time - scnd_end_time
@@ -69,7 +75,8 @@ def percentage_deviation(fst_heuristic: object, fst_args: dict,
 
 def percentage_deviation_using_upper_bound(fst_heuristic: object,
                                            fst_args: dict,
-                                           frames: list) -> float:
+                                           frames: list,
+                                           workers: int = 1) -> float:
     """
     The calculations are performed with respect to the results that are
     stored by frames in `upper_bound` property.
@@ -82,6 +89,9 @@ def percentage_deviation_using_upper_bound(fst_heuristic: object,
         named arguments for `fst_heuristic`
     frames: list
         list of `JobSchedulingFrame` objects
+    workers: int or None, default 1
+        count of worker processes used by `solve_many`; if None then
+        `os.cpu_count()` is used
 
     Returns
     -------
@@ -92,12 +102,55 @@ def percentage_deviation_using_upper_bound(fst_heuristic: object,
     Averaging occurs by the count of frames.
 
     """
+    fst_solutions = solve_many(frames, fst_heuristic, fst_args, workers)
+
     solutions_ratio = 0.
-    for frame in frames:
-        fst_solution = fst_heuristic(frame, **fst_args)
+    for frame, fst_solution in zip(frames, fst_solutions):
         fst_end_time = compute_end_time(frame, fst_solution)
 
         end_time_diff = fst_end_time - frame.upper_bound
         solutions_ratio += end_time_diff / frame.upper_bound
 
     return solutions_ratio / len(frames) * 100
+
+
+def percentage_deviation_using_lower_bound(fst_heuristic: object,
+                                           fst_args: dict,
+                                           frames: list,
+                                           workers: int = 1) -> float:
+    """
+    The calculations are performed with respect to the lower bounds
+    computed by `lower_bound`, so frames don't need `upper_bound`.
+
+    Parameters
+    ----------
+    fst_heuristic: object
+        function callback
+    fst_args: dict
+        named arguments for `fst_heuristic`
+    frames: list
+        list of `JobSchedulingFrame` objects
+    workers: int or None, default 1
+        count of worker processes used by `solve_many`; if None then
+        `os.cpu_count()` is used
+
+    Returns
+    -------
+    average_deviation: float
+
+    Notes
+    -----
+    Averaging occurs by the count of frames.
+
+    """
+    fst_solutions = solve_many(frames, fst_heuristic, fst_args, workers)
+
+    solutions_ratio = 0.
+    for frame, fst_solution in zip(frames, fst_solutions):
+        fst_end_time = compute_end_time(frame, fst_solution)
+        frame_lower_bound = lower_bound(frame)
+
+        end_time_diff = fst_end_time - frame_lower_bound
+        solutions_ratio += end_time_diff / frame_lower_bound
+
+    return solutions_ratio / len(frames) * 100